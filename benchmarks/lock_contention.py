@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Benchmark crawl throughput at different thread counts.
+
+The benchmark crawls a synthetic site served from memory, so it measures the
+checker's own overhead (parsing, locking and dispatching) rather than the network.
+Every page links to a few child pages and carries the same header of shared assets
+and external links, like a typical documentation site.
+
+Usage:
+    python benchmarks/lock_contention.py [--pages N] [--threads 1,4,16,64]
+"""
+
+import argparse
+import logging
+import time
+from typing import List, Optional
+from unittest.mock import MagicMock, patch
+
+from link_checker.main import LinkChecker
+
+ROOT_URL = "https://bench.example.com"
+
+
+def make_page(index: int, num_pages: int, fan_out: int) -> str:
+    """Return the HTML of a synthetic page."""
+    header = ''.join(f'<link rel="stylesheet" href="/css/style{i}.css">' for i in range(5))
+    header += ''.join(f'<script src="/js/script{i}.js"></script>' for i in range(5))
+    nav = ''.join(f'<a href="/section{i}/index.html">Section {i}</a>' for i in range(20))
+    footer = ''.join(f'<a href="https://ext{i}.example.org/">Ext {i}</a>' for i in range(20))
+    children = ''.join(f'<a href="/page{child}.html">Page {child}</a>'
+                       for child in range(index * fan_out + 1,
+                                          min(num_pages, index * fan_out + fan_out + 1)))
+    images = ''.join(f'<img src="/img/page{index}-{i}.png">' for i in range(10))
+    return (f'<html><head>{header}</head><body><nav>{nav}</nav>'
+            f'<main>{children}{images}</main><footer>{footer}</footer></body></html>')
+
+
+def run(num_pages: int, threads: int, fan_out: int) -> float:
+    """Crawl the synthetic site and return the number of pages per second."""
+    pages = {f"{ROOT_URL}/page{i}.html": make_page(i, num_pages, fan_out)
+             for i in range(num_pages)}
+    pages[ROOT_URL] = make_page(0, num_pages, fan_out)
+
+    def fake_get(url, **kwargs):
+        response = MagicMock()
+        response.url = url
+        content = pages.get(url)
+        response.status_code = 200 if content is not None else 404
+        response.headers = {'Content-Type': 'text/html'}
+        response.content = (content or '').encode()
+        return response
+
+    checker = LinkChecker(ROOT_URL, max_threads=threads)
+    with patch('requests.Session.get', side_effect=fake_get):
+        start = time.perf_counter()
+        checker.link_checker()
+        elapsed = time.perf_counter() - start
+    checker.close()
+    return checker.actual_visited_pages_count / elapsed
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    """Run the benchmark and print a table of results."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument("--pages", type=int, default=500, help="Number of pages.")
+    parser.add_argument("--fan-out", type=int, default=5, help="Child links per page.")
+    parser.add_argument("--threads", default="1,4,16,64",
+                        help="Comma-separated thread counts to compare.")
+    parsed_args = parser.parse_args(args)
+
+    logging.disable(logging.CRITICAL)
+    print(f"{'Threads':>8} {'Pages/s':>10}")
+    for threads in (int(value) for value in parsed_args.threads.split(',')):
+        rate = run(parsed_args.pages, threads, parsed_args.fan_out)
+        print(f"{threads:>8} {rate:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
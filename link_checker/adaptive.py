@@ -0,0 +1,164 @@
+"""Adaptive per-host concurrency control."""
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Outcomes of a request, as reported to the limiter
+OUTCOME_OK = 'ok'
+OUTCOME_THROTTLED = 'throttled'
+OUTCOME_ERROR = 'error'
+
+
+class _HostLimit:
+    """Concurrency state for a single host."""
+
+    __slots__ = ('limit', 'in_flight', 'latency', 'samples', 'slow_start',
+                 'last_decrease', 'decreases', 'history', 'condition')
+
+    def __init__(self, initial: float, lock: threading.Lock):
+        self.limit = initial
+        self.in_flight = 0
+        self.latency = 0.0
+        self.samples = 0
+        self.slow_start = True
+        self.last_decrease = 0.0
+        self.decreases = 0
+        self.history: List[Tuple[float, int]] = []
+        self.condition = threading.Condition(lock)
+
+
+class AdaptiveConcurrencyLimiter:
+    """Limit concurrent requests per host using additive-increase/multiplicative-decrease.
+
+    Each host starts at ``min_concurrency`` concurrent requests. The limit grows by
+    one per successful request until the first sign of trouble (slow start), and
+    after that by one per ``limit`` successful requests. A timeout, connection error,
+    429 or 503 response, or a latency spike (a response more than ``latency_factor``
+    times slower than the host's moving average) halves the limit. Requests that were
+    already in flight when the limit was cut do not cut it again.
+    """
+
+    def __init__(self,
+                 min_concurrency: int = 1,
+                 max_concurrency: int = 32,
+                 latency_factor: float = 3.0,
+                 decrease_factor: float = 0.5):
+        """Initialize the limiter.
+
+        Args:
+            min_concurrency: Lower bound on the concurrency for any host.
+            max_concurrency: Upper bound on the concurrency for any host.
+            latency_factor: How many times slower than the moving average a response
+                must be to count as a latency spike.
+            decrease_factor: Factor the limit is multiplied by when a host struggles.
+        """
+        self.min_concurrency = max(1, min_concurrency)
+        self.max_concurrency = max(self.min_concurrency, max_concurrency)
+        self.latency_factor = latency_factor
+        self.decrease_factor = decrease_factor
+
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, _HostLimit] = {}
+        self._start_time = time.monotonic()
+
+    def _get_host(self, host: str) -> _HostLimit:
+        """Return the state for a host, creating it if needed; caller holds the lock."""
+        state = self._hosts.get(host)
+        if state is None:
+            state = _HostLimit(float(self.min_concurrency), self._lock)
+            state.history.append((time.monotonic() - self._start_time,
+                                  self.min_concurrency))
+            self._hosts[host] = state
+        return state
+
+    def acquire(self, host: str) -> float:
+        """Wait until a request to a host may be made.
+
+        Args:
+            host: The host (netloc) of the request.
+
+        Returns:
+            The time the request started, to be passed to release().
+        """
+        with self._lock:
+            state = self._get_host(host)
+            while state.in_flight >= int(state.limit):
+                state.condition.wait()
+            state.in_flight += 1
+            return time.monotonic()
+
+    def release(self, host: str, started: float, outcome: str,
+                latency: Optional[float] = None) -> None:
+        """Report the outcome of a request and adjust the host's limit.
+
+        Args:
+            host: The host (netloc) of the request.
+            started: The value returned by acquire().
+            outcome: OUTCOME_OK, OUTCOME_THROTTLED or OUTCOME_ERROR.
+            latency: Seconds the request took to be answered, without any time spent
+                waiting for other limits (default: the time since acquire()).
+        """
+        now = time.monotonic()
+        if latency is None:
+            latency = now - started
+
+        with self._lock:
+            state = self._get_host(host)
+            state.in_flight -= 1
+            old_limit = int(state.limit)
+
+            spike = (outcome == OUTCOME_OK and state.samples >= 5 and
+                     latency > state.latency * self.latency_factor and
+                     latency - state.latency > 0.1)
+
+            if outcome != OUTCOME_OK or spike:
+                # Only cut once for the requests that were in flight at the old limit
+                if started >= state.last_decrease:
+                    state.limit = max(float(self.min_concurrency),
+                                      state.limit * self.decrease_factor)
+                    state.last_decrease = now
+                    state.slow_start = False
+                    state.decreases += 1
+            else:
+                # Update the moving average of healthy latencies
+                if state.samples == 0:
+                    state.latency = latency
+                else:
+                    state.latency += 0.2 * (latency - state.latency)
+                state.samples += 1
+
+                increase = 1.0 if state.slow_start else 1.0 / max(state.limit, 1.0)
+                state.limit = min(float(self.max_concurrency), state.limit + increase)
+
+            if int(state.limit) != old_limit:
+                state.history.append((now - self._start_time, int(state.limit)))
+            state.condition.notify_all()
+
+    def limit(self, host: str) -> int:
+        """Return the current concurrency limit of a host.
+
+        Args:
+            host: The host (netloc).
+
+        Returns:
+            The number of requests that may be made to the host at once.
+        """
+        with self._lock:
+            return int(self._get_host(host).limit)
+
+    def summary(self) -> Dict[str, Tuple[int, int, int, int, List[Tuple[float, int]]]]:
+        """Return the concurrency chosen for each host.
+
+        Returns:
+            A dict of {host: (current_limit, lowest_limit, highest_limit, decreases,
+            history)}, where history is a list of (seconds_since_start, limit) entries
+            recorded whenever the limit changed.
+        """
+        with self._lock:
+            result = {}
+            for host, state in self._hosts.items():
+                limits = [limit for _, limit in state.history]
+                result[host] = (int(state.limit), min(limits), max(limits),
+                                state.decreases, list(state.history))
+            return result
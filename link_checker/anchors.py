@@ -0,0 +1,141 @@
+"""Index of page anchors for checking links to fragments (``page#anchor``)."""
+
+import threading
+import urllib.parse
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Sequence, Set, Tuple
+
+from bs4 import BeautifulSoup
+from bs4 import Tag
+
+# Fragments that refer to the top of a page rather than to an anchor, and the prefix
+# of text fragments (#:~:text=...), which browsers match against the page's text
+TOP_FRAGMENTS = ('', 'top')
+TEXT_FRAGMENT_PREFIX = ':~:'
+
+
+def find_anchors(soup: BeautifulSoup) -> List[str]:
+    """Find the anchors of a page: the ``id`` of any element and the ``name`` of <a> tags.
+
+    Args:
+        soup: The parsed page.
+
+    Returns:
+        The sorted, distinct anchor names.
+    """
+    anchors = set()
+    for tag in soup.find_all(id=True):
+        if isinstance(tag, Tag):
+            anchors.add(str(tag.get('id', '')))
+    for tag in soup.find_all('a', attrs={'name': True}):
+        if isinstance(tag, Tag):
+            anchors.add(str(tag.get('name', '')))
+    anchors.discard('')
+    return sorted(anchors)
+
+
+def is_checkable_fragment(fragment: str) -> bool:
+    """Check whether a fragment names an anchor that can be looked up.
+
+    Args:
+        fragment: The fragment, without the '#'.
+
+    Returns:
+        False for fragments that refer to the top of the page and for text fragments.
+    """
+    return (fragment.lower() not in TOP_FRAGMENTS and
+            not fragment.startswith(TEXT_FRAGMENT_PREFIX))
+
+
+def page_key(url: str) -> str:
+    """Return the key of a page in the index, so that /dir, /dir/ and /dir/index.html match.
+
+    Args:
+        url: The page URL, without a fragment.
+
+    Returns:
+        The key.
+    """
+    key = url.rstrip('/')
+    if key.endswith('/index.html'):
+        key = key[:-len('/index.html')]
+    return key
+
+
+class AnchorIndex:
+    """The anchors of every indexed page and the fragment references to them.
+
+    Anchors are recorded while pages are parsed, and each page's anchors are kept as a
+    frozenset. References are validated at the end of the run against the index, so
+    no page is fetched twice.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._lock = threading.Lock()
+        # {page_key: anchors}
+        self._anchors: Dict[str, FrozenSet[str]] = {}
+        # {target_url: {fragment: {referring_page, ...}}}
+        self._references: Dict[str, Dict[str, Set[str]]] = {}
+
+    def clear(self) -> None:
+        """Remove all pages and references, e.g. before another run."""
+        with self._lock:
+            self._anchors = {}
+            self._references = {}
+
+    def add_page(self, url: str, anchors: Iterable[str]) -> None:
+        """Record the anchors of a page.
+
+        Args:
+            url: The page URL.
+            anchors: The page's anchor names.
+        """
+        anchors = frozenset(anchors)
+        with self._lock:
+            self._anchors[page_key(url)] = anchors
+
+    def add_references(self, page: str, references: Iterable[Sequence[str]]) -> None:
+        """Record the fragment links found on a page.
+
+        Args:
+            page: The URL of the page the links were found on.
+            references: (target_url, fragment) pairs.
+        """
+        with self._lock:
+            for target, fragment in references:
+                self._references.setdefault(target, {}).setdefault(fragment, set()).add(page)
+
+    def reference_count(self) -> int:
+        """Return the number of distinct (target, fragment) references."""
+        with self._lock:
+            return sum(len(fragments) for fragments in self._references.values())
+
+    def unindexed_targets(self) -> List[str]:
+        """Return the referenced pages whose anchors are not known yet."""
+        with self._lock:
+            return sorted(target for target in self._references
+                          if page_key(target) not in self._anchors)
+
+    def missing(self) -> Iterator[Tuple[str, str, str]]:
+        """Find the references to anchors that do not exist on an indexed page.
+
+        References to pages that are not in the index cannot be checked and are
+        skipped.
+
+        Yields:
+            (referring_page, target_url, fragment) tuples.
+        """
+        with self._lock:
+            references = [(target, dict(fragments))
+                          for target, fragments in self._references.items()]
+            anchors_by_page = dict(self._anchors)
+
+        for target, fragments in references:
+            anchors = anchors_by_page.get(page_key(target))
+            if anchors is None:
+                continue
+            for fragment, pages in fragments.items():
+                if fragment in anchors or urllib.parse.unquote(fragment) in anchors:
+                    continue
+                for page in pages:
+                    yield page, target, fragment
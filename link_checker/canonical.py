@@ -0,0 +1,178 @@
+"""Declarative URL canonicalization rules that merge spellings of the same URL."""
+
+import fnmatch
+import re
+import threading
+import urllib.parse
+from typing import Any, List, Mapping, Optional
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# Characters that never need to be percent-encoded (RFC 3986, section 2.3)
+_UNRESERVED = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~')
+_PERCENT_ESCAPE = re.compile(r'%([0-9A-Fa-f]{2})')
+
+
+def _normalize_escape(match: 're.Match[str]') -> str:
+    """Decode an escaped unreserved character; uppercase the hex digits of others."""
+    char = chr(int(match.group(1), 16))
+    return char if char in _UNRESERVED else '%' + match.group(1).upper()
+
+
+class CanonicalRules:
+    """Rules that rewrite URLs to one canonical spelling before they are checked.
+
+    Rules are declared as a dict (e.g. loaded from a JSON file) with these keys:
+
+    - ``lowercase_host``: Lowercase the host name (default: true).
+    - ``drop_default_port``: Remove :80 from http and :443 from https URLs
+      (default: true).
+    - ``normalize_percent_encoding``: Decode escaped unreserved characters and
+      uppercase the hex digits of the other escapes (default: true).
+    - ``strip_params``: Query parameters to remove, as shell-style patterns such as
+      ``utm_*`` (default: none).
+    - ``keep_params``: If given, only the query parameters that match one of these
+      patterns are kept (default: all).
+    - ``sort_params``: Sort the query parameters (default: false).
+
+    The defaults only apply rewrites that never change which resource a URL refers
+    to. The rules also count how many URLs they rewrote.
+    """
+
+    def __init__(self,
+                 lowercase_host: bool = True,
+                 drop_default_port: bool = True,
+                 normalize_percent_encoding: bool = True,
+                 strip_params: Optional[List[str]] = None,
+                 keep_params: Optional[List[str]] = None,
+                 sort_params: bool = False):
+        """Initialize the rules.
+
+        Args:
+            lowercase_host: Lowercase the host name.
+            drop_default_port: Remove the default port of the scheme.
+            normalize_percent_encoding: Normalize percent-encoding in the path and
+                query.
+            strip_params: Patterns of query parameters to remove.
+            keep_params: Patterns of the only query parameters to keep (None for all).
+            sort_params: Sort the query parameters.
+        """
+        self.lowercase_host = lowercase_host
+        self.drop_default_port = drop_default_port
+        self.normalize_percent_encoding = normalize_percent_encoding
+        self.strip_params = list(strip_params or [])
+        self.keep_params = list(keep_params) if keep_params is not None else None
+        self.sort_params = sort_params
+
+        # Number of URLs that were rewritten; nothing is kept per URL, and the lock is
+        # only taken for a URL that needed a rewrite
+        self._lock = threading.Lock()
+        self._rewritten = 0
+
+    @classmethod
+    def from_dict(cls, rules: Mapping[str, Any]) -> 'CanonicalRules':
+        """Create rules from their declaration.
+
+        Args:
+            rules: The rules, with the keys described in the class docstring.
+
+        Returns:
+            The rules.
+
+        Raises:
+            ValueError: If a key is not a known rule.
+        """
+        known = {'lowercase_host', 'drop_default_port', 'normalize_percent_encoding',
+                 'strip_params', 'keep_params', 'sort_params'}
+        unknown = set(rules) - known
+        if unknown:
+            raise ValueError(f"Unknown canonicalization rules: {', '.join(sorted(unknown))}")
+        return cls(**rules)
+
+    def describe(self) -> List[str]:
+        """Describe the enabled rules, for the report."""
+        rules = []
+        if self.lowercase_host:
+            rules.append("lowercase host")
+        if self.drop_default_port:
+            rules.append("drop default port")
+        if self.normalize_percent_encoding:
+            rules.append("normalize percent-encoding")
+        if self.strip_params:
+            rules.append(f"strip params {', '.join(self.strip_params)}")
+        if self.keep_params is not None:
+            rules.append(f"keep only params {', '.join(self.keep_params) or '(none)'}")
+        if self.sort_params:
+            rules.append("sort params")
+        return rules
+
+    def _keep_param(self, item: str) -> bool:
+        """Check whether a name=value query item survives the parameter rules."""
+        name = urllib.parse.unquote_plus(item.split('=', 1)[0])
+        if any(fnmatch.fnmatchcase(name, pattern) for pattern in self.strip_params):
+            return False
+        return self.keep_params is None or any(fnmatch.fnmatchcase(name, pattern)
+                                               for pattern in self.keep_params)
+
+    def _canonical_netloc(self, parsed: urllib.parse.ParseResult) -> str:
+        """Rewrite the host and port of a URL."""
+        netloc = parsed.netloc
+        if not netloc or not (self.lowercase_host or self.drop_default_port):
+            return netloc
+        try:
+            port = parsed.port
+        except ValueError:
+            return netloc
+        userinfo, _, hostport = netloc.rpartition('@')
+        host = parsed.hostname or ''
+        if not self.lowercase_host:
+            # Keep the original case, without the port
+            host = hostport[:len(hostport) - len(f":{port}")] if port is not None else hostport
+            host = host.strip('[]')
+        if ':' in host:
+            host = f"[{host}]"
+        if port is not None and not (self.drop_default_port and
+                                     DEFAULT_PORTS.get(parsed.scheme) == port):
+            host = f"{host}:{port}"
+        return f"{userinfo}@{host}" if userinfo else host
+
+    def canonicalize(self, url: str) -> str:
+        """Rewrite a URL to its canonical spelling.
+
+        Args:
+            url: The URL.
+
+        Returns:
+            The canonical URL.
+        """
+        parsed = urllib.parse.urlparse(url)
+        netloc = self._canonical_netloc(parsed)
+        path = parsed.path
+        query = parsed.query
+        if self.normalize_percent_encoding:
+            path = _PERCENT_ESCAPE.sub(_normalize_escape, path)
+            query = _PERCENT_ESCAPE.sub(_normalize_escape, query)
+        if query and (self.strip_params or self.keep_params is not None or
+                      self.sort_params):
+            # The items are kept as they are spelled so that their encoding is unchanged
+            items = [item for item in query.split('&') if item and self._keep_param(item)]
+            if self.sort_params:
+                items.sort()
+            query = '&'.join(items)
+
+        canonical = urllib.parse.urlunparse((parsed.scheme, netloc, path, parsed.params,
+                                             query, parsed.fragment))
+        if canonical != url:
+            with self._lock:
+                self._rewritten += 1
+        return canonical
+
+    def urls_rewritten(self) -> int:
+        """Return how many URLs were rewritten to another spelling."""
+        with self._lock:
+            return self._rewritten
+
+    def clear(self) -> None:
+        """Reset the count of rewritten URLs, e.g. for another run."""
+        with self._lock:
+            self._rewritten = 0
@@ -0,0 +1,219 @@
+"""Per-host circuit breaker used to short-circuit requests to dead hosts."""
+
+import socket
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+# Substrings that identify a failed DNS lookup in exception messages, for the cases
+# where the underlying socket.gaierror is not reachable through the exception chain
+_DNS_FAILURE_MESSAGES = (
+    'Name or service not known',
+    'nodename nor servname provided',
+    'getaddrinfo failed',
+    'Temporary failure in name resolution',
+    'No address associated with hostname',
+    'NameResolutionError',
+)
+
+
+def is_dns_failure(exc: BaseException) -> bool:
+    """Check if an exception was caused by a failed DNS lookup.
+
+    Args:
+        exc: The exception raised while making a request.
+
+    Returns:
+        True if the exception (or any exception it wraps) is a DNS failure.
+    """
+    seen = set()
+    pending = [exc]
+    while pending:
+        current = pending.pop()
+        if current is None or id(current) in seen:
+            continue
+        seen.add(id(current))
+
+        if isinstance(current, socket.gaierror):
+            return True
+        if type(current).__name__ == 'NameResolutionError':
+            return True
+
+        # requests and urllib3 wrap the original error in args and in .reason
+        pending.extend(arg for arg in getattr(current, 'args', ())
+                       if isinstance(arg, BaseException))
+        reason = getattr(current, 'reason', None)
+        if isinstance(reason, BaseException):
+            pending.append(reason)
+        if current.__cause__ is not None:
+            pending.append(current.__cause__)
+        if current.__context__ is not None:
+            pending.append(current.__context__)
+
+    message = str(exc)
+    return any(text in message for text in _DNS_FAILURE_MESSAGES)
+
+
+class _HostState:
+    """Circuit state for a single host."""
+
+    __slots__ = ('consecutive_failures', 'opened_at', 'last_error', 'skipped',
+                 'probing', 'dns_failure', 'times_opened')
+
+    def __init__(self) -> None:
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.last_error = ''
+        self.skipped = 0
+        self.probing = False
+        self.dns_failure = False
+        self.times_opened = 0
+
+
+class HostCircuitBreaker:
+    """Track consecutive connection failures per host and short-circuit dead hosts.
+
+    A host's circuit opens after ``failure_threshold`` consecutive connection failures
+    or timeouts, or immediately after a failed DNS lookup (a negative DNS cache
+    entry). While the circuit is open, requests to the host are refused and the
+    caller is given the last recorded error instead. Once ``cooldown`` seconds have
+    passed a single probe request is let through; if it succeeds the circuit closes
+    again, otherwise it stays open for another cool-down period.
+    """
+
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 60.0):
+        """Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Number of consecutive connection failures after which a
+                host's circuit opens. Zero or a negative value disables the breaker.
+            cooldown: Seconds to wait before probing a short-circuited host again.
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._hosts: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the circuit breaker is active."""
+        return self.failure_threshold > 0
+
+    def allow_request(self, host: str) -> Optional[str]:
+        """Check whether a request to a host may be made.
+
+        Args:
+            host: The host (netloc) the request is for.
+
+        Returns:
+            None if the request may proceed, otherwise the error recorded for the
+            short-circuited host.
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None or state.opened_at is None:
+                return None
+
+            if not state.probing and time.monotonic() - state.opened_at >= self.cooldown:
+                # Half-open: let exactly one probe through
+                state.probing = True
+                return None
+
+            state.skipped += 1
+            return state.last_error
+
+    def release_probe(self, host: str) -> None:
+        """Give up a probe that allow_request() let through without making a request.
+
+        The circuit stays open, and the next request to the host after this becomes
+        the probe instead.
+
+        Args:
+            host: The host (netloc) the probe was for.
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is not None:
+                state.probing = False
+
+    def record_success(self, host: str) -> None:
+        """Record that a host responded, closing its circuit.
+
+        Args:
+            host: The host (netloc) that responded.
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                return
+            state.consecutive_failures = 0
+            state.opened_at = None
+            state.probing = False
+            state.dns_failure = False
+
+    def record_failure(self, host: str, error: str, dns_failure: bool = False) -> bool:
+        """Record a connection failure or timeout for a host.
+
+        Args:
+            host: The host (netloc) that failed.
+            error: A description of the error.
+            dns_failure: True if the host name could not be resolved; this opens the
+                circuit immediately.
+
+        Returns:
+            True if this failure opened (or re-opened) the host's circuit.
+        """
+        if not self.enabled:
+            return False
+
+        with self._lock:
+            state = self._hosts.setdefault(host, _HostState())
+            state.consecutive_failures += 1
+            state.last_error = error
+            state.dns_failure = state.dns_failure or dns_failure
+
+            if state.probing:
+                # The probe after the cool-down failed; stay open for another period
+                state.probing = False
+                state.opened_at = time.monotonic()
+                return True
+
+            if state.opened_at is None and (
+                    dns_failure or state.consecutive_failures >= self.failure_threshold):
+                state.opened_at = time.monotonic()
+                state.times_opened += 1
+                return True
+
+            return False
+
+    def start_run(self) -> None:
+        """Reset the per-run counters, keeping what is known about each host.
+
+        Hosts whose circuit is open, e.g. after a failed DNS lookup, stay
+        short-circuited until their cool-down has passed.
+        """
+        with self._lock:
+            for state in self._hosts.values():
+                state.skipped = 0
+                state.times_opened = 0
+
+    def short_circuited_hosts(self) -> Dict[str, Tuple[int, str, bool]]:
+        """Return the hosts whose circuit opened or refused requests during the run.
+
+        Returns:
+            A dict of {host: (skipped_request_count, last_error, dns_failure)}.
+        """
+        with self._lock:
+            return {host: (state.skipped, state.last_error, state.dns_failure)
+                    for host, state in self._hosts.items()
+                    if state.times_opened > 0 or state.skipped > 0}
@@ -2,19 +2,66 @@
 """Command-line interface for the link checker."""
 
 import argparse
+import copy
+import datetime
+import importlib
+import json
 import logging
+import logging.handlers
+import queue
+import socket
 import sys
-from typing import List, Optional
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional
 
 from colorama import init as colorama_init, Fore, Style
 
-from link_checker.main import LinkChecker
+from link_checker.canonical import CanonicalRules
 
 try:
     from link_checker._version import __version__  # type: ignore
 except ImportError:  # pragma: no cover
     __version__ = 'Version unspecified'
 
+if TYPE_CHECKING:
+    from link_checker.daemon import CheckerDaemon, make_server
+    from link_checker.diff import RunDiff, RunResults
+    from link_checker.events import Event
+    from link_checker.main import LinkChecker
+    from link_checker.watch import Watcher
+
+# Names imported on first use, so that --help, --version and argument errors do not
+# wait for requests and BeautifulSoup to load, and each mode only loads what it uses
+_LAZY_IMPORTS = {
+    'LinkChecker': 'link_checker.main',
+    'RunDiff': 'link_checker.diff',
+    'RunResults': 'link_checker.diff',
+    'CheckerDaemon': 'link_checker.daemon',
+    'make_server': 'link_checker.daemon',
+    'Watcher': 'link_checker.watch',
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import a lazily loaded name on first access to it as a module attribute."""
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def _load_lazy_imports(*names: str) -> None:
+    """Import lazily loaded names that are not yet loaded (or replaced, e.g. by tests).
+
+    Args:
+        *names: The names that the chosen mode is about to use.
+    """
+    for name in names:
+        if name not in globals():
+            __getattr__(name)
+
 
 # Custom formatter for colored and properly formatted logs
 class ColoredFormatter(logging.Formatter):
@@ -58,35 +105,88 @@ class ColoredFormatter(logging.Formatter):
         return color + log_message + Style.RESET_ALL
 
 
+class JsonLinesFormatter(logging.Formatter):
+    """A formatter that writes each record as a single line of JSON."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry)
+
+    def formatTime(self, record, datefmt=None):
+        """Format the time as ISO 8601 in UTC with microseconds."""
+        return datetime.datetime.fromtimestamp(record.created,
+                                               datetime.timezone.utc).isoformat()
+
+
+class TracebackQueueHandler(logging.handlers.QueueHandler):
+    """A queue handler that keeps the traceback of a record apart from its message.
+
+    QueueHandler.prepare() merges the traceback into the message, which would leave
+    JsonLinesFormatter nothing to write under 'exception'. Here the traceback is
+    formatted into exc_text instead, which text formatters still append.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            # The traceback holds the frames and their locals; don't keep them alive
+            record.exc_info = None
+        return record
+
+
+# Listener that writes queued log records from a background thread
+_log_listener: Optional[logging.handlers.QueueListener] = None
+_log_listener_lock = threading.Lock()
+
+
+def stop_logging() -> None:
+    """Write out any queued log records and stop the logging thread."""
+    global _log_listener
+    with _log_listener_lock:
+        if _log_listener is not None:
+            _log_listener.stop()
+            for handler in _log_listener.handlers:
+                handler.close()
+            _log_listener = None
+
+
 def setup_logging(verbosity: int,
                   log_file: Optional[str] = None,
-                  log_level: Optional[str] = None) -> None:
+                  log_level: Optional[str] = None,
+                  log_format: str = 'text') -> None:
     """Set up logging based on verbosity level.
 
+    Log records are put on a queue by the threads that log them and written to the
+    console and the log file by a background thread, so slow handlers never hold up
+    the worker threads. Call stop_logging() to flush the queue.
+
     Args:
         verbosity: The verbosity level (0=ERROR, 1=WARNING, 2=INFO, 3=DEBUG).
         log_file: Optional path to a file where log messages should be written.
         log_level: Optional minimum level for messages in the log file.
+        log_format: 'text' for human-readable lines or 'json' for JSON lines.
     """
-    # Initialize colorama for colored output
-    colorama_init()
+    global _log_listener
+    stop_logging()
 
-    # Ensure that Python's logging system uses periods for fractional seconds globally
-    import locale
-    locale_bak = locale.setlocale(locale.LC_ALL)
-    try:
-        # Set locale to ensure periods are used instead of commas
-        locale.setlocale(locale.LC_ALL, 'en_US.UTF-8')
-    except Exception:
-        try:
-            # Try C locale as fallback (which uses period as decimal separator)
-            locale.setlocale(locale.LC_ALL, 'C')
-        except Exception as e:
-            # If locale setting fails, just log a warning
-            print(f"Warning: Could not set locale to use periods in timestamps: {str(e)}")
-    finally:
-        # Restore original locale once logging is configured
-        locale.setlocale(locale.LC_ALL, locale_bak)
+    # Initialize colorama for colored output. Fractional seconds are written with a
+    # period by the formatters themselves, whatever the locale
+    colorama_init()
 
     # Set up logging
     root_logger = logging.getLogger()
@@ -113,6 +213,7 @@ def setup_logging(verbosity: int,
     # Create a console handler and set its level
     console_handler = logging.StreamHandler()
     console_handler.setLevel(console_log_level)
+    handlers: List[logging.Handler] = [console_handler]
 
     # Create a formatter with a custom date format using periods
     formatter = logging.Formatter(
@@ -122,10 +223,10 @@ def setup_logging(verbosity: int,
     console_handler.setFormatter(formatter)
 
     # Set up colored logging for the console handler
-    console_handler.setFormatter(ColoredFormatter(formatter._fmt))
-
-    # Add the console handler to the root logger
-    root_logger.addHandler(console_handler)
+    if log_format == 'json':
+        console_handler.setFormatter(JsonLinesFormatter())
+    else:
+        console_handler.setFormatter(ColoredFormatter(formatter._fmt))
 
     # Set up file logging if a log file is specified
     if log_file:
@@ -141,20 +242,53 @@ def setup_logging(verbosity: int,
                 fmt='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
                 datefmt='%Y-%m-%d %H:%M:%S.%f'
             )
+            if log_format == 'json':
+                file_formatter = JsonLinesFormatter()
             file_handler.setFormatter(file_formatter)
 
-            # Add the file handler to the root logger
-            root_logger.addHandler(file_handler)
-
-            logging.info(f"Logging to file: {log_file} (level: {log_level})")
+            handlers.append(file_handler)
         except Exception as e:
-            logging.error(f"Failed to set up logging to file {log_file}: {str(e)}")
+            print(f"Failed to set up logging to file {log_file}: {str(e)}", file=sys.stderr)
+
+    # Route all records through a queue to a background thread
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root_logger.addHandler(TracebackQueueHandler(log_queue))
+    with _log_listener_lock:
+        _log_listener = logging.handlers.QueueListener(log_queue, *handlers,
+                                                       respect_handler_level=True)
+        _log_listener.start()
+
+    if log_file:
+        logging.info("Logging to file: %s (level: %s)", log_file, log_level)
 
     # Set the logger for the requests library to warning to avoid verbose output
     logging.getLogger("requests").setLevel(logging.WARNING)
     logging.getLogger("urllib3").setLevel(logging.WARNING)
 
 
+def parse_time_split(value: str) -> List[float]:
+    """Parse the --max-time-split argument.
+
+    Args:
+        value: Three comma-separated proportions for the crawl, asset and external link
+            phases, e.g. "60,20,20".
+
+    Returns:
+        The proportions as a list of floats.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not three non-negative numbers.
+    """
+    try:
+        shares = [float(share) for share in value.split(',')]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid time split: {value}")
+    if len(shares) != 3 or any(share < 0 for share in shares) or sum(shares) == 0:
+        raise argparse.ArgumentTypeError(
+            f"time split must be three non-negative numbers: {value}")
+    return shares
+
+
 def create_parser() -> argparse.ArgumentParser:
     """Create the argument parser for the command line tool."""
     parser = argparse.ArgumentParser(
@@ -162,7 +296,13 @@ def create_parser() -> argparse.ArgumentParser:
         f"Version: {__version__}."
     )
     parser.add_argument(
-        "root_url", help="File or directory to check for broken links."
+        "root_url", nargs="?", default=None,
+        help="File or directory to check for broken links. Not needed with --check-urls."
+    )
+    parser.add_argument(
+        "--version",
+        action="version",
+        version=f"%(prog)s {__version__}"
     )
     parser.add_argument(
         "-v", "--verbose",
@@ -180,6 +320,12 @@ def create_parser() -> argparse.ArgumentParser:
         default="DEBUG",
         help="Minimum level for messages in the log file."
     )
+    parser.add_argument(
+        "--log-format",
+        choices=["text", "json"],
+        default="text",
+        help="Format of log messages: human-readable text or JSON lines (default: text)."
+    )
     parser.add_argument(
         "-o", "--output",
         help="Write the report to the specified file instead of stdout."
@@ -208,6 +354,278 @@ def create_parser() -> argparse.ArgumentParser:
         default=10,
         help="Maximum number of concurrent threads for requests (default: 10)."
     )
+    parser.add_argument(
+        "--host-failure-threshold",
+        type=int,
+        default=3,
+        help="Number of consecutive connection failures or timeouts after which the "
+        "remaining URLs on an external host fail immediately (default: 3, 0 to disable)."
+    )
+    parser.add_argument(
+        "--host-cooldown",
+        type=float,
+        default=60.0,
+        help="Seconds to wait before probing a short-circuited host again (default: 60)."
+    )
+    parser.add_argument(
+        "--max-external-threads",
+        type=int,
+        default=5,
+        help="Maximum number of external URLs checked concurrently across all hosts "
+        "(default: 5)."
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=None,
+        help="Maximum number of requests in flight at once across all phases "
+        "(default: no limit other than the number of threads)."
+    )
+    parser.add_argument(
+        "--max-connections-per-host",
+        type=int,
+        default=2,
+        help="Maximum number of concurrent requests to a single external host, unless "
+             "--adaptive-concurrency is used (default: 2)."
+    )
+    parser.add_argument(
+        "--external-cache",
+        default=None,
+        help="SQLite file in which external link verdicts are cached between runs."
+    )
+    parser.add_argument(
+        "--external-cache-ttl",
+        type=float,
+        default=168.0,
+        help="Hours after which a cached healthy external link is re-verified "
+        "(default: 168). Failing links are always re-checked."
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=0,
+        help="Number of times to retry a request that fails with a connection error, a "
+        "timeout, or a 429, 502, 503 or 504 status (default: 0)."
+    )
+    parser.add_argument(
+        "--retry-backoff",
+        type=float,
+        default=0.5,
+        help="Base delay in seconds for exponential backoff between retries (default: 0.5)."
+    )
+    parser.add_argument(
+        "--retry-backoff-max",
+        type=float,
+        default=30.0,
+        help="Maximum delay in seconds between retries (default: 30). A longer "
+        "Retry-After means the request is not retried."
+    )
+    parser.add_argument(
+        "--host-retry-budget",
+        type=int,
+        default=10,
+        help="Maximum number of retries made to a single host during a run (default: 10)."
+    )
+    parser.add_argument(
+        "--adaptive-concurrency",
+        action="store_true",
+        help="Adjust the number of concurrent requests to each host based on observed "
+        "latency and errors."
+    )
+    parser.add_argument(
+        "--min-concurrency",
+        type=int,
+        default=1,
+        help="Minimum concurrent requests per host with --adaptive-concurrency (default: 1)."
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=32,
+        help="Maximum concurrent requests per host with --adaptive-concurrency "
+        "(default: 32)."
+    )
+    parser.add_argument(
+        "--max-time",
+        type=float,
+        default=None,
+        help="Wall-clock time budget in seconds for the whole run (default: unlimited). "
+        "When it runs out the report is produced and marked incomplete."
+    )
+    parser.add_argument(
+        "--max-time-split",
+        type=parse_time_split,
+        default=None,
+        help="Proportions of --max-time for the crawl, asset and external link phases, "
+        "e.g. 60,20,20. Time left over by a phase goes to the following phases."
+    )
+    parser.add_argument(
+        "--grace-period",
+        type=float,
+        default=5.0,
+        help="Seconds that in-flight requests are given to finish once the time budget "
+        "runs out (default: 5)."
+    )
+    parser.add_argument(
+        "--max-url-length",
+        type=int,
+        default=2048,
+        help="Pages with longer URLs are not crawled but reported as suspected crawl traps "
+        "(default: 2048, 0 for no limit)."
+    )
+    parser.add_argument(
+        "--max-repeated-segments",
+        type=int,
+        default=3,
+        help="Pages whose path repeats the same segments this many times in a row, e.g. "
+        "/a/b/a/b/a/b, are reported as suspected crawl traps (default: 3, 0 to disable)."
+    )
+    parser.add_argument(
+        "--max-query-variants",
+        type=int,
+        default=100,
+        help="Maximum number of distinct query strings crawled for one path; further "
+        "variants are reported as suspected crawl traps (default: 100, 0 for no limit)."
+    )
+    parser.add_argument(
+        "--canonical-rules",
+        metavar="FILE",
+        help="JSON file with the rules that rewrite URLs to one canonical spelling, e.g. "
+        '{"strip_params": ["utm_*", "v"], "sort_params": true}. By default hosts are '
+        "lowercased, default ports dropped and percent-encoding normalized."
+    )
+    parser.add_argument(
+        "--no-link-block-reuse",
+        action="store_true",
+        help="Resolve every link of every page, instead of resolving the links of "
+        "header, nav and footer blocks repeated across pages once."
+    )
+    parser.add_argument(
+        "--check-anchors",
+        action="store_true",
+        help="Check that links to fragments (page.html#section) point to an existing id "
+        "or name on the target page."
+    )
+    parser.add_argument(
+        "--respect-robots",
+        action="store_true",
+        help="Fetch each host's robots.txt and skip the URLs it disallows. A Crawl-delay "
+        "sets the minimum interval between requests to the host."
+    )
+    parser.add_argument(
+        "--result-store",
+        default=None,
+        help="SQLite file in which results are stored instead of in memory, for very "
+        "large sites. The file is kept after the run and can be queried."
+    )
+    parser.add_argument(
+        "--incremental",
+        default=None,
+        metavar="STATE_FILE",
+        help="SQLite file holding the link graph of the previous run. Pages that did not "
+        "change are not parsed again and links that were healthy are not re-checked."
+    )
+    parser.add_argument(
+        "--sitemap",
+        default=None,
+        help="With --incremental, URL of a sitemap whose lastmod dates tell which pages "
+        "changed. Pages whose lastmod is older than their last check are not requested."
+    )
+    parser.add_argument(
+        "--changed-paths-file",
+        default=None,
+        help="With --incremental, file listing the paths or URLs that changed (e.g. from "
+        "a deploy manifest), one per line. Other known pages are not requested."
+    )
+    parser.add_argument(
+        "--pages-file",
+        default=None,
+        help="File listing the only pages to check, one URL or path per line (e.g. the "
+        "pages changed by a deploy). Everything they link to is checked, but no other "
+        "page is crawled."
+    )
+    parser.add_argument(
+        "--check-urls",
+        default=None,
+        metavar="FILE",
+        help="Check the URLs listed in FILE (- for stdin), one per line, without crawling, "
+        "and write one JSON line per URL with its status to the output. The list is read "
+        "as it is checked, so it can be arbitrarily long."
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Stay resident and serve check jobs posted as JSON to /jobs, streaming "
+        "the results back as JSON lines. Connections and the external verdict cache "
+        "stay warm between jobs. The root URL is given by each job, so --incremental, "
+        "--compare-to and --pages-file cannot be used."
+    )
+    parser.add_argument(
+        "--daemon-port",
+        type=int,
+        default=8765,
+        help="Localhost port the daemon listens on (default: 8765)."
+    )
+    parser.add_argument(
+        "--daemon-socket",
+        default=None,
+        metavar="PATH",
+        help="Unix socket the daemon listens on instead of the localhost port (not on "
+        "Windows)."
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep monitoring the site: re-check each page and link on a schedule that "
+        "adapts to how often it changes, and write one JSON line per change (status, "
+        "content, added or removed links) to the output until interrupted."
+    )
+    parser.add_argument(
+        "--watch-rate",
+        type=float,
+        default=1.0,
+        help="Maximum number of requests per second in watch mode (default: 1)."
+    )
+    parser.add_argument(
+        "--watch-min-interval",
+        type=float,
+        default=600.0,
+        help="Shortest time in seconds between two checks of a page or link in watch mode "
+        "(default: 600)."
+    )
+    parser.add_argument(
+        "--watch-max-interval",
+        type=float,
+        default=86400.0,
+        help="Longest time in seconds between two checks of a page or link in watch mode "
+        "(default: 86400)."
+    )
+    parser.add_argument(
+        "--save-results",
+        default=None,
+        help="Save the broken links and external hosts of this run to a JSON file "
+        "(gzip-compressed if the name ends in .gz) for use with --compare-to."
+    )
+    parser.add_argument(
+        "--compare-to",
+        default=None,
+        help="Results file saved by --save-results in a previous run. Only the new, "
+        "fixed and persisting broken links and new external hosts are reported."
+    )
+    parser.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="With --compare-to, exit with status 1 if new broken links were found."
+    )
+    parser.add_argument(
+        "--fail-fast",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Stop as soon as N distinct broken URLs are found and exit with status 1. "
+        "Links that were broken in the --compare-to results, and links added since the "
+        "--incremental state was saved, are checked first."
+    )
     parser.add_argument(
         "--ignore-asset-url-file",
         default=None,
@@ -239,6 +657,132 @@ def read_list_from_file(file_path: str) -> List[str]:
         return [line.strip() for line in f if line.strip() and not line.startswith('#')]
 
 
+def read_canonical_rules(file_path: str) -> Dict[str, Any]:
+    """Read the URL canonicalization rules from a JSON file.
+
+    Args:
+        file_path: Path to the file.
+
+    Returns:
+        The rules, as accepted by CanonicalRules.from_dict().
+
+    Raises:
+        ValueError: If the file does not hold a JSON object of known rules.
+    """
+    with open(file_path, 'r') as f:
+        rules = json.load(f)
+    if not isinstance(rules, dict):
+        raise ValueError("the rules must be a JSON object")
+    # Fail before the crawl starts if a rule is unknown
+    CanonicalRules.from_dict(rules)
+    return rules
+
+
+def iter_urls(lines: Iterable[str]) -> Iterator[str]:
+    """Yield the URLs of a URL list, skipping blank lines and comments.
+
+    Args:
+        lines: The lines of the list.
+
+    Returns:
+        An iterator over the URLs.
+    """
+    for line in lines:
+        url = line.strip()
+        if url and not url.startswith('#'):
+            yield url
+
+
+def check_url_list(checker: 'LinkChecker', source: str, output: Optional[str]) -> None:
+    """Check the URLs listed in a file and write a JSON line with the verdict of each.
+
+    Args:
+        checker: The link checker to check the URLs with.
+        source: The file listing the URLs, or '-' for stdin.
+        output: The file to write the verdicts to, or None for stdout.
+    """
+    counts = {'broken': 0, 'unchecked': 0}
+
+    def write(url: str, status_code: Optional[int]) -> None:
+        if status_code is None:
+            ok = None
+            counts['unchecked'] += 1
+        else:
+            ok = 0 < status_code < 400
+            if not ok:
+                counts['broken'] += 1
+        output_file.write(json.dumps({'url': url, 'status': status_code, 'ok': ok}) + '\n')
+
+    input_file = sys.stdin if source == '-' else open(source, 'r')
+    output_file = open(output, 'w') if output else sys.stdout
+    try:
+        checked = checker.check_url_list(iter_urls(input_file), write)
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+        else:
+            output_file.flush()
+
+    logging.info(f"Checked {checked} URLs: {counts['broken']} broken, "
+                 f"{counts['unchecked']} not checked")
+
+
+def serve_daemon(checker: 'LinkChecker', port: int, socket_path: Optional[str]) -> None:
+    """Serve check jobs with a resident checker until interrupted.
+
+    Args:
+        checker: The link checker that runs the jobs.
+        port: Localhost port to listen on.
+        socket_path: Unix socket to listen on instead of the port (None for the port).
+    """
+    _load_lazy_imports('CheckerDaemon', 'make_server')
+    server = make_server(CheckerDaemon(checker), port=port, socket_path=socket_path)
+    logging.info(f"Serving check jobs on {socket_path or f'http://127.0.0.1:{port}'}/jobs")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("Daemon stopped")
+    finally:
+        server.server_close()
+
+
+def watch_site(checker: 'LinkChecker',
+               requests_per_second: float,
+               min_interval: float,
+               max_interval: float,
+               output: Optional[str]) -> None:
+    """Monitor a site until interrupted, writing a JSON line for each change.
+
+    Args:
+        checker: The link checker whose root URL (or listed pages) is watched.
+        requests_per_second: Maximum number of requests per second.
+        min_interval: Shortest time in seconds between two checks of a target.
+        max_interval: Longest time in seconds between two checks of a target.
+        output: The file to write the changes to, or None for stdout.
+    """
+    output_file = open(output, 'a') if output else sys.stdout
+
+    def write(event: 'Event') -> None:
+        record = event.to_dict()
+        record['time'] = datetime.datetime.now().isoformat(timespec='seconds')
+        output_file.write(json.dumps(record) + '\n')
+        output_file.flush()
+
+    _load_lazy_imports('Watcher')
+    watcher = Watcher(checker, requests_per_second, min_interval, max_interval, write)
+    logging.info(f"Watching {', '.join(watcher.roots)} at up to {requests_per_second:g} "
+                 "requests per second")
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        logging.info(f"Watch stopped after {watcher.checks} checks")
+    finally:
+        if output_file is not sys.stdout:
+            output_file.close()
+
+
 def main(args: Optional[List[str]] = None) -> int:
     """Run the link checker from the command line.
 
@@ -250,14 +794,37 @@ def main(args: Optional[List[str]] = None) -> int:
     """
     try:
         # Parse command-line arguments
-        parsed_args = create_parser().parse_args(args)
+        parser = create_parser()
+        parsed_args = parser.parse_args(args)
+        if parsed_args.root_url is None and not (parsed_args.check_urls or parsed_args.daemon):
+            parser.error("the root_url argument is required unless --check-urls or --daemon "
+                         "is given")
+        if parsed_args.daemon:
+            # Their state belongs to one site, but the daemon's jobs are for any site
+            for option in ('incremental', 'compare_to', 'pages_file'):
+                if getattr(parsed_args, option):
+                    parser.error(f"--{option.replace('_', '-')} cannot be used with --daemon")
+        if parsed_args.daemon_socket is not None and not hasattr(socket, 'AF_UNIX'):
+            parser.error("--daemon-socket is not supported on this platform, which has no "
+                         "Unix sockets; use --daemon-port")
 
         # Set up logging
-        setup_logging(parsed_args.verbose, parsed_args.log_file, parsed_args.log_level)
+        setup_logging(parsed_args.verbose, parsed_args.log_file, parsed_args.log_level,
+                      parsed_args.log_format)
 
         if parsed_args.log_file:
             logging.info(f"Logs will be written to: {parsed_args.log_file}")
 
+        # Load the previous run's results before spending time on this one
+        previous_results = None
+        if parsed_args.compare_to:
+            _load_lazy_imports('RunResults')
+            try:
+                previous_results = RunResults.load(parsed_args.compare_to)
+            except (OSError, ValueError, KeyError) as e:
+                logging.error(f"Error reading previous results file: {e}")
+                return 1
+
         # Read ignored paths from files
         ignored_asset_paths = None
         ignored_internal_paths = None
@@ -287,15 +854,105 @@ def main(args: Optional[List[str]] = None) -> int:
                 logging.error(f"Error reading ignored external links file: {e}")
                 return 1
 
-        # Create a link checker
-        checker = LinkChecker(parsed_args.root_url,
+        pages = None
+        if parsed_args.pages_file:
+            try:
+                pages = read_list_from_file(parsed_args.pages_file)
+                logging.info(f"Loaded {len(pages)} pages to check")
+            except Exception as e:
+                logging.error(f"Error reading pages file: {e}")
+                return 1
+
+        canonical_rules = None
+        if parsed_args.canonical_rules:
+            try:
+                canonical_rules = read_canonical_rules(parsed_args.canonical_rules)
+            except Exception as e:
+                logging.error(f"Error reading canonicalization rules: {e}")
+                return 1
+
+        # Links that were broken last time are the most likely to still be broken
+        suspect_links = None
+        if previous_results is not None:
+            suspect_links = list(previous_results.broken_links)
+
+        changed_paths = None
+        if parsed_args.changed_paths_file:
+            try:
+                changed_paths = read_list_from_file(parsed_args.changed_paths_file)
+                logging.info(f"Loaded {len(changed_paths)} changed paths")
+            except Exception as e:
+                logging.error(f"Error reading changed paths file: {e}")
+                return 1
+
+        # Load the checker only now that there is something to check
+        _load_lazy_imports('LinkChecker')
+        checker = LinkChecker(parsed_args.root_url or '',
                               ignored_asset_paths or [],
                               ignored_internal_paths or [],
                               ignored_external_links=ignored_external_links,
                               timeout=parsed_args.timeout,
                               max_requests=parsed_args.max_requests,
                               max_depth=parsed_args.max_depth,
-                              max_threads=parsed_args.max_threads)
+                              max_threads=parsed_args.max_threads,
+                              host_failure_threshold=parsed_args.host_failure_threshold,
+                              host_cooldown=parsed_args.host_cooldown,
+                              max_external_threads=parsed_args.max_external_threads,
+                              max_connections_per_host=parsed_args.max_connections_per_host,
+                              # A daemon keeps the verdicts in memory between its jobs
+                              external_cache=(parsed_args.external_cache or
+                                              (':memory:' if parsed_args.daemon else None)),
+                              external_cache_ttl=parsed_args.external_cache_ttl * 3600,
+                              max_retries=parsed_args.retries,
+                              retry_backoff=parsed_args.retry_backoff,
+                              retry_backoff_max=parsed_args.retry_backoff_max,
+                              host_retry_budget=parsed_args.host_retry_budget,
+                              adaptive_concurrency=parsed_args.adaptive_concurrency,
+                              min_concurrency=parsed_args.min_concurrency,
+                              max_concurrency=parsed_args.max_concurrency,
+                              max_time=parsed_args.max_time,
+                              max_time_split=parsed_args.max_time_split,
+                              grace_period=parsed_args.grace_period,
+                              result_store=parsed_args.result_store,
+                              incremental_state=parsed_args.incremental,
+                              sitemap_url=parsed_args.sitemap,
+                              changed_paths=changed_paths,
+                              check_anchors=parsed_args.check_anchors,
+                              respect_robots=parsed_args.respect_robots,
+                              fail_fast=parsed_args.fail_fast,
+                              suspect_links=suspect_links,
+                              pages=pages,
+                              max_url_length=parsed_args.max_url_length,
+                              max_repeated_segments=parsed_args.max_repeated_segments,
+                              max_query_variants=parsed_args.max_query_variants,
+                              canonical_rules=canonical_rules,
+                              reuse_link_blocks=not parsed_args.no_link_block_reuse,
+                              max_in_flight=parsed_args.max_in_flight)
+
+        # Check a list of URLs instead of crawling
+        if parsed_args.check_urls:
+            try:
+                check_url_list(checker, parsed_args.check_urls, parsed_args.output)
+            finally:
+                checker.close()
+            return 0
+
+        # Serve check jobs until interrupted
+        if parsed_args.daemon:
+            try:
+                serve_daemon(checker, parsed_args.daemon_port, parsed_args.daemon_socket)
+            finally:
+                checker.close()
+            return 0
+
+        # Monitor the site until interrupted
+        if parsed_args.watch:
+            try:
+                watch_site(checker, parsed_args.watch_rate, parsed_args.watch_min_interval,
+                           parsed_args.watch_max_interval, parsed_args.output)
+            finally:
+                checker.close()
+            return 0
 
         logging.info(f"Starting link checker with: timeout={parsed_args.timeout}s, "
                      f"max_requests={parsed_args.max_requests}, "
@@ -309,14 +966,37 @@ def main(args: Optional[List[str]] = None) -> int:
         if parsed_args.output:
             sys.stdout = open(parsed_args.output, 'w')
 
-        # Print the report
-        checker.print_report()
+        # Print the report, or only the changes since the previous run
+        diff = None
+        if previous_results is not None or parsed_args.save_results:
+            _load_lazy_imports('RunResults', 'RunDiff')
+            results = RunResults.from_checker(checker)
+            if previous_results is not None:
+                diff = RunDiff(previous_results, results)
+            if parsed_args.save_results:
+                results.save(parsed_args.save_results)
+                logging.info(f"Results saved to: {parsed_args.save_results}")
+
+        if diff is not None:
+            diff.print_report()
+        else:
+            checker.print_report()
+        checker.close()
 
         # Close the output file if specified
         if parsed_args.output:
             sys.stdout.close()
             sys.stdout = sys.__stdout__
 
+        if parsed_args.fail_on_regression and diff is not None and diff.has_regressions:
+            logging.error(f"{len(diff.new)} new broken links since the previous run")
+            return 1
+
+        if (parsed_args.fail_fast is not None and
+                len(checker.broken_urls_found) >= parsed_args.fail_fast):
+            logging.error(f"Found {len(checker.broken_urls_found)} broken links")
+            return 1
+
         # Return success exit code (0)
         return 0
 
@@ -324,6 +1004,10 @@ def main(args: Optional[List[str]] = None) -> int:
         logging.error(f"An error occurred: {str(e)}", exc_info=True)
         return 1
 
+    finally:
+        # Write out the log records still queued for the logging thread
+        stop_logging()
+
 
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1,241 @@
+"""Resident link checker that serves check jobs over a local socket.
+
+A daemon keeps one LinkChecker between jobs, so its worker pool, the keep-alive
+connections of its HTTP session and its external verdict cache stay warm. Jobs are
+posted as JSON to ``/jobs`` over localhost HTTP or a Unix socket, and the results are
+streamed back as JSON lines while the job runs:
+
+    curl -N -d '{"root_url": "https://example.com", "max_depth": 2}' \\
+        http://127.0.0.1:8765/jobs
+
+Jobs run one at a time; a job posted while another runs waits for it.
+"""
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+if TYPE_CHECKING:
+    from link_checker.main import LinkChecker
+
+logger = logging.getLogger(__name__)
+
+# Fields of a job and the types of their values, as passed to LinkChecker.retarget()
+JOB_FIELDS: Dict[str, Any] = {
+    'root_url': str,
+    'ignored_asset_paths': list,
+    'ignored_internal_paths': list,
+    'ignored_external_links': list,
+    'max_requests': int,
+    'max_depth': int,
+    'max_time': (int, float),
+    'pages': list,
+}
+
+
+def parse_job(body: bytes) -> Dict[str, Any]:
+    """Parse and validate a job posted to the daemon.
+
+    Args:
+        body: The JSON body of the request.
+
+    Returns:
+        The job, as keyword arguments of LinkChecker.retarget().
+
+    Raises:
+        ValueError: If the body is not a JSON object of known fields with a root_url.
+    """
+    job = json.loads(body.decode('utf-8'))
+    if not isinstance(job, dict):
+        raise ValueError("the job must be a JSON object")
+    unknown = set(job) - set(JOB_FIELDS)
+    if unknown:
+        raise ValueError(f"unknown job fields: {', '.join(sorted(unknown))}")
+    if 'root_url' not in job:
+        raise ValueError("the job has no root_url")
+    for name, value in job.items():
+        if value is not None and (isinstance(value, bool) or
+                                  not isinstance(value, JOB_FIELDS[name])):
+            raise ValueError(f"invalid value for {name}: {value!r}")
+    return job
+
+
+class CheckerDaemon:
+    """Runs jobs one at a time on a resident LinkChecker."""
+
+    def __init__(self, checker: 'LinkChecker'):
+        """Initialize the daemon.
+
+        Args:
+            checker: The checker that runs the jobs. Its settings other than those of
+                a job (timeouts, concurrency, retries, caches, ...) apply to all jobs.
+        """
+        self.checker = checker
+        self.jobs_run = 0
+        self._job_lock = threading.Lock()
+
+    @property
+    def busy(self) -> bool:
+        """Whether a job is running."""
+        return self._job_lock.locked()
+
+    def run_job(self, job: Dict[str, Any], write: Callable[[Dict[str, Any]], None]) -> None:
+        """Run a job, writing its results as they are found.
+
+        Every result record of LinkChecker.iter_events() is written as a dict (see
+        Event.to_dict()), followed by a JobFinished record with the totals. If write
+        raises, e.g. because the client went away, the job is cancelled.
+
+        Args:
+            job: The job, as returned by parse_job().
+            write: Called with each record.
+        """
+        with self._job_lock:
+            self.checker.retarget(**job)
+            logger.info("Starting job for %s", self.checker.root_url)
+            events = self.checker.iter_events()
+            try:
+                for event in events:
+                    write(event.to_dict())
+            finally:
+                # Cancels the rest of the run if write raised
+                events.close()
+            self.jobs_run += 1
+            write(self.job_summary())
+
+    def job_summary(self) -> Dict[str, Any]:
+        """Return the totals of the last job."""
+        checker = self.checker
+        return {
+            'event': 'JobFinished',
+            'root_url': checker.root_url,
+            'pages_visited': checker.actual_visited_pages_count,
+            'broken_links': checker.broken_links.count(),
+            'requests': checker.request_count,
+            'incomplete': list(checker.incomplete_reasons),
+        }
+
+    def status(self) -> Dict[str, Any]:
+        """Return the status of the daemon."""
+        return {'busy': self.busy, 'jobs_run': self.jobs_run}
+
+
+class _JobHandler(BaseHTTPRequestHandler):
+    """Serves the daemon's HTTP API: POST /jobs and GET /status."""
+
+    server: '_DaemonServer'
+
+    def _send_json(self, status: int, record: Dict[str, Any]) -> None:
+        body = (json.dumps(record) + '\n').encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path == '/status':
+            self._send_json(200, self.server.checker_daemon.status())
+        else:
+            self._send_json(404, {'error': f"Not found: {self.path}"})
+
+    def do_POST(self) -> None:
+        if self.path != '/jobs':
+            self._send_json(404, {'error': f"Not found: {self.path}"})
+            return
+        try:
+            job = parse_job(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        except ValueError as e:
+            self._send_json(400, {'error': str(e)})
+            return
+
+        # The records are streamed until the job ends and the connection is closed
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.end_headers()
+
+        def write(record: Dict[str, Any]) -> None:
+            self.wfile.write((json.dumps(record) + '\n').encode('utf-8'))
+            self.wfile.flush()
+
+        try:
+            self.server.checker_daemon.run_job(job, write)
+        except OSError:
+            logger.info("Client went away; job cancelled")
+        except Exception as e:
+            logger.error("Job failed: %s", e)
+            try:
+                write({'event': 'JobFailed', 'error': str(e)})
+            except OSError:
+                pass
+
+    def address_string(self) -> str:
+        # Unix socket clients have no address
+        return str(self.client_address[0]) if self.client_address else 'local'
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class _DaemonServer(ThreadingHTTPServer):
+    """Localhost HTTP server of a daemon."""
+
+    daemon_threads = True
+    checker_daemon: CheckerDaemon
+
+
+# Windows has no Unix sockets
+UNIX_SOCKETS = hasattr(socket, 'AF_UNIX')
+
+if UNIX_SOCKETS:
+    class _UnixDaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        """Unix socket server of a daemon, speaking the same HTTP API."""
+
+        daemon_threads = True
+        checker_daemon: CheckerDaemon
+
+        def __init__(self, socket_path: str):
+            self.socket_path = socket_path
+            super().__init__(socket_path, _JobHandler)
+
+        def server_close(self) -> None:
+            super().server_close()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+
+def make_server(checker_daemon: CheckerDaemon,
+                host: str = '127.0.0.1',
+                port: int = 8765,
+                socket_path: Optional[str] = None) -> socketserver.BaseServer:
+    """Create the server of a daemon.
+
+    Args:
+        checker_daemon: The daemon that runs the jobs.
+        host: Address to listen on for HTTP.
+        port: Port to listen on for HTTP (0 for any free port).
+        socket_path: Path of a Unix socket to listen on instead of HTTP over TCP. A
+            stale socket file left by a previous daemon is replaced.
+
+    Returns:
+        The server; call serve_forever() to serve jobs.
+
+    Raises:
+        ValueError: If a socket path is given on a platform without Unix sockets.
+    """
+    server: Any
+    if socket_path is not None:
+        if not UNIX_SOCKETS:
+            raise ValueError("Unix sockets are not available on this platform")
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = _UnixDaemonServer(socket_path)
+    else:
+        server = _DaemonServer((host, port), _JobHandler)
+    server.checker_daemon = checker_daemon
+    return server
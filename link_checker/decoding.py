@@ -0,0 +1,103 @@
+"""Content negotiation and character encoding detection for HTML pages."""
+
+import codecs
+import re
+from typing import Optional, Union
+
+from bs4 import BeautifulSoup
+from urllib3.util.request import ACCEPT_ENCODING
+
+# Content codings that urllib3 can decode while streaming the body: gzip and deflate
+# always, br when the brotli package is installed, and zstd when zstandard is
+ACCEPT_ENCODING_HEADER = ACCEPT_ENCODING.replace(',', ', ')
+
+# Number of bytes at the start of a page searched for a <meta> charset declaration
+META_SCAN_BYTES = 1024
+
+_CHARSET_PARAM = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+_META_CHARSET = re.compile(
+    rb'<meta[^>]+charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+
+_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+
+def _known_encoding(name: str) -> Optional[str]:
+    """Return the canonical name of an encoding, or None if Python does not know it."""
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def sniff_encoding(content: bytes, content_type: str = '') -> str:
+    """Determine the character encoding of an HTML page without decoding all of it.
+
+    The encoding is taken from a byte order mark, then the charset of the
+    Content-Type header, then a <meta> declaration near the start of the page. Pages
+    that declare nothing are assumed to be UTF-8. No statistical detection is run
+    over the body.
+
+    Args:
+        content: The raw bytes of the page.
+        content_type: The Content-Type header of the response.
+
+    Returns:
+        The name of the encoding.
+    """
+    for bom, encoding in _BOMS:
+        if content.startswith(bom):
+            return encoding
+
+    header_match = _CHARSET_PARAM.search(content_type)
+    if header_match:
+        declared = _known_encoding(header_match.group(1))
+        if declared:
+            return declared
+
+    meta_match = _META_CHARSET.search(content[:META_SCAN_BYTES])
+    if meta_match:
+        declared = _known_encoding(meta_match.group(1).decode('ascii', 'replace'))
+        if declared:
+            return declared
+
+    return 'utf-8'
+
+
+class HtmlBytes(bytes):
+    """The raw bytes of an HTML page, carrying the encoding to decode them with."""
+
+    encoding: str
+
+    def __new__(cls, content: bytes, encoding: str) -> 'HtmlBytes':
+        """Wrap a page's bytes.
+
+        Args:
+            content: The raw bytes of the page.
+            encoding: The encoding found by sniff_encoding().
+        """
+        page = super().__new__(cls, content)
+        page.encoding = encoding
+        return page
+
+
+def make_soup(content: Union[str, bytes], content_type: str = '') -> BeautifulSoup:
+    """Parse an HTML page, decoding raw bytes with their sniffed encoding.
+
+    Args:
+        content: The page as text, as raw bytes or as HtmlBytes.
+        content_type: The Content-Type header of the response, for raw bytes.
+
+    Returns:
+        The parsed page.
+    """
+    if isinstance(content, str):
+        return BeautifulSoup(content, 'html.parser')
+    encoding = (content.encoding if isinstance(content, HtmlBytes)
+                else sniff_encoding(content, content_type))
+    return BeautifulSoup(content, 'html.parser', from_encoding=encoding)
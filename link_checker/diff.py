@@ -0,0 +1,185 @@
+"""Comparison of link checker results between runs."""
+
+import gzip
+import io
+import json
+import urllib.parse
+from typing import Dict, IO, List, Set, Tuple
+
+from link_checker.main import LinkChecker
+
+# Version of the saved results format
+RESULTS_FORMAT_VERSION = 1
+
+# A broken link is identified by the page it was found on and its target URL
+BrokenKey = Tuple[str, str]
+
+
+class RunResults:
+    """The parts of a run's results that are compared between runs."""
+
+    def __init__(self,
+                 root_url: str,
+                 broken_links: Dict[BrokenKey, int],
+                 external_hosts: Set[str],
+                 incomplete: bool = False):
+        """Initialize the results.
+
+        Args:
+            root_url: The root URL that was checked.
+            broken_links: A dict of {(page_url, broken_url): status_code}.
+            external_hosts: The hosts of all external links found.
+            incomplete: Whether the run was cut short.
+        """
+        self.root_url = root_url
+        self.broken_links = broken_links
+        self.external_hosts = external_hosts
+        self.incomplete = incomplete
+
+    @classmethod
+    def from_checker(cls, checker: LinkChecker) -> 'RunResults':
+        """Collect the results of a finished run.
+
+        Args:
+            checker: The link checker after run() has returned.
+
+        Returns:
+            The results of the run.
+        """
+        broken_links = {}
+        for page_url, links in checker.broken_links.items():
+            for link, status in links.items():
+                broken_links[(page_url, link)] = status
+
+        external_hosts = {urllib.parse.urlparse(url).netloc
+                          for url in checker.external_links.targets()}
+        return cls(checker.root_url, broken_links, external_hosts,
+                   bool(checker.incomplete_reasons))
+
+    def save(self, path: str) -> None:
+        """Save the results as JSON, compressed with gzip if the path ends in .gz.
+
+        Args:
+            path: The file to write.
+        """
+        grouped: Dict[str, Dict[str, int]] = {}
+        for (page_url, link), status in self.broken_links.items():
+            grouped.setdefault(page_url, {})[link] = status
+
+        data = {
+            'version': RESULTS_FORMAT_VERSION,
+            'root_url': self.root_url,
+            'incomplete': self.incomplete,
+            'broken_links': grouped,
+            'external_hosts': sorted(self.external_hosts),
+        }
+        with _open(path, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path: str) -> 'RunResults':
+        """Load results saved by save().
+
+        Args:
+            path: The file to read.
+
+        Returns:
+            The saved results.
+
+        Raises:
+            ValueError: If the file is not in a supported format.
+        """
+        with _open(path, 'r') as f:
+            data = json.load(f)
+
+        if not isinstance(data, dict) or data.get('version') != RESULTS_FORMAT_VERSION:
+            raise ValueError(f"Unsupported results file: {path}")
+
+        broken_links = {(page_url, link): status
+                        for page_url, links in data['broken_links'].items()
+                        for link, status in links.items()}
+        return cls(data['root_url'], broken_links, set(data['external_hosts']),
+                   data.get('incomplete', False))
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    """Open a results file as text, transparently handling gzip compression."""
+    if path.endswith('.gz'):
+        return io.TextIOWrapper(gzip.GzipFile(path, mode + 'b'), encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+class RunDiff:
+    """The differences between a previous run and the current one."""
+
+    def __init__(self, previous: RunResults, current: RunResults):
+        """Compare two runs.
+
+        Broken links are matched on (page URL, broken URL) using set operations on
+        the hashed keys, so the comparison is linear in the number of broken links.
+
+        Args:
+            previous: The results of the previous run.
+            current: The results of the current run.
+        """
+        self.previous = previous
+        self.current = current
+
+        previous_keys = previous.broken_links.keys()
+        current_keys = current.broken_links.keys()
+
+        # {(page_url, broken_url): status_code}
+        self.new: Dict[BrokenKey, int] = {
+            key: current.broken_links[key] for key in current_keys - previous_keys}
+        self.fixed: Dict[BrokenKey, int] = {
+            key: previous.broken_links[key] for key in previous_keys - current_keys}
+        self.persisting: Dict[BrokenKey, int] = {
+            key: current.broken_links[key] for key in current_keys & previous_keys}
+
+        self.new_external_hosts: Set[str] = current.external_hosts - previous.external_hosts
+
+    @property
+    def has_regressions(self) -> bool:
+        """Whether the current run found broken links the previous run did not."""
+        return bool(self.new)
+
+    def print_report(self) -> None:
+        """Print a short report of what changed since the previous run."""
+        print("=== CHANGES SINCE PREVIOUS RUN ===")
+        print(f"Root URL: {self.current.root_url}")
+        if self.previous.root_url != self.current.root_url:
+            print(f"Previous root URL: {self.previous.root_url}")
+        if self.current.incomplete or self.previous.incomplete:
+            print("Note: a run was incomplete, so some links may show as fixed or new "
+                  "only because they were not checked")
+
+        self._print_links("NEW BROKEN LINKS", self.new)
+        self._print_links("FIXED BROKEN LINKS", self.fixed)
+
+        if self.new_external_hosts:
+            print(f"\n=== NEW EXTERNAL HOSTS ({len(self.new_external_hosts)}) ===")
+            for host in sorted(self.new_external_hosts):
+                print(f"  - {host}")
+
+        print("\n=== SUMMARY ===")
+        print(f"New broken links: {len(self.new)}")
+        print(f"Fixed broken links: {len(self.fixed)}")
+        print(f"Persisting broken links: {len(self.persisting)}")
+        print(f"New external hosts: {len(self.new_external_hosts)}")
+
+    @staticmethod
+    def _print_links(title: str, links: Dict[BrokenKey, int]) -> None:
+        """Print broken links grouped by the page they were found on."""
+        if not links:
+            return
+
+        print(f"\n=== {title} ({len(links)}) ===")
+        by_page: Dict[str, List[Tuple[str, int]]] = {}
+        for (page_url, link), status in links.items():
+            by_page.setdefault(page_url, []).append((link, status))
+
+        for page_url in sorted(by_page):
+            print(f"\nOn page: {page_url}")
+            for link, status in sorted(by_page[page_url]):
+                status_str = str(status) if status else "Connection error"
+                print(f"  - {link} (Status: {status_str})")
@@ -0,0 +1,198 @@
+"""Result records streamed while a check runs, and the bounded queue that carries them."""
+
+import queue
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+# How often blocked producers and consumers look again whether the stream was closed
+_POLL_INTERVAL = 0.1
+
+
+class Event:
+    """Base class of the result records yielded by LinkChecker.iter_events()."""
+
+    __slots__: Tuple[str, ...] = ()
+
+    def _values(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other: Any) -> bool:
+        return type(self) is type(other) and self._values() == other._values()
+
+    def __hash__(self) -> int:
+        return hash((type(self).__name__,) + self._values())
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the record as a dict, e.g. for JSON, with its type under 'event'."""
+        record: Dict[str, Any] = {'event': type(self).__name__}
+        record.update(zip(self.__slots__, self._values()))
+        return record
+
+
+class PageVisited(Event):
+    """An internal page was fetched (or reused from the previous run) and parsed."""
+
+    __slots__ = ('url', 'status_code', 'depth')
+
+    def __init__(self, url: str, status_code: Optional[int], depth: int):
+        self.url = url
+        self.status_code = status_code
+        self.depth = depth
+
+
+class BrokenLink(Event):
+    """A link on a page points to a URL that could not be accessed.
+
+    The status code is 0 for a connection error or a timeout.
+    """
+
+    __slots__ = ('page_url', 'url', 'status_code')
+
+    def __init__(self, page_url: str, url: str, status_code: int):
+        self.page_url = page_url
+        self.url = url
+        self.status_code = status_code
+
+
+class AssetFound(Event):
+    """A page references an internal asset (image, stylesheet, script, ...)."""
+
+    __slots__ = ('page_url', 'url', 'asset_type')
+
+    def __init__(self, page_url: str, url: str, asset_type: str):
+        self.page_url = page_url
+        self.url = url
+        self.asset_type = asset_type
+
+
+class ExternalVerdict(Event):
+    """An external URL was checked, or its verdict was taken from the cache.
+
+    The status code is 0 for a connection error, a timeout or a short-circuited host.
+    """
+
+    __slots__ = ('url', 'status_code', 'cached')
+
+    def __init__(self, url: str, status_code: int, cached: bool = False):
+        self.url = url
+        self.status_code = status_code
+        self.cached = cached
+
+
+class StatusChanged(Event):
+    """A watched page or link answered with another status than when last checked.
+
+    The previous status is None when a target is broken the first time it is checked.
+    The status code is 0 for a connection error or a timeout.
+    """
+
+    __slots__ = ('url', 'previous_status', 'status_code')
+
+    def __init__(self, url: str, previous_status: Optional[int], status_code: int):
+        self.url = url
+        self.previous_status = previous_status
+        self.status_code = status_code
+
+
+class TargetSkipped(Event):
+    """A watched page or link is not requested because robots.txt disallows it."""
+
+    __slots__ = ('url',)
+
+    def __init__(self, url: str):
+        self.url = url
+
+
+class ContentChanged(Event):
+    """The content of a watched page changed since it was last checked."""
+
+    __slots__ = ('url',)
+
+    def __init__(self, url: str):
+        self.url = url
+
+
+class LinkAdded(Event):
+    """A watched page links to a URL it did not link to when last checked."""
+
+    __slots__ = ('page_url', 'url')
+
+    def __init__(self, page_url: str, url: str):
+        self.page_url = page_url
+        self.url = url
+
+
+class LinkRemoved(Event):
+    """A watched page no longer links to a URL it linked to when last checked."""
+
+    __slots__ = ('page_url', 'url')
+
+    def __init__(self, page_url: str, url: str):
+        self.page_url = page_url
+        self.url = url
+
+
+class EventStream:
+    """A bounded queue of events between the checker's workers and one consumer.
+
+    Workers block in publish() while the queue is full, so a slow consumer slows
+    the check down instead of letting the queue grow without bound.
+    """
+
+    def __init__(self, max_queued: int = 1000):
+        """Initialize the stream.
+
+        Args:
+            max_queued: Maximum number of events waiting for the consumer.
+        """
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, max_queued))
+        self._closed = threading.Event()
+        self._cancelled = threading.Event()
+
+    def publish(self, event: Event) -> bool:
+        """Queue an event, waiting while the queue is full.
+
+        Args:
+            event: The event to queue.
+
+        Returns:
+            False if the consumer went away and the event was dropped.
+        """
+        while not self._cancelled.is_set():
+            try:
+                self._queue.put(event, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def close(self) -> None:
+        """Signal that no more events will be published."""
+        self._closed.set()
+
+    @property
+    def closed(self) -> bool:
+        """Whether the producer has finished publishing."""
+        return self._closed.is_set()
+
+    def cancel(self) -> None:
+        """Signal that the consumer went away; pending and future events are dropped."""
+        self._cancelled.set()
+
+    def get(self) -> Optional[Event]:
+        """Wait for the next event.
+
+        Returns:
+            The next event, or None once the stream is closed and drained, or cancelled.
+        """
+        while not self._cancelled.is_set():
+            try:
+                return self._queue.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                if self._closed.is_set() and self._queue.empty():
+                    return None
+        return None
@@ -0,0 +1,318 @@
+"""State kept between runs for incremental crawls."""
+
+import datetime
+import email.utils
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import urllib.parse
+import xml.etree.ElementTree as ElementTree
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple, Union
+
+
+def content_hash(content: Union[str, bytes]) -> str:
+    """Return a short hash of a page's content.
+
+    Args:
+        content: The HTML content of the page, as text or raw bytes.
+
+    Returns:
+        A hex digest identifying the content.
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8', 'surrogatepass')
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[float]:
+    """Parse a sitemap ``lastmod`` value (a W3C datetime) or an HTTP date.
+
+    Args:
+        value: The value to parse.
+
+    Returns:
+        The time as a Unix timestamp, or None if the value is missing or invalid.
+        Values without a time zone are taken to be UTC.
+    """
+    if not value:
+        return None
+    value = value.strip()
+
+    try:
+        parsed = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            parsed = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            return None
+        if parsed is None:
+            return None
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.timestamp()
+
+
+def parse_sitemap(content: bytes) -> Tuple[Dict[str, Optional[float]], List[str]]:
+    """Parse a sitemap or a sitemap index.
+
+    Args:
+        content: The XML document.
+
+    Returns:
+        A tuple of ({page_url: lastmod_timestamp}, [child_sitemap_url, ...]). The
+        lastmod of a page is None if the sitemap does not give one.
+
+    Raises:
+        ElementTree.ParseError: If the document is not well-formed XML.
+    """
+    root = ElementTree.fromstring(content)
+    pages: Dict[str, Optional[float]] = {}
+    children: List[str] = []
+
+    for entry in root:
+        tag = entry.tag.rsplit('}', 1)[-1]
+        loc = lastmod = None
+        for field in entry:
+            name = field.tag.rsplit('}', 1)[-1]
+            if name == 'loc':
+                loc = (field.text or '').strip()
+            elif name == 'lastmod':
+                lastmod = field.text
+        if not loc:
+            continue
+        if tag == 'sitemap':
+            children.append(loc)
+        elif tag == 'url':
+            pages[loc.rstrip('/')] = parse_lastmod(lastmod)
+
+    return pages, children
+
+
+def _manifest_path(entry: str) -> str:
+    """Normalize a changed-paths manifest entry or a page URL to a bare path."""
+    path = urllib.parse.urlparse(entry).path if '://' in entry else entry
+    path = path.strip().strip('/')
+    if path.endswith('index.html'):
+        path = path[:-len('index.html')].rstrip('/')
+    return path
+
+
+class CrawlState:
+    """Link graph and validators of the pages seen in the previous run.
+
+    For every crawled page the state records its ETag and Last-Modified validators,
+    a hash of its content, and its outgoing links and assets (its edges). It also
+    records the link targets that were verified as healthy. A page is known to be
+    unchanged when a deploy manifest of changed paths does not list it, when its
+    sitemap ``lastmod`` is older than the previous check, or when a conditional
+    request returns 304; the page is then not parsed again and its stored edges are
+    reused. A page whose content hash did not change reuses its edges as well.
+
+    The state is stored in an SQLite file. The previous run's rows are read on
+    demand; the current run's rows are buffered and written by save().
+    """
+
+    def __init__(self, path: str, changed_paths: Optional[Iterable[str]] = None):
+        """Open (and create if necessary) the state file.
+
+        Args:
+            path: Path to the SQLite file.
+            changed_paths: Paths or URLs listed by a deploy manifest as changed. When
+                given, pages from the previous run that are not listed are assumed to
+                be unchanged without requesting them.
+        """
+        self.path = path
+        self.changed_paths: Optional[Set[str]] = None
+        if changed_paths is not None:
+            self.changed_paths = {_manifest_path(entry) for entry in changed_paths}
+        self.sitemap: Dict[str, Optional[float]] = {}
+
+        # Counters for reporting
+        self.pages_skipped = 0
+        self.pages_not_modified = 0
+        self.pages_same_content = 0
+        self.targets_skipped = 0
+
+        self._lock = threading.Lock()
+        self._pages: Dict[str, Tuple[Optional[str], Optional[str], str, float, str]] = {}
+        self._validators: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self._healthy: Set[str] = set()
+
+        self._conn = sqlite3.connect(path, timeout=30.0, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        with self._conn:
+            self._conn.execute('CREATE TABLE IF NOT EXISTS pages ('
+                               'url TEXT PRIMARY KEY, '
+                               'etag TEXT, '
+                               'last_modified TEXT, '
+                               'content_hash TEXT NOT NULL, '
+                               'checked_at REAL NOT NULL, '
+                               'edges TEXT NOT NULL)')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS healthy_targets ('
+                               'url TEXT PRIMARY KEY)')
+
+    def start_run(self) -> None:
+        """Forget the state recorded by an earlier run of the same checker."""
+        with self._lock:
+            self.sitemap = {}
+            self.pages_skipped = 0
+            self.pages_not_modified = 0
+            self.pages_same_content = 0
+            self.targets_skipped = 0
+            self._pages = {}
+            self._validators = {}
+            self._healthy = set()
+
+    def get_page(self, url: str) -> Optional[Dict[str, Any]]:
+        """Look up a page crawled in the previous run.
+
+        Args:
+            url: The page URL.
+
+        Returns:
+            A dict with the keys etag, last_modified, content_hash, checked_at and
+            edges, or None if the page was not crawled in the previous run.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT etag, last_modified, content_hash, checked_at, edges '
+                'FROM pages WHERE url = ?', (url,)).fetchone()
+        if row is None:
+            return None
+        return {'etag': row[0], 'last_modified': row[1], 'content_hash': row[2],
+                'checked_at': row[3], 'edges': json.loads(row[4])}
+
+    def is_unchanged(self, url: str, page: Mapping[str, Any]) -> bool:
+        """Decide without a request whether a page is known to be unchanged.
+
+        Args:
+            url: The page URL.
+            page: The page's state from get_page().
+
+        Returns:
+            True if the deploy manifest or the sitemap shows that the page has not
+            changed since it was last checked.
+        """
+        if self.changed_paths is not None:
+            # Manifest entries may be relative to a parent of the crawl root, so match
+            # the page path and each of its trailing segments
+            segments = _manifest_path(url).split('/')
+            return not any('/'.join(segments[i:]) in self.changed_paths
+                           for i in range(len(segments)))
+
+        lastmod = self.sitemap.get(url.rstrip('/'))
+        return lastmod is not None and lastmod <= page['checked_at']
+
+    @staticmethod
+    def conditional_headers(page: Mapping[str, Any]) -> Dict[str, str]:
+        """Return the headers for a conditional request for a page.
+
+        Args:
+            page: The page's state from get_page().
+
+        Returns:
+            The If-None-Match and If-Modified-Since headers for the stored validators.
+        """
+        headers = {}
+        if page['etag']:
+            headers['If-None-Match'] = page['etag']
+        if page['last_modified']:
+            headers['If-Modified-Since'] = page['last_modified']
+        return headers
+
+    def note_validators(self, url: str, headers: Mapping[str, str]) -> None:
+        """Remember the validators of a page response until the page is recorded.
+
+        Args:
+            url: The page URL.
+            headers: The response headers.
+        """
+        with self._lock:
+            self._validators[url] = (headers.get('ETag'), headers.get('Last-Modified'))
+
+    def record_page(self, url: str, content_digest: str, edges: Dict[str, Any],
+                    previous: Optional[Mapping[str, Any]] = None,
+                    checked: bool = True) -> None:
+        """Record the state of a page in the current run.
+
+        Args:
+            url: The page URL.
+            content_digest: The hash of the page's content.
+            edges: The page's links and assets.
+            previous: The page's state from the previous run, whose validators are
+                kept if the response did not carry new ones.
+            checked: Whether the page was requested in this run. Pages skipped
+                without a request keep their previous check time.
+        """
+        with self._lock:
+            etag, last_modified = self._validators.pop(url, (None, None))
+            if previous is not None:
+                etag = etag or previous['etag']
+                last_modified = last_modified or previous['last_modified']
+            checked_at = (time.time() if checked or previous is None
+                          else previous['checked_at'])
+            self._pages[url] = (etag, last_modified, content_digest, checked_at,
+                                json.dumps(edges, separators=(',', ':')))
+
+    def was_healthy(self, url: str) -> bool:
+        """Check whether a link target was verified as healthy in the previous run.
+
+        A target that was healthy is carried over into the current run's state.
+
+        Args:
+            url: The target URL.
+
+        Returns:
+            True if the target does not need to be verified again.
+        """
+        with self._lock:
+            found = self._conn.execute('SELECT 1 FROM healthy_targets WHERE url = ?',
+                                       (url,)).fetchone() is not None
+            if found:
+                self._healthy.add(url)
+                self.targets_skipped += 1
+            return found
+
+    def mark_healthy(self, url: str) -> None:
+        """Record that a link target was verified as healthy in this run.
+
+        Args:
+            url: The target URL.
+        """
+        with self._lock:
+            self._healthy.add(url)
+
+    def save(self, complete: bool, broken: Iterable[str] = ()) -> None:
+        """Write the current run's state to the file.
+
+        Args:
+            complete: Whether the run finished. The state of a complete run replaces
+                the previous state; that of an incomplete run is merged into it, so
+                that pages the run did not reach keep their previous state.
+            broken: URLs found broken in this run, which are dropped from a merged
+                state.
+        """
+        with self._lock, self._conn:
+            if complete:
+                self._conn.execute('DELETE FROM pages')
+                self._conn.execute('DELETE FROM healthy_targets')
+            else:
+                rows = [(url,) for url in broken]
+                self._conn.executemany('DELETE FROM pages WHERE url = ?', rows)
+                self._conn.executemany('DELETE FROM healthy_targets WHERE url = ?', rows)
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO pages '
+                '(url, etag, last_modified, content_hash, checked_at, edges) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                [(url,) + page for url, page in self._pages.items()])
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO healthy_targets (url) VALUES (?)',
+                [(url,) for url in self._healthy])
+
+    def close(self) -> None:
+        """Close the state file without saving."""
+        with self._lock:
+            self._conn.close()
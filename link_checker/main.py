@@ -1,18 +1,40 @@
 """Main link checking functionality."""
 
+import asyncio
+import hashlib
+import itertools
 import logging
 import time
 import urllib.parse
-from collections import defaultdict
-from typing import Dict, List, Set, Tuple, Optional
+import xml.etree.ElementTree as ElementTree
+from collections import defaultdict, deque
+from typing import (Any, AsyncIterator, Callable, Dict, Generator, Iterable, Iterator, List, Sequence, Set,
+                    Tuple, Optional, Union)
 import concurrent.futures
 import threading
 import queue
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 from bs4 import Tag
 
+from link_checker.anchors import AnchorIndex, find_anchors, is_checkable_fragment
+from link_checker.adaptive import (AdaptiveConcurrencyLimiter, OUTCOME_ERROR,
+                                   OUTCOME_OK, OUTCOME_THROTTLED)
+from link_checker.decoding import ACCEPT_ENCODING_HEADER, HtmlBytes, make_soup, sniff_encoding
+from link_checker.canonical import CanonicalRules
+from link_checker.circuit_breaker import HostCircuitBreaker, is_dns_failure
+from link_checker.events import (AssetFound, BrokenLink, Event, EventStream, ExternalVerdict,
+                                 PageVisited)
+from link_checker.incremental import CrawlState, content_hash, parse_sitemap
+from link_checker.retry import RETRYABLE_STATUS_CODES, RetryPolicy
+from link_checker.robots import HostPacer, RobotsCache
+from link_checker.scheduler import RequestBudget, RequestScheduler
+from link_checker.store import MapRelation, PageMap, PageSet, ResultStore, SetRelation
+from link_checker.templates import BlockEntry, LinkBlockCache, find_blocks, resolution_context
+from link_checker.traps import TrapDetector
+from link_checker.verdict_cache import ExternalVerdictCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,7 +49,38 @@ class LinkChecker:
                  timeout: float = 10.0,
                  max_requests: Optional[int] = None,
                  max_depth: Optional[int] = None,
-                 max_threads: int = 10):
+                 max_threads: int = 10,
+                 host_failure_threshold: int = 3,
+                 host_cooldown: float = 60.0,
+                 max_external_threads: int = 5,
+                 max_connections_per_host: int = 2,
+                 external_cache: Optional[str] = None,
+                 external_cache_ttl: float = 7 * 24 * 3600.0,
+                 max_retries: int = 0,
+                 retry_backoff: float = 0.5,
+                 retry_backoff_max: float = 30.0,
+                 host_retry_budget: int = 10,
+                 adaptive_concurrency: bool = False,
+                 min_concurrency: int = 1,
+                 max_concurrency: int = 32,
+                 max_time: Optional[float] = None,
+                 max_time_split: Optional[Sequence[float]] = None,
+                 grace_period: float = 5.0,
+                 result_store: Optional[str] = None,
+                 incremental_state: Optional[str] = None,
+                 sitemap_url: Optional[str] = None,
+                 changed_paths: Optional[List[str]] = None,
+                 check_anchors: bool = False,
+                 respect_robots: bool = False,
+                 fail_fast: Optional[int] = None,
+                 suspect_links: Optional[Iterable[Tuple[str, str]]] = None,
+                 pages: Optional[List[str]] = None,
+                 max_url_length: Optional[int] = 2048,
+                 max_repeated_segments: Optional[int] = 3,
+                 max_query_variants: Optional[int] = 100,
+                 canonical_rules: Optional[Dict[str, Any]] = None,
+                 reuse_link_blocks: bool = True,
+                 max_in_flight: Optional[int] = None):
         """Initialize the link checker with a root URL.
 
         Args:
@@ -39,7 +92,84 @@ class LinkChecker:
             max_requests: Maximum number of requests to make (None for unlimited).
             max_depth: Maximum depth to crawl (None for unlimited).
             max_threads: Maximum number of concurrent threads for requests.
+            host_failure_threshold: Number of consecutive connection failures or
+                timeouts after which the remaining URLs on an external host fail
+                immediately (0 to disable).
+            host_cooldown: Seconds to wait before probing a short-circuited external
+                host again.
+            max_external_threads: Maximum number of external URLs checked concurrently
+                (across all hosts).
+            max_connections_per_host: Maximum number of concurrent requests to a single
+                external host (in adaptive concurrency mode, max_concurrency applies
+                instead).
+            external_cache: Path to an SQLite file in which external link verdicts are
+                cached between runs (None to disable).
+            external_cache_ttl: Seconds after which a cached healthy verdict is
+                re-verified. Failing links are always re-checked.
+            max_retries: Maximum number of retries for a request that fails with a
+                connection error, a timeout, or a 429, 502, 503 or 504 status.
+            retry_backoff: Base delay in seconds for exponential backoff between retries.
+            retry_backoff_max: Maximum delay in seconds between retries.
+            host_retry_budget: Maximum number of retries made to a single host.
+            adaptive_concurrency: Adjust the number of concurrent requests to each host
+                based on observed latency and errors instead of using a fixed number.
+            min_concurrency: Minimum concurrent requests per host in adaptive mode.
+            max_concurrency: Maximum concurrent requests per host in adaptive mode.
+            max_time: Wall-clock time budget in seconds for the whole run (None for
+                unlimited). When it runs out the report is marked incomplete.
+            max_time_split: Optional proportions of the time budget for the crawl, asset
+                and external link phases. Time left over by a phase is shared by the
+                following phases.
+            grace_period: Seconds that in-flight requests are given to finish once a
+                time budget runs out.
+            result_store: Path to an SQLite file in which the results are stored instead
+                of in memory (None to keep them in memory). Use this for very large
+                sites; the file is kept after the run.
+            incremental_state: Path to an SQLite file holding the link graph of the
+                previous run (None to disable). Pages that have not changed since
+                then are not parsed again, and targets verified as healthy are not
+                re-checked.
+            sitemap_url: URL of a sitemap whose lastmod dates tell which pages changed
+                (used with incremental_state).
+            changed_paths: Paths or URLs of the pages that changed, e.g. from a deploy
+                manifest (used with incremental_state). Other pages from the previous
+                run are reused without requesting them.
+            check_anchors: Check that links to fragments (page#anchor) point to an
+                existing id or name on the target page.
+            respect_robots: Fetch each host's robots.txt once and skip the URLs it
+                disallows. Its Crawl-delay (or Request-rate) sets the minimum interval
+                between requests to the host.
+            fail_fast: Stop the run as soon as this many distinct broken URLs have
+                been found (None to check everything). Suspect links, and links that
+                are new since the incremental state was saved, are then checked as
+                soon as the page linking to them is parsed instead of in their phase.
+            suspect_links: (page_url, url) pairs of links that were broken in a
+                previous run. With fail_fast, their pages are visited first.
+            pages: URLs (or paths relative to the root URL) of the only pages to
+                fetch, e.g. the pages changed by a deploy. Everything they link to is
+                checked, but no other page is crawled. None to crawl from the root URL.
+            max_url_length: Pages with longer URLs are not crawled but listed as
+                suspected crawl traps (None or 0 for no limit).
+            max_repeated_segments: Pages whose path repeats the same segments back to
+                back this many times (e.g. /a/b/a/b/a/b) are suspected crawl traps
+                (None or 0 to disable).
+            max_query_variants: Maximum number of distinct query strings crawled for
+                one path; further variants are suspected crawl traps (None or 0 for no
+                limit).
+            canonical_rules: Rules that rewrite every URL to one canonical spelling
+                so that its variants are fetched once, as a dict (see CanonicalRules).
+                None for the default rules, which lowercase the host, drop default
+                ports and normalize percent-encoding.
+            reuse_link_blocks: Resolve the links of header, nav and footer blocks
+                repeated on many pages once and reuse them, instead of resolving and
+                categorizing them again on every page.
+            max_in_flight: Maximum number of HTTP requests in flight at once across
+                all phases (None for no limit other than the size of the worker pool,
+                which is the larger of max_threads and max_external_threads).
         """
+        # Rules that merge spellings of the same URL before it is checked
+        self.canonical_rules = CanonicalRules.from_dict(canonical_rules or {})
+
         self.root_url = self._normalize_url(root_url)
         self.root_domain = urllib.parse.urlparse(self.root_url).netloc
 
@@ -53,17 +183,54 @@ class LinkChecker:
         self.max_requests = max_requests
         self.max_depth = max_depth
         self.max_threads = max_threads
-        self.request_count = 0
 
-        # Counter for actual visited pages (not including duplicates)
-        self.actual_visited_pages_count = 0
-
-        # Store visited URLs to avoid duplicates
-        self.visited_urls: Set[str] = set()
+        # Global limit on the number of requests, shared by all phases of a run
+        self.request_budget = RequestBudget(max_requests)
+
+        # Adaptive per-host concurrency (AIMD) driven by latency and errors
+        self.adaptive_limiter: Optional[AdaptiveConcurrencyLimiter] = None
+        if adaptive_concurrency:
+            self.adaptive_limiter = AdaptiveConcurrencyLimiter(min_concurrency,
+                                                               max_concurrency)
+
+        # Per-host circuit breaker for external hosts that are down
+        self.host_failure_threshold = host_failure_threshold
+        self.host_cooldown = host_cooldown
+
+        # External links are checked grouped by host with their own concurrency limits
+        self.max_external_threads = max(1, max_external_threads)
+        self.max_connections_per_host = max(1, max_connections_per_host)
+
+        # Cross-run cache of external link verdicts
+        self.verdict_cache: Optional[ExternalVerdictCache] = None
+        if external_cache:
+            self.verdict_cache = ExternalVerdictCache(external_cache, external_cache_ttl)
+
+        # Link graph of the previous run for incremental crawls
+        self.sitemap_url = sitemap_url
+        self.crawl_state: Optional[CrawlState] = None
+        if incremental_state:
+            self.crawl_state = CrawlState(incremental_state, changed_paths)
+
+        # Settings of the retry policy for transient failures
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.retry_backoff_max = retry_backoff_max
+        self.host_retry_budget = host_retry_budget
+
+        # Wall-clock time budget. _deadline is the end of the whole run; the phase
+        # values are set by _begin_phase() while a phase runs.
+        self.max_time = max_time
+        self.max_time_split = list(max_time_split) if max_time_split else None
+        self.grace_period = grace_period
+        self._deadline: Optional[float] = None
+        self._phase_name = ''
+        self._phase_deadline: Optional[float] = None
+        self._phase_stop_at: Optional[float] = None
+        self._stop_lock = threading.Lock()
 
         # Thread safety locks
         self.visited_urls_lock = threading.Lock()
-        self.request_count_lock = threading.Lock()
         self.broken_links_lock = threading.Lock()
         self.internal_assets_lock = threading.Lock()
         self.ignored_internal_assets_lock = threading.Lock()
@@ -71,26 +238,169 @@ class LinkChecker:
         self.ignored_external_links_lock = threading.Lock()
         self.counter_lock = threading.Lock()
 
-        # Store URLs to visit
-        self.urls_to_visit: List[str] = [self.root_url]
+        # Anchors of the parsed pages for checking links to fragments
+        self.anchor_index: Optional[AnchorIndex] = AnchorIndex() if check_anchors else None
+
+        # Results are kept in memory, or in an SQLite file for very large sites
+        self.result_store: Optional[ResultStore] = None
+        if result_store:
+            self.result_store = ResultStore(result_store)
+
+        # One long-lived worker pool shared by all phases and runs. It can also bound
+        # the number of requests in flight across all phases below the pool size.
+        pool_size = max(self._worker_threads(), self.max_external_threads)
+        self.scheduler = RequestScheduler(pool_size, max_in_flight)
+        self._has_run = False
+
+        # Session for making requests. The connection pools are sized so that
+        # keep-alive connections to every host being checked concurrently stay open.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=max(10, self.max_external_threads + 1),
+            pool_maxsize=max(10, self._worker_threads(), self.max_connections_per_host))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'User-Agent':
+                'link_checker/0.1.0 (+https://github.com/yourusername/link_checker)',
+            # Ask for every content coding that can be decoded while streaming
+            'Accept-Encoding': ACCEPT_ENCODING_HEADER,
+        })
+
+        # robots.txt rules of every host, and pacing of the requests to each host
+        self.robots: Optional[RobotsCache] = None
+        if respect_robots:
+            self.robots = RobotsCache(self._fetch_robots,
+                                      str(self.session.headers['User-Agent']))
+        self.host_pacer = HostPacer()
+
+        # Fail-fast mode: likely broken links are checked first and the run stops at
+        # the threshold
+        self.fail_fast = fail_fast
+        self.suspect_urls: Set[str] = set()
+        self.suspect_pages: List[str] = []
+        for page_url, url in suspect_links or ():
+            self.suspect_urls.add(url)
+            if page_url != 'root' and page_url not in self.suspect_pages:
+                self.suspect_pages.append(page_url)
+
+        # Heuristics that keep crawl traps out of the crawl queue
+        self.trap_detector = TrapDetector(max_url_length, max_repeated_segments,
+                                          max_query_variants)
+
+        # Resolved links of boilerplate blocks shared by many pages
+        self.link_block_cache = LinkBlockCache() if reuse_link_blocks else None
+
+        # Targeted mode: only these pages are fetched and their links checked
+        self.target_pages: Optional[List[str]] = None
+        if pages is not None:
+            self.target_pages = list(dict.fromkeys(self._resolve_target_page(page)
+                                                   for page in pages))
+
+        # Stream of result records while iter_events() or aiter_events() runs a check
+        self.event_stream: Optional[EventStream] = None
+        self._stream_thread: Optional[threading.Thread] = None
+        self._stream_error: Optional[BaseException] = None
+
+        # Per-host circuit breaker for external hosts that are down, which also caches
+        # failed DNS lookups; it is kept across runs
+        self.circuit_breaker = HostCircuitBreaker(self.host_failure_threshold,
+                                                  self.host_cooldown)
+
+        self._reset_results()
+
+    def _reset_results(self) -> None:
+        """Clear the results and the per-run state so that a new run can start.
+
+        The worker pool, the HTTP session with its keep-alive connections, the external
+        verdict cache, the circuit breaker's host states (including failed DNS
+        lookups), the robots.txt rules and the adaptive concurrency limits are kept.
+        """
+        self.request_budget.reset()
+        self.circuit_breaker.start_run()
+
+        # Retry policy for transient failures
+        self.retry_policy = RetryPolicy(self.max_retries, self.retry_backoff,
+                                        self.retry_backoff_max, self.host_retry_budget)
+
+        # External URLs whose verdict was taken from the cache
+        self.cached_external_urls: Set[str] = set()
+
+        if self.crawl_state is not None:
+            self.crawl_state.start_run()
+        if self.anchor_index is not None:
+            self.anchor_index.clear()
+
+        # URLs that were not checked because robots.txt disallows them
+        self.robots_skipped: Set[str] = set()
+
+        # Pages not crawled because they look like crawl traps: {url: reason}
+        self.trap_detector.clear()
+        self.suspected_traps: Dict[str, str] = {}
+
+        # Count of URLs rewritten by the canonicalization rules
+        self.canonical_rules.clear()
+        if self.link_block_cache is not None:
+            self.link_block_cache.clear()
+
+        self.stop_event = threading.Event()
+        self.incomplete_reasons: List[str] = []
+        self._cancelled = False
+
+        # Counter for actual visited pages (not including duplicates)
+        self.actual_visited_pages_count = 0
+
+        # Size of the HTML pages downloaded, as transferred and after decompression
+        self.html_bytes_on_wire = 0
+        self.html_bytes_decoded = 0
+
+        # Store visited URLs to avoid duplicates
+        self.visited_urls: Set[str] = set()
+
+        # Store URLs to visit: the root URL, or the listed pages in targeted mode
+        self.urls_to_visit: List[str] = (list(self.target_pages) if self.target_pages is not None
+                                         else [self.root_url])
         self.urls_to_visit_queue: queue.Queue = queue.Queue()
-        self.urls_to_visit_queue.put((self.root_url, 0, ""))  # URL, depth, and referring URL
+        for page_url in self.urls_to_visit:
+            self.urls_to_visit_queue.put((page_url, 0, ""))  # URL, depth, and referring URL
+
+        # In fail-fast mode, pages that likely link to broken URLs are visited before
+        # the rest of the queue, and targets checked during the crawl keep their
+        # verdict (None while the check is running) for the later phases
+        self.priority_queue: queue.Queue = queue.Queue()
+        self.priority_pages: Set[str] = set()
+        self.early_verdicts: Dict[str, Optional[int]] = {}
+        self._priority_futures: List[concurrent.futures.Future] = []
+        self.broken_urls_found: Set[str] = set()
+        if self.fail_fast is not None and self.max_depth is None:
+            # Their referring URL is None: they are only visited early, not reported
+            for page_url in self.suspect_pages:
+                self.priority_queue.put((page_url, 0, None))
+
+        if self.result_store is not None:
+            self.result_store.clear()
+            self.result_store.set_info('root_url', self.root_url)
 
         # Store broken links: {url_where_found: {broken_url: status_code}}
-        self.broken_links: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self.broken_links: MapRelation = self._new_relation('broken_links', PageMap)
 
         # Store internal assets: {url_where_found: {asset_url: asset_type}}
-        self.internal_assets: Dict[str, Dict[str, str]] = defaultdict(dict)
+        self.internal_assets: MapRelation = self._new_relation('internal_assets', PageMap)
 
         # Store ignored internal assets: {url_where_found: {asset_url: asset_type}}
-        self.ignored_internal_assets_found: Dict[str, Dict[str, str]] = defaultdict(dict)
+        self.ignored_internal_assets_found: MapRelation = self._new_relation(
+            'ignored_internal_assets', PageMap)
 
         # Store external links: {url_where_found: set(external_urls)}
-        self.external_links: Dict[str, Set[str]] = defaultdict(set)
+        self.external_links: SetRelation = self._new_relation('external_links', PageSet)
 
         # Store ignored external links found:
         # {url_where_found: set(ignored_external_urls)}
-        self.ignored_external_links_found: Dict[str, Set[str]] = defaultdict(set)
+        self.ignored_external_links_found: SetRelation = self._new_relation(
+            'ignored_external_links', PageSet)
+
+        # Store links to missing anchors: {url_where_found: set(url#fragment)}
+        self.broken_anchors: SetRelation = self._new_relation('broken_anchors', PageSet)
 
         # Counters for reporting
         self.non_crawled_urls_count = 0
@@ -100,16 +410,114 @@ class LinkChecker:
         self.external_urls_count = 0
         self.ignored_external_urls_count = 0
 
-        # Session for making requests
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent':
-                'link_checker/0.1.0 (+https://github.com/yourusername/link_checker)'
-        })
-
-        # Save the start time when initialized
+        # Save the start time of the run
         self.start_time = time.time()
 
+    @property
+    def request_count(self) -> int:
+        """Number of requests made in the current run, including retries.
+
+        Setting it changes how much of the request budget is used, e.g. 0 to make
+        the whole budget available again.
+        """
+        return self.request_budget.used
+
+    @request_count.setter
+    def request_count(self, value: int) -> None:
+        self.request_budget.used = value
+
+    def _reserve_request(self) -> bool:
+        """Reserve a request from the global request budget.
+
+        When the budget is used up the checker stops dispatching new work.
+
+        Returns:
+            True if the request may be made.
+        """
+        if self.request_budget.reserve():
+            return True
+        self._stop(f"Reached maximum number of requests ({self.max_requests})")
+        return False
+
+    def _fetch_robots(self, robots_url: str) -> Optional[Tuple[int, str]]:
+        """Fetch a robots.txt file for the robots.txt cache.
+
+        Args:
+            robots_url: The URL of the robots.txt file.
+
+        Returns:
+            A tuple of (status_code, content), with status 0 for a connection error,
+            or None if the request limit was reached.
+        """
+        if not self._reserve_request():
+            return None
+        try:
+            response = self._request('get', robots_url, allow_redirects=True)
+        except requests.RequestException as e:
+            logger.warning(f"Could not fetch {robots_url}: {str(e)}")
+            return 0, ''
+        logger.debug("Fetched %s (Status: %s)", robots_url, response.status_code)
+        return response.status_code, response.text if response.status_code == 200 else ''
+
+    def _robots_allowed(self, url: str) -> bool:
+        """Check whether robots.txt allows a URL to be requested.
+
+        URLs that are disallowed are recorded as skipped.
+
+        Args:
+            url: The URL about to be checked.
+
+        Returns:
+            True if robots.txt is not respected or allows the URL.
+        """
+        if self.robots is None or self.robots.allowed(url):
+            return True
+        logger.info("Skipped by robots.txt: %s", url)
+        with self.counter_lock:
+            self.robots_skipped.add(url)
+        return False
+
+    def _new_relation(self, table: str, factory: Callable[[], Any]) -> Any:
+        """Create a result relation in the result store if there is one, else in memory.
+
+        Args:
+            table: Name of the relation's table in the result store.
+            factory: Class of the in-memory relation (PageMap or PageSet).
+
+        Returns:
+            The new, empty relation.
+        """
+        if self.result_store is not None:
+            return self.result_store.relation(table)
+        return factory()
+
+    def _worker_threads(self) -> int:
+        """Return the number of worker threads to use for crawling and asset checks.
+
+        In adaptive concurrency mode the pools are sized for the upper bound, and the
+        per-host limits decide how many of the threads actually make requests.
+
+        Returns:
+            The number of worker threads.
+        """
+        if self.adaptive_limiter is not None:
+            return max(self.max_threads, self.adaptive_limiter.max_concurrency)
+        return self.max_threads
+
+    def _host_lane_limit(self, host: str) -> int:
+        """Return how many workers may check the URLs of an external host at once.
+
+        Args:
+            host: The host (netloc).
+
+        Returns:
+            max_connections_per_host, or in adaptive concurrency mode the host's current
+            limit.
+        """
+        if self.adaptive_limiter is None:
+            return self.max_connections_per_host
+        return self.adaptive_limiter.limit(host)
+
     def _normalize_url(self, url: str) -> str:
         """Normalize the URL to avoid duplicates.
 
@@ -119,6 +527,8 @@ class LinkChecker:
         Returns:
             The normalized URL.
         """
+        # Apply the canonicalization rules, e.g. to drop tracking parameters
+        url = self.canonical_rules.canonicalize(urllib.parse.urldefrag(url)[0])
         parsed = urllib.parse.urlparse(url)
 
         # Remove trailing slashes
@@ -147,8 +557,8 @@ class LinkChecker:
             ))
 
             if hasattr(self, 'visited_urls') and canonical_url in self.visited_urls:
-                logger.debug(f"URL '{url}' is a duplicate of '{canonical_url}' which "
-                             "has already been visited")
+                logger.debug("URL '%s' is a duplicate of '%s' which "
+                             "has already been visited", url, canonical_url)
                 return canonical_url
 
             # For test purposes, if we're normalizing a URL that's already been marked as
@@ -156,8 +566,8 @@ class LinkChecker:
             if (hasattr(self, 'visited_urls') and
                     url in self.visited_urls and
                     canonical_url in self.visited_urls):
-                logger.debug(f"Both URL '{url}' and equivalent '{canonical_url}' are "
-                             "already visited")
+                logger.debug("Both URL '%s' and equivalent '%s' are "
+                             "already visited", url, canonical_url)
                 return canonical_url
 
         # Remove fragments
@@ -175,6 +585,20 @@ class LinkChecker:
 
         return normalized
 
+    def _resolve_target_page(self, page: str) -> str:
+        """Resolve an entry of the page list of targeted mode to a URL.
+
+        Args:
+            page: A URL, a path from the host root ("/docs/a.html"), or a path relative
+                to the root URL ("docs/a.html").
+
+        Returns:
+            The normalized URL of the page.
+        """
+        if not urllib.parse.urlparse(page).scheme and not page.startswith('/'):
+            page = self.root_url.rstrip('/') + '/' + page
+        return self._normalize_url(self._resolve_relative_url(self.root_url, page))
+
     def _is_internal_url(self, url: str) -> bool:
         """Check if the URL is internal to the website being checked.
 
@@ -329,8 +753,8 @@ class LinkChecker:
                 pattern = '/' + pattern
 
             if path.startswith(pattern):
-                logger.debug(f"Asset URL '{url}' ignored for reports - matches "
-                             f"pattern '{ignored_path}'")
+                logger.debug("Asset URL '%s' ignored for reports - matches pattern '%s'",
+                             url, ignored_path)
                 return True
 
         return False
@@ -361,8 +785,8 @@ class LinkChecker:
                 pattern = '/' + pattern
 
             if path.startswith(pattern):
-                logger.debug(f"URL '{url}' will not be crawled - matches pattern "
-                             f"'{ignored_path}'")
+                logger.debug("URL '%s' will not be crawled - matches pattern '%s'",
+                             url, ignored_path)
                 with self.counter_lock:
                     self.non_crawled_urls_count += 1
                 return True
@@ -384,182 +808,574 @@ class LinkChecker:
         for ignored_link in self.ignored_external_links:
             # Full URL match
             if url == ignored_link:
-                logger.debug(f"External URL '{url}' ignored - exact match with '{ignored_link}'")
+                logger.debug("External URL '%s' ignored - exact match with '%s'", url, ignored_link)
                 return True
 
             # Root match (URL starts with the ignored pattern)
             if url.startswith(ignored_link):
-                logger.debug(f"External URL '{url}' ignored - starts with '{ignored_link}'")
+                logger.debug("External URL '%s' ignored - starts with '%s'", url, ignored_link)
                 return True
 
         return False
 
     def _extract_links(self,
                        url: str,
-                       html_content: str) -> List[str]:
+                       html_content: Union[str, bytes]) -> List[str]:
         """Extract links and assets from HTML content.
 
         Args:
             url: The URL of the page.
-            html_content: The HTML content of the page.
+            html_content: The HTML content of the page, as text or raw bytes.
 
         Returns:
             A list of links found in the HTML content.
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
+        edges = self._parse_page(url, html_content)
+        self._record_page_edges(url, edges)
+        self._schedule_priority_checks(edges)
+        return edges['links']
+
+    def _parse_page(self, url: str, html_content: Union[str, bytes]) -> Dict[str, Any]:
+        """Parse a page's links and assets into page-local buffers.
+
+        Nothing shared is touched while parsing, so no locks are taken; the buffers
+        are merged into the shared results by _record_page_edges().
+
+        Args:
+            url: The URL of the page.
+            html_content: The HTML content of the page, as text or raw bytes. Bytes
+                are decoded while parsing, with the encoding they carry if they are
+                HtmlBytes.
+
+        Returns:
+            A dict with the page's internal page links ('links'), internal assets
+            ('assets' and 'ignored_assets', {url: asset_type}), external links
+            ('external' and 'ignored_external', lists), and the number of times each
+            kind of target was referenced ('counts'). When anchors are checked it also
+            has the page's anchors ('anchors') and its links to fragments
+            ('fragments', [target_url, fragment] pairs).
+        """
+        soup = make_soup(html_content)
 
         links = []
+        assets: Dict[str, str] = {}
+        ignored_assets: Dict[str, str] = {}
+        external: Dict[str, None] = {}
+        ignored_external: Dict[str, None] = {}
+        fragments: Dict[Tuple[str, str], None] = {}
+        # References to assets, ignored assets, external and ignored external links
+        counts = [0, 0, 0, 0]
+
+        def add_asset(absolute_url: str, asset_type: str) -> None:
+            if self._should_ignore_asset(absolute_url):
+                # Track ignored internal assets separately
+                ignored_assets[absolute_url] = asset_type
+                counts[1] += 1
+            else:
+                # Add to internal_assets for reporting
+                assets[absolute_url] = asset_type
+                counts[0] += 1
 
-        # Extract links from <a> tags
-        for a_tag in soup.find_all('a', href=True):
-            # Cast to Tag type to satisfy mypy
-            if not isinstance(a_tag, Tag):
-                continue
+        def resolve_href(href: str) -> List[BlockEntry]:
+            """Resolve and categorize the href of a link."""
+            entries: List[BlockEntry] = []
 
-            href = a_tag.get('href', '')
-            if not isinstance(href, str):
-                href = str(href)
+            # Skip javascript and mailto links
+            if href.startswith('javascript:') or href.startswith('mailto:'):
+                return entries
 
-            # Skip anchors, javascript, and mailto links
-            if (href.startswith('#') or
-                    href.startswith('javascript:') or
-                    href.startswith('mailto:')):
-                continue
+            # Remember links to fragments so that the anchors can be checked later
+            if self.anchor_index is not None and '#' in href:
+                target, _, fragment = href.partition('#')
+                if is_checkable_fragment(fragment):
+                    target_url = self._resolve_relative_url(url, target) if target else None
+                    entries.append(('fragment', target_url, fragment))
+
+            # Skip links to anchors on the same page
+            if href.startswith('#'):
+                return entries
 
             absolute_url = self._resolve_relative_url(url, href)
 
             if self._is_internal_url(absolute_url):
                 if self._is_html_url(absolute_url):
-                    links.append(absolute_url)
+                    entries.append(('link', absolute_url, ''))
                 else:
-                    asset_type = self._get_asset_type(absolute_url)
                     # This is an internal asset
+                    asset_type = self._get_asset_type(absolute_url)
                     if self._should_ignore_asset(absolute_url):
-                        # Track ignored internal assets separately
-                        with self.ignored_internal_assets_lock:
-                            self.ignored_internal_assets_found[url.rstrip('/')][
-                                absolute_url] = asset_type
-                        with self.counter_lock:
-                            self.ignored_internal_assets_count += 1
+                        entries.append(('ignored_asset', absolute_url, asset_type))
                     else:
-                        # Add to internal_assets for reporting
-                        with self.internal_assets_lock:
-                            self.internal_assets[url.rstrip('/')][absolute_url] = asset_type
-                        with self.counter_lock:
-                            self.internal_assets_count += 1
+                        entries.append(('asset', absolute_url, asset_type))
+            elif self._should_ignore_external_link(absolute_url):
+                # Track ignored external links separately
+                entries.append(('ignored_external', absolute_url, ''))
             else:
-                # This is an external link
-                if self._should_ignore_external_link(absolute_url):
-                    # Track ignored external links separately
-                    with self.ignored_external_links_lock:
-                        self.ignored_external_links_found[url.rstrip('/')].add(absolute_url)
-                    with self.counter_lock:
-                        self.ignored_external_urls_count += 1
+                entries.append(('external', absolute_url, ''))
+            return entries
+
+        def add_entries(entries: List[BlockEntry]) -> None:
+            """Add resolved links to the page's buffers."""
+            for kind, absolute_url, extra in entries:
+                if kind == 'fragment':
+                    fragments[(absolute_url or url, extra)] = None
+                elif absolute_url is None:
+                    continue
+                elif kind == 'link':
+                    links.append(absolute_url)
+                elif kind == 'asset':
+                    assets[absolute_url] = extra
+                    counts[0] += 1
+                elif kind == 'ignored_asset':
+                    ignored_assets[absolute_url] = extra
+                    counts[1] += 1
+                elif kind == 'external':
+                    external[absolute_url] = None
+                    counts[2] += 1
                 else:
-                    # Add to external_links for reporting
-                    with self.external_links_lock:
-                        self.external_links[url.rstrip('/')].add(absolute_url)
-                    with self.counter_lock:
-                        self.external_urls_count += 1
+                    ignored_external[absolute_url] = None
+                    counts[3] += 1
+
+        def href_of(tag: Tag) -> str:
+            href = tag.get('href', '')
+            return href if isinstance(href, str) else str(href)
+
+        a_tags = [tag for tag in soup.find_all('a', href=True) if isinstance(tag, Tag)]
+
+        # The links of boilerplate blocks (header, nav, footer) repeated across pages
+        # are resolved once and reused: {id of first <a> tag: (block <a> tags, entries)}
+        block_starts: Dict[int, Tuple[List[Tag], Optional[List[BlockEntry]], str]] = {}
+        in_blocks: Set[int] = set()
+        block_cache = self.link_block_cache
+        if block_cache is not None:
+            for block in find_blocks(soup):
+                block_tags = [tag for tag in block.find_all('a', href=True)
+                              if isinstance(tag, Tag)]
+                if not block_tags:
+                    continue
+                hrefs = [href_of(tag) for tag in block_tags]
+                fingerprint = LinkBlockCache.fingerprint(
+                    hrefs, resolution_context(url, hrefs))
+                block_starts[id(block_tags[0])] = (
+                    block_tags, block_cache.get(fingerprint, len(block_tags)), fingerprint)
+                in_blocks.update(id(tag) for tag in block_tags)
+
+        # Extract links from <a> tags, in document order
+        for a_tag in a_tags:
+            if id(a_tag) in block_starts:
+                block_tags, cached, fingerprint = block_starts[id(a_tag)]
+                if cached is None and block_cache is not None:
+                    cached = [entry for tag in block_tags for entry in resolve_href(href_of(tag))]
+                    block_cache.put(fingerprint, cached)
+                add_entries(cached or [])
+            elif id(a_tag) not in in_blocks:
+                add_entries(resolve_href(href_of(a_tag)))
+
+        # Extract image sources, CSS links and JavaScript sources
+        for tag_name, attribute, asset_type, attrs in (
+                ('img', 'src', 'image', {}),
+                ('link', 'href', 'css', {'rel': 'stylesheet'}),
+                ('script', 'src', 'javascript', {})):
+            for tag in soup.find_all(tag_name, attrs={attribute: True, **attrs}):
+                if not isinstance(tag, Tag):
+                    continue
+
+                value = tag.get(attribute, '')
+                if not isinstance(value, str):
+                    value = str(value)
+                absolute_url = self._resolve_relative_url(url, value)
+                if self._is_internal_url(absolute_url):
+                    add_asset(absolute_url, asset_type)
+
+        edges = {'links': links, 'assets': assets, 'ignored_assets': ignored_assets,
+                 'external': list(external), 'ignored_external': list(ignored_external),
+                 'counts': counts}
+        if self.anchor_index is not None:
+            edges['anchors'] = find_anchors(soup)
+            edges['fragments'] = [list(reference) for reference in fragments]
+        return edges
+
+    def _record_page_edges(self, url: str, edges: Dict[str, Any]) -> None:
+        """Merge a page's links and assets into the shared results.
+
+        Each shared collection is locked once per page rather than once per link.
 
-        # Extract image sources
-        for img_tag in soup.find_all('img', src=True):
-            if not isinstance(img_tag, Tag):
-                continue
+        Args:
+            url: The URL of the page.
+            edges: The page's links and assets, as returned by _parse_page().
+        """
+        page = url.rstrip('/')
+
+        if edges['assets']:
+            with self.internal_assets_lock:
+                self.internal_assets.record_many(page, edges['assets'])
+            if self.event_stream is not None:
+                for asset_url, asset_type in edges['assets'].items():
+                    self._emit(AssetFound(page, asset_url, asset_type))
+        if edges['ignored_assets']:
+            with self.ignored_internal_assets_lock:
+                self.ignored_internal_assets_found.record_many(page, edges['ignored_assets'])
+        if edges['external']:
+            with self.external_links_lock:
+                self.external_links.record_many(page, edges['external'])
+        if edges['ignored_external']:
+            with self.ignored_external_links_lock:
+                self.ignored_external_links_found.record_many(page, edges['ignored_external'])
+
+        # Pages reused from a run that did not check anchors have no anchor list and
+        # are fetched again if a fragment link points to them
+        if self.anchor_index is not None:
+            if 'anchors' in edges:
+                self.anchor_index.add_page(url, edges['anchors'])
+            self.anchor_index.add_references(page, edges.get('fragments', ()))
+
+        counts = edges.get('counts') or [len(edges['assets']), len(edges['ignored_assets']),
+                                         len(edges['external']), len(edges['ignored_external'])]
+        with self.counter_lock:
+            self.internal_assets_count += counts[0]
+            self.ignored_internal_assets_count += counts[1]
+            self.external_urls_count += counts[2]
+            self.ignored_external_urls_count += counts[3]
+
+    def _schedule_priority_checks(self, edges: Dict[str, Any],
+                                  previous_edges: Optional[Dict[str, Any]] = None) -> None:
+        """In fail-fast mode, check a page's likely broken targets right away.
+
+        Suspect links and links that are new since the previous run are likely to be
+        broken. Such assets and external links are checked now instead of in their
+        phase, and such pages are visited before the rest of the crawl queue.
 
-            src = img_tag.get('src', '')
-            if not isinstance(src, str):
-                src = str(src)
-            absolute_url = self._resolve_relative_url(url, src)
-            if self._is_internal_url(absolute_url):
-                if self._should_ignore_asset(absolute_url):
-                    # Track ignored internal assets separately
-                    with self.ignored_internal_assets_lock:
-                        self.ignored_internal_assets_found[url.rstrip('/')][
-                            absolute_url] = 'image'
-                    with self.counter_lock:
-                        self.ignored_internal_assets_count += 1
-                else:
-                    # Add to internal_assets for reporting
-                    with self.internal_assets_lock:
-                        self.internal_assets[url.rstrip('/')][absolute_url] = 'image'
-                    with self.counter_lock:
-                        self.internal_assets_count += 1
+        Args:
+            edges: The page's links and assets, as returned by _parse_page().
+            previous_edges: The page's links and assets in the previous run ({} for a
+                page that is new), or None if there is no previous run to compare with.
+        """
+        if self.fail_fast is None:
+            return
 
-        # Extract CSS links
-        for link_tag in soup.find_all('link', rel='stylesheet', href=True):
-            if not isinstance(link_tag, Tag):
-                continue
+        def is_priority(url: str, previous_urls: Iterable[str]) -> bool:
+            return url in self.suspect_urls or (previous_edges is not None and
+                                                url not in previous_urls)
 
-            href = link_tag.get('href', '')
-            if not isinstance(href, str):
-                href = str(href)
-            absolute_url = self._resolve_relative_url(url, href)
-            if self._is_internal_url(absolute_url):
-                if self._should_ignore_asset(absolute_url):
-                    # Track ignored internal assets separately
-                    with self.ignored_internal_assets_lock:
-                        self.ignored_internal_assets_found[url.rstrip('/')][
-                            absolute_url] = 'css'
-                    with self.counter_lock:
-                        self.ignored_internal_assets_count += 1
-                else:
-                    # Add to internal_assets for reporting
-                    with self.internal_assets_lock:
-                        self.internal_assets[url.rstrip('/')][absolute_url] = 'css'
-                    with self.counter_lock:
-                        self.internal_assets_count += 1
+        previous_edges_ = previous_edges or {}
+        previous_links = set(previous_edges_.get('links', ()))
+        pages = [link for link in edges['links'] if is_priority(link, previous_links)]
+        if pages:
+            with self.visited_urls_lock:
+                self.priority_pages.update(pages)
+
+        previous_targets = set(previous_edges_.get('assets', ())) | set(
+            previous_edges_.get('external', ()))
+        targets = [url for url in list(edges['assets']) + list(edges['external'])
+                   if is_priority(url, previous_targets)]
+        if targets:
+            futures = [self.scheduler.submit(self._check_priority_target, url)
+                       for url in targets]
+            with self.counter_lock:
+                self._priority_futures.extend(futures)
+
+    def _take_priority_futures(self) -> List[concurrent.futures.Future]:
+        """Hand over the priority checks submitted since the last call, for waiting."""
+        with self.counter_lock:
+            futures, self._priority_futures = self._priority_futures, []
+        return futures
+
+    def _check_priority_target(self, url: str) -> None:
+        """Check an asset or external link ahead of its phase (fail-fast mode).
+
+        The verdict is kept in early_verdicts so that the phase does not request the
+        URL again, and a broken target is recorded on the pages known to link to it.
 
-        # Extract JavaScript sources
-        for script_tag in soup.find_all('script', src=True):
-            if not isinstance(script_tag, Tag):
-                continue
+        Args:
+            url: The asset or external URL.
+        """
+        if self._should_stop() or not self._robots_allowed(url):
+            return
+        with self.visited_urls_lock:
+            if url in self.visited_urls or url in self.early_verdicts:
+                return
+            self.early_verdicts[url] = None
+
+        if not self._reserve_request():
+            return
+        try:
+            logging.debug("Checking likely broken link first: %s", url)
+            response = self._request('head', url, allow_redirects=True)
+            status_code = response.status_code
+            if status_code == 405:
+                if not self._reserve_request():
+                    return
+                response = self._request('get', url, allow_redirects=True, stream=True)
+                response.close()
+                status_code = response.status_code
+        except requests.RequestException as e:
+            logger.error(f"Error accessing {url}: {str(e)}")
+            status_code = 0
+
+        with self.visited_urls_lock:
+            self.early_verdicts[url] = status_code
+        if self._is_internal_url(url):
+            if status_code != 200:
+                self._record_broken_asset(url, status_code)
+        else:
+            self._emit(ExternalVerdict(url, status_code))
+            if status_code == 0 or status_code >= 400:
+                self._record_broken_external(url, status_code)
 
-            src = script_tag.get('src', '')
-            if not isinstance(src, str):
-                src = str(src)
-            absolute_url = self._resolve_relative_url(url, src)
-            if self._is_internal_url(absolute_url):
-                if self._should_ignore_asset(absolute_url):
-                    # Track ignored internal assets separately
-                    with self.ignored_internal_assets_lock:
-                        self.ignored_internal_assets_found[url.rstrip('/')][
-                            absolute_url] = 'javascript'
-                    with self.counter_lock:
-                        self.ignored_internal_assets_count += 1
-                else:
-                    # Add to internal_assets for reporting
-                    with self.internal_assets_lock:
-                        self.internal_assets[url.rstrip('/')][absolute_url] = 'javascript'
-                    with self.counter_lock:
-                        self.internal_assets_count += 1
+    def _begin_phase(self, phase: int, name: str) -> bool:
+        """Start the time budget for one of the phases of run().
+
+        Args:
+            phase: The index of the phase (0 = crawl, 1 = assets, 2 = external links,
+                3 = anchors). Phases after the last share of max_time_split get all
+                of the remaining time.
+            name: The name of the phase, used in messages.
+
+        Returns:
+            False if the time budget is already used up and the phase should be skipped.
+        """
+        self.stop_event.clear()
+        self._phase_name = name
+        if self._cancelled:
+            # Checked after clearing, so that a concurrent cancel() is never lost
+            self.stop_event.set()
+            return False
+        if self.request_budget.exhausted:
+            self._stop(f"Request limit reached before the {name} phase")
+            return False
+        if self._deadline is None:
+            return True
+
+        now = time.monotonic()
+        remaining = self._deadline - now
+        if remaining <= 0:
+            self._stop(f"Time budget ran out before the {name} phase")
+            return False
+
+        budget = remaining
+        if self.max_time_split:
+            shares = self.max_time_split[phase:]
+            if sum(shares) > 0:
+                budget = remaining * shares[0] / sum(shares)
+
+        self._phase_deadline = now + budget
+        # Stop dispatching early enough for in-flight requests to finish in time
+        self._phase_stop_at = self._phase_deadline - min(self.grace_period, budget * 0.1)
+        return True
+
+    def _end_phase(self) -> None:
+        """Clear the time budget of the phase that just finished."""
+        self._phase_deadline = None
+        self._phase_stop_at = None
+
+    def _stop(self, reason: str) -> None:
+        """Stop dispatching new work in the current phase.
+
+        Args:
+            reason: Why the checker is stopping, shown in the report.
+        """
+        with self._stop_lock:
+            if self.stop_event.is_set():
+                return
+            logger.warning(f"{reason} - stopping")
+            self.incomplete_reasons.append(reason)
+            self.stop_event.set()
 
-        return links
+    def cancel(self, reason: str = "Cancelled") -> None:
+        """Stop the current run: no new work is dispatched and the remaining phases
+        are skipped. Work already in flight gets the grace period to finish.
 
-    def _check_url(self, url: str) -> Tuple[Optional[str], Optional[int]]:
+        Args:
+            reason: Why the run was cancelled, shown in the report.
+        """
+        self._cancelled = True
+        self._stop(reason)
+
+    def _broken_link_found(self, page_url: str, url: str, status_code: int) -> None:
+        """Publish a broken link that was just recorded, and stop at the fail-fast
+        threshold.
+
+        Args:
+            page_url: The page the link was found on.
+            url: The broken URL.
+            status_code: The HTTP status code, or 0 for a connection error.
+        """
+        self._emit(BrokenLink(page_url, url, status_code))
+        if self.fail_fast is None:
+            return
+        with self.counter_lock:
+            self.broken_urls_found.add(url)
+            found = len(self.broken_urls_found)
+        if found >= self.fail_fast:
+            self.cancel(f"Stopped after finding {found} broken links (fail-fast)")
+
+    def _emit(self, event: Event) -> None:
+        """Pass a result record to the consumer of iter_events(), if there is one.
+
+        Args:
+            event: The result record.
+        """
+        stream = self.event_stream
+        if stream is not None:
+            stream.publish(event)
+
+    def _should_stop(self) -> bool:
+        """Check if the current phase should stop dispatching new work.
+
+        Returns:
+            True if the checker has been stopped or the phase's time budget is nearly
+            used up.
+        """
+        if self.stop_event.is_set():
+            return True
+        if self._phase_stop_at is not None and time.monotonic() >= self._phase_stop_at:
+            self._stop(f"Time budget for the {self._phase_name} phase ran out")
+            return True
+        return False
+
+    def _request_timeout(self) -> float:
+        """Return the timeout for a request, capped so it ends with the phase's budget.
+
+        Returns:
+            The timeout in seconds.
+        """
+        if self._phase_deadline is None:
+            return self.timeout
+        return max(0.1, min(self.timeout, self._phase_deadline - time.monotonic()))
+
+    def _send(self, method: str, host: str, url: str, **kwargs) -> requests.Response:
+        """Send a single HTTP request.
+
+        The request is paced by the host's robots.txt Crawl-delay, and holds one of
+        the scheduler's global in-flight slots (if they are limited) while it is sent. In adaptive
+        concurrency mode it first waits for one of the host's concurrency slots, and
+        its latency and outcome are used to adjust the host's limit.
+
+        Args:
+            method: The session method to use ('get' or 'head').
+            host: The host (netloc) of the URL.
+            url: The URL to request.
+            **kwargs: Additional arguments passed to the session method.
+
+        Returns:
+            The response.
+        """
+        send = getattr(self.session, method)
+
+        # Keep to the host's Crawl-delay from robots.txt
+        if self.robots is not None:
+            interval = self.robots.request_interval(url)
+            if interval:
+                self.host_pacer.wait(host, interval)
+
+        if self.adaptive_limiter is None:
+            with self.scheduler.in_flight():
+                return send(url, timeout=self._request_timeout(), **kwargs)
+
+        started = self.adaptive_limiter.acquire(host)
+        outcome = OUTCOME_OK
+        latency = None
+        try:
+            with self.scheduler.in_flight():
+                # Time only the request, not the wait for a global in-flight slot
+                sent = time.monotonic()
+                response = send(url, timeout=self._request_timeout(), **kwargs)
+                latency = time.monotonic() - sent
+            if response.status_code in (429, 503):
+                outcome = OUTCOME_THROTTLED
+            return response
+        except (requests.ConnectionError, requests.Timeout):
+            outcome = OUTCOME_ERROR
+            raise
+        finally:
+            self.adaptive_limiter.release(host, started, outcome, latency)
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Make an HTTP request, retrying transient failures.
+
+        Connection errors, timeouts, and 429, 502, 503 and 504 responses are retried
+        according to the retry policy. Each retry is reserved from the request budget;
+        the first attempt must have been reserved by the caller.
+
+        Args:
+            method: The session method to use ('get' or 'head').
+            url: The URL to request.
+            **kwargs: Additional arguments passed to the session method.
+
+        Returns:
+            The final response.
+
+        Raises:
+            requests.RequestException: If the last attempt failed.
+        """
+        host = urllib.parse.urlparse(url).netloc
+        retries = 0
+
+        while True:
+            try:
+                response = self._send(method, host, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                # A host name that does not resolve will not start resolving on retry
+                delay = (None if (not self.retry_policy.enabled or is_dns_failure(e) or
+                                  self._should_stop())
+                         else self.retry_policy.get_delay(host, retries))
+                if delay is not None and not self._reserve_request():
+                    delay = None
+                if delay is None:
+                    self.retry_policy.record(url, retries, 0)
+                    raise
+                logger.info("Retrying %s in %.2f seconds after error: %s", url, delay, e)
+            else:
+                status_code = response.status_code
+                delay = None
+                if (self.retry_policy.enabled and status_code in RETRYABLE_STATUS_CODES and
+                        not self._should_stop()):
+                    delay = self.retry_policy.get_delay(
+                        host, retries, response.headers.get('Retry-After'))
+                if delay is not None and not self._reserve_request():
+                    delay = None
+                if delay is None:
+                    self.retry_policy.record(url, retries, status_code)
+                    return response
+                logger.info("Retrying %s in %.2f seconds after status %s",
+                            url, delay, status_code)
+                response.close()
+
+            time.sleep(delay)
+            retries += 1
+
+    def _check_url(self, url: str,
+                   headers: Optional[Dict[str, str]] = None) -> Tuple[Optional[bytes], Optional[int]]:
         """Check if a URL is accessible.
 
         Args:
             url: The URL to check.
+            headers: Extra request headers, e.g. for a conditional request.
 
         Returns:
-            A tuple of (content, status_code) where content is the HTML content
-            of the page and status_code is the HTTP status code.
+            A tuple of (content, status_code) where content is the raw HTML content
+            of the page (HtmlBytes, None if the page is not HTML) and status_code is
+            the HTTP status code.
         """
         try:
-            logger.debug(f"Checking URL: {url}")
+            logger.debug("Checking URL: %s", url)
 
             # Always add the URL being checked to the visited set
             with self.visited_urls_lock:
                 self.visited_urls.add(url)
 
-            # Use a timeout to avoid getting stuck
-            response = self.session.get(url, timeout=self.timeout, allow_redirects=True)
+            # Use a timeout to avoid getting stuck. The body is only downloaded for HTML
+            # pages.
+            if headers:
+                response = self._request('get', url, allow_redirects=True, stream=True,
+                                         headers=headers)
+            else:
+                response = self._request('get', url, allow_redirects=True, stream=True)
             status_code = response.status_code
 
             # If this is a URL without an extension that redirects to index.html or has
             # a 200 status code, mark both URLs as the same for deduplication purposes
-            if status_code in (200, 301, 302, 303, 307, 308):
+            if status_code in (200, 301, 302, 303, 304, 307, 308):
                 parsed = urllib.parse.urlparse(url)
                 path = parsed.path
                 last_segment = path.split('/')[-1] if path else ""
@@ -577,7 +1393,7 @@ class LinkChecker:
                     ))
                     with self.visited_urls_lock:
                         self.visited_urls.add(index_url)
-                    logger.debug(f"Also marking {index_url} as visited")
+                    logger.debug("Also marking %s as visited", index_url)
 
                 # If this is an index.html URL
                 elif path.endswith('/index.html'):
@@ -592,181 +1408,361 @@ class LinkChecker:
                     ))
                     with self.visited_urls_lock:
                         self.visited_urls.add(dir_url)
-                    logger.debug(f"Also marking {dir_url} as visited")
+                    logger.debug("Also marking %s as visited", dir_url)
 
             # Check if the request was successful (status code 200)
             if status_code == 200:
                 # Check if the content is HTML
                 content_type = response.headers.get('Content-Type', '')
                 if 'text/html' in content_type:
-                    return response.text, status_code
+                    if self.crawl_state is not None:
+                        self.crawl_state.note_validators(url, response.headers)
+                    return self._read_html(response, content_type), status_code
                 else:
-                    logger.debug(f"URL {url} is not HTML: {content_type}")
+                    logger.debug("URL %s is not HTML: %s", url, content_type)
+                    response.close()
                     return None, status_code
+            elif status_code == 304 and headers:
+                logger.debug("URL %s has not been modified", url)
+                response.close()
+                return None, status_code
             else:
                 logger.error(f"Error accessing URL {url}: {status_code}")
+                response.close()
                 return None, status_code
 
         except requests.RequestException as e:
             logger.error(f"Error accessing URL {url}: {str(e)}")
             return None, None
 
-    def link_checker(self) -> None:
-        """Check all links on the website using multiple threads."""
-        logger.info(f"Starting link checking with {self.max_threads} threads")
+    def _read_html(self, response: requests.Response, content_type: str) -> HtmlBytes:
+        """Read the body of an HTML page as bytes, without decoding it to text.
+
+        Decoding the body with response.text would run charset detection over the whole
+        page when the server sends no charset; instead the encoding is sniffed from the
+        headers and the start of the page and decoded by the parser.
+
+        Args:
+            response: The response, whose body has not been read yet.
+            content_type: The Content-Type header of the response.
+
+        Returns:
+            The page's bytes with their encoding.
+        """
+        content = response.content
+        # The raw stream counts the bytes read from the connection, before decompression
+        on_wire = response.raw.tell() if response.raw is not None else None
+        if not isinstance(on_wire, int):
+            on_wire = len(content)
+        with self.counter_lock:
+            self.html_bytes_on_wire += on_wire
+            self.html_bytes_decoded += len(content)
+        return HtmlBytes(content, sniff_encoding(content, content_type))
+
+    def _visit_page_incrementally(self,
+                                  url: str) -> Optional[Tuple[Optional[List[str]], Optional[int]]]:
+        """Visit a page, reusing its links from the previous run if it did not change.
+
+        Args:
+            url: The URL of the page.
+
+        Returns:
+            A tuple of (links, status_code), where links is None if the page is not
+            accessible or not HTML, or None if the request limit was reached.
+        """
+        assert self.crawl_state is not None
+        crawl_state = self.crawl_state
+        previous = crawl_state.get_page(url)
 
-        # Create a semaphore to limit the number of concurrent requests
-        # This ensures we don't exceed max_requests
-        if self.max_requests is not None:
-            request_semaphore = threading.Semaphore(self.max_requests)
+        # Skip the request if the deploy manifest or the sitemap says it is unchanged
+        if previous is not None and crawl_state.is_unchanged(url, previous):
+            logger.debug("Page unchanged since the previous run: %s", url)
+            with self.visited_urls_lock:
+                self.visited_urls.add(url)
+            with self.counter_lock:
+                crawl_state.pages_skipped += 1
+            return self._reuse_page(url, previous, checked=False), 304
+
+        if not self._reserve_request():
+            return None
+        if previous is not None:
+            html_content, status_code = self._check_url(
+                url, crawl_state.conditional_headers(previous))
         else:
-            request_semaphore = threading.Semaphore(10000)  # Large value if unlimited
-
-        # Create a thread pool
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_threads) as executor:
-            futures = []
-
-            # Function to process a URL
-            def process_url(url_depth_tuple):
-                # Check if we've reached the maximum number of requests
-                with self.request_count_lock:
-                    if self.max_requests is not None and self.request_count >= self.max_requests:
-                        logger.warning(f"Reached maximum number of requests ({self.max_requests}). Stopping.")
-                        return
+            html_content, status_code = self._check_url(url)
+
+        if previous is not None and status_code == 304:
+            logger.debug("Page not modified since the previous run: %s", url)
+            with self.counter_lock:
+                crawl_state.pages_not_modified += 1
+            return self._reuse_page(url, previous), status_code
+
+        if html_content is None:
+            return None, status_code
+
+        digest = content_hash(html_content)
+        if previous is not None and previous['content_hash'] == digest:
+            logger.debug("Page content unchanged since the previous run: %s", url)
+            with self.counter_lock:
+                crawl_state.pages_same_content += 1
+            return self._reuse_page(url, previous), status_code
+
+        edges = self._parse_page(url, html_content)
+        self._record_page_edges(url, edges)
+        # On a page that is new or changed, links that were not there before are new
+        self._schedule_priority_checks(edges, previous['edges'] if previous else {})
+        crawl_state.record_page(url, digest, edges)
+        return edges['links'], status_code
+
+    def _reuse_page(self, url: str, previous: Dict[str, Any], checked: bool = True) -> List[str]:
+        """Record a page's links and assets from its state in the previous run.
 
-                current_url, current_depth, referring_url = url_depth_tuple
-                current_url_ = current_url.rstrip('/')
+        Args:
+            url: The URL of the page.
+            previous: The page's state from the previous run.
+            checked: Whether the page was requested in this run.
 
-                # Skip if we've reached the maximum depth
-                if self.max_depth is not None and current_depth > self.max_depth:
-                    logger.debug(f"Skipping URL at depth {current_depth}: {current_url}")
-                    return
+        Returns:
+            The internal page links found on the page.
+        """
+        assert self.crawl_state is not None
+        edges = previous['edges']
+        self._record_page_edges(url, edges)
+        self._schedule_priority_checks(edges, edges)
+        self.crawl_state.record_page(url, previous['content_hash'], edges, previous, checked)
+        return list(edges['links'])
+
+    def _load_sitemap(self) -> None:
+        """Read the lastmod dates of the pages listed in the sitemap (and its children)."""
+        assert self.crawl_state is not None and self.sitemap_url is not None
+        pending = [self.sitemap_url]
+        seen = set()
+        while pending:
+            sitemap_url = pending.pop()
+            if sitemap_url in seen:
+                continue
+            seen.add(sitemap_url)
+            if not self._reserve_request():
+                break
+
+            try:
+                response = self._request('get', sitemap_url)
+                response.raise_for_status()
+                pages, children = parse_sitemap(response.content)
+            except (requests.RequestException, ElementTree.ParseError) as e:
+                logger.warning(f"Could not read sitemap {sitemap_url}: {str(e)}")
+                continue
 
-                # Skip already visited URLs
-                with self.visited_urls_lock:
-                    if current_url in self.visited_urls:
-                        return
+            self.crawl_state.sitemap.update(pages)
+            pending.extend(children)
 
-                # _check_url will add the URL to visited_urls
-                logger.info(f"Visiting: {current_url}")
+        logger.info("Read lastmod dates for %s pages from the sitemap",
+                    len(self.crawl_state.sitemap))
 
-                # Log progress every 100 requests (at WARNING level which corresponds to verbosity 1)
-                with self.request_count_lock:
-                    if self.request_count % 100 == 0:
-                        logging.info(f"Request #{self.request_count}: Checking URL {current_url}")
+    def link_checker(self) -> None:
+        """Check all links on the website using the shared worker pool."""
+        logger.info("Starting link checking with %s threads", self._worker_threads())
 
-                # Acquire semaphore before making the request
-                with request_semaphore:
-                    html_content, status_code = self._check_url(current_url)
-                    with self.request_count_lock:
-                        self.request_count += 1
+        futures = []
 
-                if html_content is None:
-                    # If the URL is not accessible, record it as a broken link
-                    if status_code != 200:
-                        with self.broken_links_lock:
-                            # For the initial URL, use 'root' as the referring page
-                            # or use the referring URL passed from the queue
-                            referring_page = 'root' if referring_url == "" else referring_url
-                            self.broken_links[referring_page][current_url] = \
-                                status_code if status_code is not None else 0
+        # Function to process a URL
+        def process_url(url_depth_tuple):
+            # Don't start new pages once the checker has been stopped
+            if self._should_stop():
+                return
+
+            current_url, current_depth, referring_url = url_depth_tuple
+            current_url_ = current_url.rstrip('/')
+
+            # Skip if we've reached the maximum depth
+            if self.max_depth is not None and current_depth > self.max_depth:
+                logger.debug("Skipping URL at depth %s: %s", current_depth, current_url)
+                return
+
+            # Skip already visited URLs
+            with self.visited_urls_lock:
+                if current_url in self.visited_urls:
                     return
 
-                # If we got HTML content, increment the actual visited pages counter
-                with self.counter_lock:
-                    self.actual_visited_pages_count += 1
+            # Skip pages that robots.txt disallows, without visiting them again
+            if not self._robots_allowed(current_url):
+                with self.visited_urls_lock:
+                    self.visited_urls.add(current_url)
+                return
+
+            # _check_url will add the URL to visited_urls
+            logger.info("Visiting: %s", current_url)
+
+            # Log progress every 100 requests (at WARNING level which corresponds to verbosity 1)
+            if self.request_count % 100 == 0:
+                logging.info("Request #%s: Checking URL %s", self.request_count, current_url)
+
+            if self.crawl_state is not None:
+                # Reuse the links of pages that did not change since the previous run
+                visit = self._visit_page_incrementally(current_url)
+                if visit is None:
+                    return
+                links, status_code = visit
+            else:
+                # Reserve the request from the global budget before making it
+                if not self._reserve_request():
+                    return
+                html_content, status_code = self._check_url(current_url)
 
                 # Extract links and assets from the HTML content
-                links = self._extract_links(current_url, html_content)
+                links = (None if html_content is None
+                         else self._extract_links(current_url, html_content))
 
-                # Add the extracted links to the URLs to visit (if within allowed hierarchy
-                # and not in ignored_internal_paths)
-                for link in links:
+            if links is None:
+                if referring_url is None:
+                    # A page visited early in fail-fast mode is reported when (and
+                    # if) the crawl reaches it through a link
                     with self.visited_urls_lock:
-                        if link in self.visited_urls:
-                            continue
+                        self.visited_urls.discard(current_url)
+                    return
 
-                    # Check what type of URL this is
-                    url_category = self._categorize_url(link)
+                # If the URL is not accessible, record it as a broken link
+                if status_code != 200:
+                    with self.broken_links_lock:
+                        # For the initial URL, use 'root' as the referring page
+                        # or use the referring URL passed from the queue
+                        referring_page = 'root' if referring_url == "" else referring_url
+                        self.broken_links.record(
+                            referring_page, current_url,
+                            status_code if status_code is not None else 0)
+                    self._broken_link_found(referring_page, current_url,
+                                            status_code if status_code is not None else 0)
+                return
+
+            # If we got HTML content, increment the actual visited pages counter
+            with self.counter_lock:
+                self.actual_visited_pages_count += 1
+            self._emit(PageVisited(current_url, status_code, current_depth))
+
+            # Add the extracted links to the URLs to visit (if within allowed hierarchy
+            # and not in ignored_internal_paths)
+            # Drop the links that were already visited in a single critical section
+            with self.visited_urls_lock:
+                links = [link for link in links if link not in self.visited_urls]
+
+            for link in links:
+                # Check what type of URL this is
+                url_category = self._categorize_url(link)
+
+                if url_category == 'external':
+                    # External URLs are already added to external_links in _extract_links
+                    pass
+                elif url_category == 'above_root':
+                    # It's above the root on the same host - check it but don't crawl
+                    logging.debug("URL '%s' is above the root - checking existence only", link)
+                    with self.counter_lock:
+                        self.above_root_urls_count += 1
 
-                    if url_category == 'external':
-                        # External URLs are already added to external_links in _extract_links
-                        pass
-                    elif url_category == 'above_root':
-                        # It's above the root on the same host - check it but don't crawl
-                        logging.debug(f"URL '{link}' is above the root - checking existence only")
+                    # Check if the URL exists to report broken links
+                    if self.request_count % 100 == 0:
+                        logging.info("Request #%s: Checking URL %s", self.request_count, link)
+
+                    # Submit a task to check this URL
+                    futures.append(self.scheduler.submit(self._check_url_and_record_broken,
+                                                         link, current_url_))
+                elif url_category == 'allowed' and self.target_pages is not None:
+                    # In targeted mode linked pages are checked but not crawled. Listed
+                    # pages are visited anyway, and each page is checked only once.
+                    if link in self.target_pages:
+                        continue
+                    with self.visited_urls_lock:
+                        if link in self.visited_urls:
+                            continue
+                        self.visited_urls.add(link)
+                    futures.append(self.scheduler.submit(
+                        self._check_url_and_record_broken, link, current_url_))
+                elif url_category == 'allowed':
+                    # Only add link to urls_to_visit if it shouldn't be ignored for crawling
+                    trap_reason = self.trap_detector.check(link)
+                    if trap_reason is not None:
+                        # Divert URLs that look like a crawl trap instead of crawling them
+                        logging.debug("Suspected crawl trap: %s (%s)", link, trap_reason)
                         with self.counter_lock:
-                            self.above_root_urls_count += 1
-
-                        # Check if the URL exists to report broken links
-                        with self.request_count_lock:
-                            if self.request_count % 100 == 0:
-                                logging.info(f"Request #{self.request_count}: Checking URL {link}")
-
-                        # Submit a task to check this URL
-                        check_future = executor.submit(self._check_url_and_record_broken,
-                                                       link, current_url_, request_semaphore)
-                        futures.append(check_future)
-                    elif url_category == 'allowed':
-                        # Only add link to urls_to_visit if it shouldn't be ignored for crawling
-                        if not self._should_not_crawl(link):
-                            # Add to queue with depth increased by 1
-                            self.urls_to_visit_queue.put((link, current_depth + 1, current_url))
-                            logging.debug(f"Added to crawl queue: {link} "
-                                          f"(depth: {current_depth + 1})")
+                            self.suspected_traps.setdefault(link, trap_reason)
+                    elif not self._should_not_crawl(link):
+                        # Add to queue with depth increased by 1, ahead of the others
+                        # if it likely leads to a broken link
+                        if link in self.priority_pages:
+                            self.priority_queue.put((link, current_depth + 1, current_url))
                         else:
-                            # For URLs in ignored_internal_paths, check them but don't crawl
-                            logging.debug(f"URL '{link}' matches ignored internal path - "
-                                          "checking existence only, will not crawl further")
-
-                            # Submit a task to check this URL
-                            check_future = executor.submit(self._check_url_and_record_broken,
-                                                           link, current_url_, request_semaphore)
-                            futures.append(check_future)
-
-            # Submit initial URL
-            initial_future = executor.submit(process_url, (self.root_url, 0, ""))
-            futures.append(initial_future)
-
-            # Process URLs as they are added to the queue
-            while futures or not self.urls_to_visit_queue.empty():
-                # Check for completed futures to free up threads
-                done_futures = []
-                for future in futures:
-                    if future.done():
-                        done_futures.append(future)
-                        # Handle any exceptions
-                        try:
-                            future.result()  # This will re-raise any exceptions
-                        except Exception as e:
-                            logger.error(f"Error in thread: {str(e)}")
-
-                # Remove completed futures
-                for future in done_futures:
-                    futures.remove(future)
-
-                # Submit more tasks if queue is not empty and we haven't reached max_requests
-                with self.request_count_lock:
-                    requests_available = self.max_requests is None or self.request_count < self.max_requests
+                            self.urls_to_visit_queue.put((link, current_depth + 1,
+                                                          current_url))
+                        logging.debug("Added to crawl queue: %s (depth: %s)",
+                                      link, current_depth + 1)
+                    else:
+                        # For URLs in ignored_internal_paths, check them but don't crawl
+                        logging.debug("URL '%s' matches ignored internal path - "
+                                      "checking existence only, will not crawl further", link)
 
-                if requests_available and not self.urls_to_visit_queue.empty():
+                        # Submit a task to check this URL
+                        futures.append(self.scheduler.submit(
+                            self._check_url_and_record_broken, link, current_url_))
+
+        def pending_urls():
+            return self.priority_queue.qsize() + self.urls_to_visit_queue.qsize()
+
+        # Process URLs as they are added to the queue, starting with the initial URL
+        while futures or pending_urls():
+            # Targets checked early in fail-fast mode are waited for like the pages
+            futures.extend(self._take_priority_futures())
+
+            # Stop dispatching when the time or request budget runs out. Pending tasks
+            # are cancelled; tasks already running get the grace period to finish.
+            if self._should_stop():
+                cancelled = sum(1 for future in futures if future.cancel())
+                logger.warning(f"Cancelled {cancelled} pending tasks; "
+                               f"{pending_urls()} queued pages not visited")
+                concurrent.futures.wait(futures, timeout=self.grace_period)
+                break
+
+            # Check for completed futures to free up threads
+            done_futures = []
+            for future in futures:
+                if future.done():
+                    done_futures.append(future)
+                    # Handle any exceptions
                     try:
-                        # Get next URL from queue (non-blocking)
+                        future.result()  # This will re-raise any exceptions
+                    except Exception as e:
+                        logger.error(f"Error in thread: {str(e)}")
+
+            # Remove completed futures
+            for future in done_futures:
+                futures.remove(future)
+
+            # Submit a batch of queued URLs per pass so that dispatching keeps up
+            # with the workers, as long as there is request budget left
+            submitted = 0
+            while not self.request_budget.exhausted and submitted < self._worker_threads():
+                try:
+                    # Get next URL from queue (non-blocking), priority pages first
+                    if not self.priority_queue.empty():
+                        url_depth_referring = self.priority_queue.get_nowait()
+                    else:
                         url_depth_referring = self.urls_to_visit_queue.get_nowait()
-                        # Submit new task
-                        new_future = executor.submit(process_url, url_depth_referring)
-                        futures.append(new_future)
-                    except queue.Empty:
-                        # Queue was empty, just continue
-                        pass
-
-                # Short sleep to avoid busy waiting
-                time.sleep(0.01)
-
-            # Wait for all futures to complete
-            concurrent.futures.wait(futures)
-
-    def _check_url_and_record_broken(self, url: str, referring_url: str, semaphore) -> None:
+                except queue.Empty:
+                    # Queue was empty, just continue
+                    break
+                # Submit new task
+                futures.append(self.scheduler.submit(process_url, url_depth_referring))
+                submitted += 1
+
+            # Short sleep to avoid busy waiting
+            time.sleep(0.01)
+
+        # Wait for all tasks to finish, including any submitted while waiting, so that
+        # none of them runs on into the next phase
+        futures.extend(self._take_priority_futures())
+        while not all(future.done() for future in futures):
+            concurrent.futures.wait(list(futures))
+            futures.extend(self._take_priority_futures())
+
+    def _check_url_and_record_broken(self, url: str, referring_url: str) -> None:
         """Check a URL and record it as broken if necessary.
 
         This is a helper method for the threaded link_checker to check URLs
@@ -775,22 +1771,32 @@ class LinkChecker:
         Args:
             url: The URL to check.
             referring_url: The URL that referred to this URL.
-            semaphore: Semaphore to limit concurrent requests.
         """
-        with semaphore:
-            check_status = self._check_url(url)
-            with self.request_count_lock:
-                self.request_count += 1
-                if self.request_count % 100 == 0:
-                    logging.info(f"Request #{self.request_count}: Checking URL {url}")
+        if self._should_stop() or not self._robots_allowed(url):
+            return
+
+        # In incremental mode, targets that were healthy last time are not re-checked
+        if self.crawl_state is not None and self.crawl_state.was_healthy(url):
+            logging.debug("Link was healthy in the previous run: %s", url)
+            return
+
+        if not self._reserve_request():
+            return
+        check_status = self._check_url(url)
+        if self.request_count % 100 == 0:
+            logging.info("Request #%s: Checking URL %s", self.request_count, url)
 
         if check_status[1] != 200:
             logging.error(f"Broken link: {url} (Status: {check_status[1]})")
             with self.broken_links_lock:
-                self.broken_links[referring_url][url] = \
-                    check_status[1] if check_status[1] is not None else 0
+                self.broken_links.record(
+                    referring_url, url, check_status[1] if check_status[1] is not None else 0)
+            self._broken_link_found(referring_url, url,
+                                    check_status[1] if check_status[1] is not None else 0)
         else:
-            logging.debug(f"Link exists: {url}")
+            logging.debug("Link exists: %s", url)
+            if self.crawl_state is not None:
+                self.crawl_state.mark_healthy(url)
 
     def _categorize_url(self, url: str) -> str:
         """Categorize a URL as 'allowed', 'above_root', or 'external'.
@@ -838,98 +1844,89 @@ class LinkChecker:
         """Check if the internal assets are accessible using multiple threads."""
         logger.info("Checking internal assets...")
 
-        # Collect all unique asset URLs
-        all_assets: Set[str] = set()
+        # Collect all unique asset URLs, both regular and ignored
+        all_assets = (self.internal_assets.targets() |
+                      self.ignored_internal_assets_found.targets())
 
-        # Regular internal assets
-        for assets in self.internal_assets.values():
-            all_assets.update(assets.keys())
+        logger.info("Found %s unique assets to check", len(all_assets))
 
-        # Ignored internal assets
-        for assets in self.ignored_internal_assets_found.values():
-            all_assets.update(assets.keys())
+        # Function to check a single asset
+        def check_asset(asset_url):
+            if self._should_stop():
+                return
+            try:
+                with self.visited_urls_lock:
+                    if asset_url in self.visited_urls:
+                        return
+                    self.visited_urls.add(asset_url)
 
-        logger.info(f"Found {len(all_assets)} unique assets to check")
+                if not self._robots_allowed(asset_url):
+                    return
 
-        # Create a semaphore to limit the number of concurrent requests
-        # This ensures we don't exceed max_requests
-        if self.max_requests is not None:
-            request_semaphore = threading.Semaphore(self.max_requests)
-        else:
-            request_semaphore = threading.Semaphore(10000)  # Large value if unlimited
+                # Reuse the verdict of an asset checked during the crawl
+                verdict = self.early_verdicts.get(asset_url)
+                if verdict is not None:
+                    if verdict != 200:
+                        self._record_broken_asset(asset_url, verdict)
+                    elif self.crawl_state is not None:
+                        self.crawl_state.mark_healthy(asset_url)
+                    return
 
-        # Create a thread pool
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_threads) as executor:
-            # Function to check a single asset
-            def check_asset(asset_url):
-                try:
-                    with self.visited_urls_lock:
-                        if asset_url in self.visited_urls:
-                            return
-                        self.visited_urls.add(asset_url)
+                # In incremental mode, assets that were healthy last time are skipped
+                if self.crawl_state is not None and self.crawl_state.was_healthy(asset_url):
+                    return
 
-                    try:
-                        logging.debug(f"Checking asset: {asset_url}")
-
-                        # Log progress every 100 requests (at WARNING level which corresponds to verbosity 1)
-                        with self.request_count_lock:
-                            if self.request_count % 100 == 0:
-                                logging.info(f"Request #{self.request_count}: Checking asset {asset_url}")
-
-                        # Use semaphore to limit concurrent requests
-                        with request_semaphore:
-                            response = self.session.head(asset_url, timeout=self.timeout,
-                                                         allow_redirects=True)
-                            status_code = response.status_code
-                            with self.request_count_lock:
-                                self.request_count += 1
-
-                        if status_code != 200:
-                            logging.warning(f"Asset not accessible: {asset_url} "
-                                            f"(Status: {status_code})")
-
-                            # Find all pages that reference this asset
-                            with self.broken_links_lock:
-                                # Regular assets
-                                for page_url, assets in self.internal_assets.items():
-                                    if asset_url in assets:
-                                        self.broken_links[page_url.rstrip('/')][asset_url] = status_code
-
-                                # Ignored assets
-                                for page_url, assets in self.ignored_internal_assets_found.items():
-                                    if asset_url in assets:
-                                        self.broken_links[page_url.rstrip('/')][asset_url] = status_code
-
-                    except requests.RequestException as e:
-                        logger.error(f"Error accessing asset {asset_url}: {str(e)}")
-
-                        with self.broken_links_lock:
-                            # Find all pages that reference this asset
-                            # Regular assets
-                            for page_url, assets in self.internal_assets.items():
-                                if asset_url in assets:
-                                    self.broken_links[page_url.rstrip('/')][asset_url] = 0
-
-                            # Ignored assets
-                            for page_url, assets in self.ignored_internal_assets_found.items():
-                                if asset_url in assets:
-                                    self.broken_links[page_url.rstrip('/')][asset_url] = 0
-
-                except Exception as e:
-                    logger.error(f"Unexpected error checking asset {asset_url}: {str(e)}")
-
-            # Submit all assets to the thread pool
-            futures = [executor.submit(check_asset, asset_url) for asset_url in all_assets]
-
-            # Wait for all futures to complete
-            for future in concurrent.futures.as_completed(futures):
                 try:
-                    future.result()  # This will re-raise any exceptions
-                except Exception as e:
-                    logger.error(f"Error in asset checking thread: {str(e)}")
+                    logging.debug("Checking asset: %s", asset_url)
+
+                    # Log progress every 100 requests (at WARNING level which corresponds to verbosity 1)
+                    if self.request_count % 100 == 0:
+                        logging.info("Request #%s: Checking asset %s", self.request_count, asset_url)
 
-                # Add a small delay to avoid overwhelming the server
-                time.sleep(0.01)
+                    # Reserve the request from the global budget before making it
+                    if not self._reserve_request():
+                        return
+                    response = self._request('head', asset_url, allow_redirects=True)
+                    status_code = response.status_code
+
+                    if status_code != 200:
+                        logging.warning(f"Asset not accessible: {asset_url} "
+                                        f"(Status: {status_code})")
+
+                        # Find all pages that reference this asset
+                        self._record_broken_asset(asset_url, status_code)
+                    elif self.crawl_state is not None:
+                        self.crawl_state.mark_healthy(asset_url)
+
+                except requests.RequestException as e:
+                    logger.error(f"Error accessing asset {asset_url}: {str(e)}")
+
+                    # Find all pages that reference this asset
+                    self._record_broken_asset(asset_url, 0)
+
+            except Exception as e:
+                logger.error(f"Unexpected error checking asset {asset_url}: {str(e)}")
+
+        # Submit all assets to the shared worker pool
+        futures = [self.scheduler.submit(check_asset, asset_url) for asset_url in all_assets]
+
+        # Wait for all futures to complete
+        stopped = False
+        for future in concurrent.futures.as_completed(futures):
+            if not stopped and self._should_stop():
+                # Cancel the assets that haven't been started yet
+                stopped = True
+                cancelled = sum(1 for pending in futures if pending.cancel())
+                logger.warning(f"Cancelled {cancelled} pending asset checks")
+            if future.cancelled():
+                continue
+            try:
+                future.result()  # This will re-raise any exceptions
+            except Exception as e:
+                logger.error(f"Error in asset checking thread: {str(e)}")
+
+            # Add a small delay to avoid overwhelming the server
+            time.sleep(0.01)
 
     def check_external_links(self) -> None:
         """Check if the external links are accessible using multiple threads.
@@ -939,132 +1936,583 @@ class LinkChecker:
         """
         logger.info("Checking external links...")
 
-        # Collect all unique external URLs to check
-        all_external_urls: Set[str] = set()
+        # Collect all unique external URLs to check, both regular and ignored
+        all_external_urls = (self.external_links.targets() |
+                             self.ignored_external_links_found.targets())
 
-        # Regular external links
-        for links in self.external_links.values():
-            all_external_urls.update(links)
+        logger.info("Found %s unique external URLs to check", len(all_external_urls))
 
-        # Ignored external links
-        for links in self.ignored_external_links_found.values():
-            all_external_urls.update(links)
+        self._check_urls_by_host(all_external_urls, self._check_external_url)
 
-        logger.info(f"Found {len(all_external_urls)} unique external URLs to check")
+        if self.verdict_cache is not None:
+            self.verdict_cache.flush()
+            logger.info("Reused %s cached external verdicts", len(self.cached_external_urls))
 
-        # Create a semaphore to limit the number of concurrent requests
-        # This ensures we don't exceed max_requests
-        if self.max_requests is not None:
-            request_semaphore = threading.Semaphore(self.max_requests)
-        else:
-            request_semaphore = threading.Semaphore(10000)  # Large value if unlimited
+        logger.info("Finished checking %s external URLs", len(all_external_urls))
 
-        # Create a thread pool with a lower number of workers for external links
-        # to avoid overwhelming external servers
-        with concurrent.futures.ThreadPoolExecutor(max_workers=min(self.max_threads, 5)) as executor:
-            # Function to check a single external URL
-            def check_external_url(ext_url):
-                try:
-                    with self.visited_urls_lock:
-                        if ext_url in self.visited_urls:
-                            return
-                        self.visited_urls.add(ext_url)
+    def _check_urls_by_host(self, urls: Set[str], check: Callable[[str], Any]) -> None:
+        """Check URLs on the shared worker pool, grouped by host.
 
-                    try:
-                        logging.debug(f"Checking external URL: {ext_url}")
-
-                        # Log progress every 100 requests (at WARNING level which corresponds to verbosity 1)
-                        with self.request_count_lock:
-                            if self.request_count % 100 == 0:
-                                logging.info(f"Request #{self.request_count}: Checking external "
-                                             f"URL {ext_url}")
-
-                        # Use semaphore to limit concurrent requests
-                        with request_semaphore:
-                            # Use a HEAD request first for efficiency
-                            response = self.session.head(ext_url, timeout=self.timeout, allow_redirects=True)
-                            status_code = response.status_code
-                            with self.request_count_lock:
-                                self.request_count += 1
-
-                        # If we get a method not allowed error, try with GET instead
-                        if status_code == 405:
-                            logging.debug(f"HEAD request not allowed for {ext_url}, trying GET")
-
-                            # Log progress again if needed for the GET request
-                            with self.request_count_lock:
-                                if self.request_count % 100 == 0:
-                                    logging.info(f"Request #{self.request_count}: Checking external "
-                                                 f"URL {ext_url} (GET)")
-
-                            # Use semaphore for GET request too
-                            with request_semaphore:
-                                response = self.session.get(ext_url, timeout=self.timeout,
-                                                            allow_redirects=True, stream=True)
-                                # Close the connection to avoid reading the whole content
-                                response.close()
-                                status_code = response.status_code
-                                with self.request_count_lock:
-                                    self.request_count += 1
-
-                        if status_code >= 400:
-                            logging.warning(f"External link not accessible: {ext_url} "
-                                            f"(Status: {status_code})")
-
-                            # Find all pages that reference this external URL and record the broken link
-                            with self.broken_links_lock:
-                                # Regular external links
-                                for page_url, links in self.external_links.items():
-                                    if ext_url in links:
-                                        self.broken_links[page_url][ext_url] = status_code
-
-                                # Ignored external links
-                                for page_url, links in self.ignored_external_links_found.items():
-                                    if ext_url in links:
-                                        self.broken_links[page_url][ext_url] = status_code
-
-                    except requests.RequestException as e:
-                        logger.error(f"Error accessing external URL {ext_url}: {str(e)}")
-
-                        with self.broken_links_lock:
-                            # Record the error for regular external links
-                            for page_url, links in self.external_links.items():
-                                if ext_url in links:
-                                    self.broken_links[page_url][ext_url] = 0
-
-                            # Record the error for ignored external links
-                            for page_url, links in self.ignored_external_links_found.items():
-                                if ext_url in links:
-                                    self.broken_links[page_url][ext_url] = 0
-
-                    # Add a small delay to avoid overwhelming external servers
-                    time.sleep(0.2)
-
-                except Exception as e:
-                    logger.error(f"Unexpected error checking external URL {ext_url}: {str(e)}")
-
-            # Submit all external URLs to the thread pool
-            futures = [executor.submit(check_external_url, ext_url) for ext_url in all_external_urls]
-
-            # Wait for all futures to complete
-            for future in concurrent.futures.as_completed(futures):
+        Args:
+            urls: The URLs to check.
+            check: Function that checks a single URL.
+        """
+        # Group the URLs by host so that each worker checks a run of URLs on the same
+        # host over a warm keep-alive connection instead of hopping between hosts
+        host_groups = self._group_urls_by_host(urls)
+        logger.info("External URLs are on %s hosts", len(host_groups))
+
+        # Each lane is a worker's claim on one host's URLs. A host gets at most
+        # max_connections_per_host lanes, all draining the same shared deque. In
+        # adaptive concurrency mode it starts with as many lanes as its current limit
+        # and gets another one whenever the limit grows, up to max_concurrency.
+        lanes: queue.Queue = queue.Queue()
+        open_lanes: Dict[str, int] = {}
+        lanes_lock = threading.Lock()
+        widest = self.max_connections_per_host
+        workers = self.max_external_threads
+        if self.adaptive_limiter is not None:
+            widest = self.adaptive_limiter.max_concurrency
+            workers = max(workers, widest)
+        max_lanes = 0
+        for host, host_urls in host_groups:
+            host_queue = deque(host_urls)
+            open_lanes[host] = min(self._host_lane_limit(host), len(host_urls))
+            for _ in range(open_lanes[host]):
+                lanes.put((host, host_queue))
+            max_lanes += min(widest, len(host_urls))
+        workers = min(workers, max_lanes)
+        # Lanes queued or being drained; once there are none left, no lane can be added
+        # any more and the workers are told to stop
+        pending = [lanes.qsize()]
+
+        def widen(host: str, host_queue: deque) -> None:
+            """Open another lane on a host if its adaptive limit has grown."""
+            with lanes_lock:
+                if host_queue and open_lanes[host] < self._host_lane_limit(host):
+                    open_lanes[host] += 1
+                    pending[0] += 1
+                    lanes.put((host, host_queue))
+
+        # Function that keeps taking lanes and checking their host's URLs
+        def run_lanes():
+            while True:
+                lane = lanes.get()
+                if lane is None:
+                    return
+                host, host_queue = lane
+                logging.debug("Checking external URLs on host %s", host)
                 try:
-                    future.result()  # This will re-raise any exceptions
-                except Exception as e:
-                    logger.error(f"Error in external link checking thread: {str(e)}")
+                    while not self._should_stop():
+                        try:
+                            ext_url = host_queue.popleft()
+                        except IndexError:
+                            break
+                        check(ext_url)
+                        if self.adaptive_limiter is not None:
+                            widen(host, host_queue)
+                finally:
+                    with lanes_lock:
+                        pending[0] -= 1
+                        finished = pending[0] == 0
+                    if finished:
+                        for _ in range(workers):
+                            lanes.put(None)
+
+        # Start the lane workers
+        futures = [self.scheduler.submit(run_lanes) for _ in range(workers)]
+
+        # Wait for all futures to complete
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                future.result()  # This will re-raise any exceptions
+            except Exception as e:
+                logger.error(f"Error in external link checking thread: {str(e)}")
+
+    def _check_external_url(self, ext_url: str, pause: bool = True) -> Optional[int]:
+        """Check a single external URL, with a HEAD request falling back to GET.
+
+        The verdict is recorded on every page that links to the URL, kept in the
+        external verdict cache and published as an ExternalVerdict event.
+
+        Args:
+            ext_url: The external URL.
+            pause: Wait a little after the request to avoid overwhelming external
+                servers (not needed when the requests are paced per host).
+
+        Returns:
+            The status code (0 for a connection error, a timeout or a short-circuited
+            host), or None if the URL was not checked: it was already checked in this
+            run, robots.txt disallows it, it was healthy in the previous incremental
+            run, or the request limit was reached.
+        """
+        try:
+            with self.visited_urls_lock:
+                if ext_url in self.visited_urls:
+                    return None
+                self.visited_urls.add(ext_url)
+
+            if not self._robots_allowed(ext_url):
+                return None
+
+            # Reuse the verdict of a link checked during the crawl
+            verdict = self.early_verdicts.get(ext_url)
+            if verdict is not None:
+                if verdict == 0 or verdict >= 400:
+                    self._record_broken_external(ext_url, verdict)
+                elif self.crawl_state is not None:
+                    self.crawl_state.mark_healthy(ext_url)
+                return verdict
+
+            # In incremental mode, links that were healthy last time are skipped
+            if self.crawl_state is not None and self.crawl_state.was_healthy(ext_url):
+                return None
+
+            # Reuse a healthy verdict from a previous run if it is still fresh
+            if self.verdict_cache is not None:
+                cached = self.verdict_cache.get(ext_url)
+                if cached is not None:
+                    logging.debug("Using cached verdict for external URL %s "
+                                  "(Status: %s)", ext_url, cached[0])
+                    with self.external_links_lock:
+                        self.cached_external_urls.add(ext_url)
+                    self._emit(ExternalVerdict(ext_url, cached[0], cached=True))
+                    return cached[0]
+
+            # Fail immediately if the host has been short-circuited
+            host = urllib.parse.urlparse(ext_url).netloc
+            host_error = self.circuit_breaker.allow_request(host)
+            if host_error is not None:
+                logging.debug("Skipping external URL %s: host %s is "
+                              "short-circuited (%s)", ext_url, host, host_error)
+                self._emit(ExternalVerdict(ext_url, 0))
+                self._record_broken_external(ext_url, 0)
+                return 0
+
+            try:
+                logging.debug("Checking external URL: %s", ext_url)
+
+                # Log progress every 100 requests (at WARNING level which corresponds to verbosity 1)
+                if self.request_count % 100 == 0:
+                    logging.info("Request #%s: Checking external URL %s",
+                                 self.request_count, ext_url)
+
+                # Use a HEAD request first for efficiency, reserving it from the
+                # global budget before making it
+                if not self._reserve_request():
+                    self.circuit_breaker.release_probe(host)
+                    return None
+                response = self._request('head', ext_url, allow_redirects=True)
+                status_code = response.status_code
+
+                # If we get a method not allowed error, try with GET instead
+                if status_code == 405:
+                    logging.debug("HEAD request not allowed for %s, trying GET", ext_url)
+
+                    # Log progress again if needed for the GET request
+                    if self.request_count % 100 == 0:
+                        logging.info("Request #%s: Checking external URL %s (GET)",
+                                     self.request_count, ext_url)
+
+                    # The GET request needs a reservation of its own
+                    if not self._reserve_request():
+                        # The host answered the HEAD request, so it is up
+                        self.circuit_breaker.record_success(host)
+                        return None
+                    response = self._request('get', ext_url,
+                                             allow_redirects=True, stream=True)
+                    # Close the connection to avoid reading the whole content
+                    response.close()
+                    status_code = response.status_code
+
+                # Any response at all means the host is up
+                self.circuit_breaker.record_success(host)
+                if self.verdict_cache is not None:
+                    self.verdict_cache.put(ext_url, status_code,
+                                           str(response.url or ext_url))
+                self._emit(ExternalVerdict(ext_url, status_code))
+
+                if status_code >= 400:
+                    logging.warning(f"External link not accessible: {ext_url} "
+                                    f"(Status: {status_code})")
+
+                    # Find all pages that reference this external URL and record the broken link
+                    self._record_broken_external(ext_url, status_code)
+                elif self.crawl_state is not None:
+                    self.crawl_state.mark_healthy(ext_url)
+
+            except (requests.ConnectionError, requests.Timeout) as e:
+                logger.error(f"Error accessing external URL {ext_url}: {str(e)}")
+
+                if self.circuit_breaker.record_failure(host, str(e), is_dns_failure(e)):
+                    logger.warning(f"Host {host} is not responding; failing its "
+                                   "remaining external URLs immediately")
+
+                if self.verdict_cache is not None:
+                    self.verdict_cache.put(ext_url, 0, ext_url)
+                self._emit(ExternalVerdict(ext_url, 0))
+                self._record_broken_external(ext_url, 0)
+                status_code = 0
+
+            except requests.RequestException as e:
+                logger.error(f"Error accessing external URL {ext_url}: {str(e)}")
+
+                # The request failed for a reason other than the host being down
+                self.circuit_breaker.record_success(host)
+                self._emit(ExternalVerdict(ext_url, 0))
+                self._record_broken_external(ext_url, 0)
+                status_code = 0
+
+            # Add a small delay to avoid overwhelming external servers, unless the
+            # requests are already paced per host by robots.txt
+            if pause and self.robots is None:
+                time.sleep(0.2)
+            return status_code
+
+        except Exception as e:
+            logger.error(f"Unexpected error checking external URL {ext_url}: {str(e)}")
+            return None
+
+    def check_url_list(self,
+                       urls: Iterable[str],
+                       write: Callable[[str, Optional[int]], None],
+                       chunk_size: int = 10000) -> int:
+        """Check a list of URLs without crawling, e.g. a catalog of data links.
+
+        The URLs go through the same checks as external links (host grouping, HEAD
+        with a GET fallback, retries, circuit breaker and verdict cache), without the
+        fixed delay after each request: the per-host connection limits and pacing
+        keep the load on each host in check. They are read lazily, chunk_size at a
+        time, and each verdict is written as soon as it is known. Only an 8-byte hash
+        of each distinct URL is kept across chunks, to skip duplicates, so memory use
+        grows very slowly with the length of the list.
+
+        Args:
+            urls: The URLs to check, e.g. the lines of a file.
+            write: Function called with each URL and its status code (None if it was
+                not checked, e.g. because robots.txt disallows it). It is called from
+                one worker thread at a time.
+            chunk_size: Number of URLs read and grouped by host at a time.
+
+        Returns:
+            The number of distinct URLs read. All of them were checked unless the
+            run was stopped early.
+        """
+        self._prepare_run()
+        write_lock = threading.Lock()
+
+        def check_and_write(url):
+            status_code = self._check_external_url(url, pause=False)
+            with write_lock:
+                write(url, status_code)
+
+        # Hashes of the URLs read so far, so that duplicates in later chunks are skipped
+        seen: Set[int] = set()
+
+        def distinct_urls() -> Iterator[str]:
+            for url in urls:
+                digest = int.from_bytes(
+                    hashlib.blake2b(url.encode('utf-8', 'surrogatepass'),
+                                    digest_size=8).digest(), 'big')
+                if digest not in seen:
+                    seen.add(digest)
+                    yield url
+
+        checked = 0
+        url_iterator = distinct_urls()
+        try:
+            if not self._begin_phase(2, 'URL list'):
+                return 0
+            while not self._should_stop():
+                chunk = set(itertools.islice(url_iterator, chunk_size))
+                if not chunk:
+                    break
+                self._check_urls_by_host(chunk, check_and_write)
+                checked += len(chunk)
+                logger.info("Checked %s URLs", checked)
+
+                # Only the URL hashes and the verdict cache are kept across chunks
+                with self.visited_urls_lock:
+                    self.visited_urls.difference_update(chunk)
+                with self.external_links_lock:
+                    self.cached_external_urls.clear()
+                with self.counter_lock:
+                    self.robots_skipped.clear()
+        except KeyboardInterrupt:
+            logger.info("URL checking interrupted by user")
+            self.incomplete_reasons.append("Interrupted by user")
+        finally:
+            self._end_phase()
+            self._deadline = None
+            if self.verdict_cache is not None:
+                self.verdict_cache.flush()
+
+        return checked
+
+    def probe(self, url: str, read_page: bool = False) -> Tuple[Optional[int], Optional[HtmlBytes]]:
+        """Request a URL without recording anything in the results, e.g. to re-check it.
+
+        A link is checked with a HEAD request, falling back to GET when HEAD is not
+        allowed. A page is fetched with GET so that its HTML can be parsed. Retries
+        follow the retry policy, and every request is reserved from the request budget.
+        URLs that robots.txt disallows are not requested (and are recorded as
+        skipped), and external hosts that are short-circuited fail without a request.
 
-        logger.info(f"Finished checking {len(all_external_urls)} external URLs")
+        Args:
+            url: The URL to request.
+            read_page: Fetch the URL as a page and return its HTML.
+
+        Returns:
+            A tuple of (status_code, html). The status code is 0 for a connection
+            error, a timeout or a short-circuited host, and None if the request budget
+            is used up or robots.txt disallows the URL. The HTML is only returned for
+            a page that was read and is HTML with a 200 status.
+        """
+        if not self._robots_allowed(url):
+            return None, None
+
+        host = None
+        if self._categorize_url(url) == 'external':
+            host = urllib.parse.urlparse(url).netloc
+            host_error = self.circuit_breaker.allow_request(host)
+            if host_error is not None:
+                logging.debug("Skipping URL %s: host %s is short-circuited (%s)",
+                              url, host, host_error)
+                return 0, None
+
+        try:
+            if not read_page:
+                if not self._reserve_request():
+                    self._release_probe(host)
+                    return None, None
+                response = self._request('head', url, allow_redirects=True)
+                self._record_probe_success(host)
+                if response.status_code != 405:
+                    return response.status_code, None
+
+            if not self._reserve_request():
+                self._release_probe(host)
+                return None, None
+            response = self._request('get', url, allow_redirects=True, stream=True)
+            self._record_probe_success(host)
+            content_type = response.headers.get('Content-Type', '')
+            if read_page and response.status_code == 200 and 'text/html' in content_type:
+                return response.status_code, self._read_html(response, content_type)
+            response.close()
+            return response.status_code, None
+        except (requests.ConnectionError, requests.Timeout) as e:
+            logger.error(f"Error accessing URL {url}: {str(e)}")
+            if host is not None:
+                self.circuit_breaker.record_failure(host, str(e), is_dns_failure(e))
+            return 0, None
+        except requests.RequestException as e:
+            logger.error(f"Error accessing URL {url}: {str(e)}")
+            # The request failed for a reason other than the host being down
+            self._record_probe_success(host)
+            return 0, None
+
+    def _record_probe_success(self, host: Optional[str]) -> None:
+        """Close the circuit of an external host that responded to probe()."""
+        if host is not None:
+            self.circuit_breaker.record_success(host)
+
+    def _release_probe(self, host: Optional[str]) -> None:
+        """Give up the circuit breaker's probe of an external host that probe() did not request."""
+        if host is not None:
+            self.circuit_breaker.release_probe(host)
+
+    def page_targets(self, url: str,
+                     html_content: Union[str, bytes]) -> Tuple[List[str], List[str]]:
+        """Find what a page links to, without recording anything in the results.
+
+        Args:
+            url: The URL of the page.
+            html_content: The HTML content of the page, as text or raw bytes.
+
+        Returns:
+            A tuple of (pages, links): the internal pages that a crawl would visit
+            from this page, and the other URLs it references that are reported on
+            (internal pages that are not crawled, assets and external links).
+        """
+        edges = self._parse_page(url, html_content)
+        pages: List[str] = []
+        links: List[str] = []
+        for link in dict.fromkeys(edges['links']):
+            if self._categorize_url(link) == 'allowed' and not self._should_not_crawl(link):
+                pages.append(link)
+            else:
+                links.append(link)
+        links.extend(edges['assets'])
+        links.extend(edges['external'])
+        return pages, links
+
+    def check_anchors(self) -> None:
+        """Check that the links to fragments point to existing anchors.
+
+        The anchors of crawled pages were indexed while the pages were parsed. Pages
+        that were not crawled (external pages and pages that are only checked) are
+        fetched once each to index their anchors; links to pages that are broken,
+        ignored or not HTML are not checked.
+        """
+        assert self.anchor_index is not None
+        anchor_index = self.anchor_index
+        logger.info("Checking %s links to anchors...", anchor_index.reference_count())
+
+        broken_targets = self.broken_links.targets()
+        to_fetch = [url for url in anchor_index.unindexed_targets()
+                    if url not in broken_targets and
+                    not self._should_ignore_external_link(url) and
+                    not (self._is_internal_url(url) and not self._is_html_url(url))]
+        logger.info("Fetching %s pages that were not crawled to index their anchors",
+                    len(to_fetch))
+
+        # Function to fetch a page and index its anchors
+        def index_page(page_url):
+            if (self._should_stop() or not self._robots_allowed(page_url) or
+                    not self._reserve_request()):
+                return
+            try:
+                response = self._request('get', page_url, allow_redirects=True, stream=True)
+            except requests.RequestException as e:
+                logger.error(f"Error fetching {page_url} for its anchors: {str(e)}")
+                return
+            content_type = response.headers.get('Content-Type', '')
+            if response.status_code == 200 and 'text/html' in content_type:
+                anchor_index.add_page(
+                    page_url, find_anchors(make_soup(self._read_html(response, content_type))))
+            else:
+                logging.debug("Not checking anchors on %s (Status: %s)",
+                              page_url, response.status_code)
+                response.close()
+
+        futures = [self.scheduler.submit(index_page, page_url) for page_url in to_fetch]
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                future.result()  # This will re-raise any exceptions
+            except Exception as e:
+                logger.error(f"Error in anchor checking thread: {str(e)}")
+
+        for page_url, target_url, fragment in anchor_index.missing():
+            logger.warning(f"Missing anchor: {target_url}#{fragment} (On page: {page_url})")
+            self.broken_anchors.record(page_url, f"{target_url}#{fragment}")
+
+    @staticmethod
+    def _group_urls_by_host(urls: Set[str]) -> List[Tuple[str, List[str]]]:
+        """Group URLs by host for scheduling.
+
+        Args:
+            urls: The URLs to group.
+
+        Returns:
+            A list of (host, urls) tuples, with the hosts that have the most URLs first
+            so that their long runs of requests start early.
+        """
+        by_host: Dict[str, List[str]] = defaultdict(list)
+        for url in urls:
+            by_host[urllib.parse.urlparse(url).netloc.lower()].append(url)
+
+        return sorted(((host, sorted(host_urls)) for host, host_urls in by_host.items()),
+                      key=lambda item: (-len(item[1]), item[0]))
+
+    def _record_broken_asset(self, asset_url: str, status_code: int) -> None:
+        """Record a broken internal asset on every page that references it.
+
+        Args:
+            asset_url: The asset URL that could not be accessed.
+            status_code: The HTTP status code, or 0 for a connection error.
+        """
+        with self.broken_links_lock:
+            # Regular and ignored assets
+            pages = [page_url.rstrip('/') for page_url in
+                     (list(self.internal_assets.referrers(asset_url)) +
+                      list(self.ignored_internal_assets_found.referrers(asset_url)))]
+            if asset_url in self.early_verdicts:
+                # Only pages found since the asset was checked during the crawl
+                pages = [page_url for page_url in pages
+                         if asset_url not in self.broken_links.get(page_url, ())]
+            for page_url in pages:
+                self.broken_links.record(page_url, asset_url, status_code)
+
+        # Events are published outside the lock, as publishing may wait for the consumer
+        for page_url in pages:
+            self._broken_link_found(page_url, asset_url, status_code)
+
+    def _record_broken_external(self, ext_url: str, status_code: int) -> None:
+        """Record a broken external URL on every page that references it.
+
+        Args:
+            ext_url: The external URL that could not be accessed.
+            status_code: The HTTP status code, or 0 for a connection error.
+        """
+        with self.broken_links_lock:
+            # Regular and ignored external links
+            pages = (list(self.external_links.referrers(ext_url)) +
+                     list(self.ignored_external_links_found.referrers(ext_url)))
+            if ext_url in self.early_verdicts:
+                # Only pages found since the link was checked during the crawl
+                pages = [page_url for page_url in pages
+                         if ext_url not in self.broken_links.get(page_url, ())]
+            for page_url in pages:
+                self.broken_links.record(page_url, ext_url, status_code)
+
+        for page_url in pages:
+            self._broken_link_found(page_url, ext_url, status_code)
 
     def print_report(self) -> None:
         """Print a report of the link checker results."""
+        # Mark the report as incomplete if the run was cut short
+        if self.incomplete_reasons:
+            print("=== INCOMPLETE REPORT ===")
+            for reason in self.incomplete_reasons:
+                print(f"  - {reason}")
+            print()
+
         # Print configuration
         print("=== CONFIGURATION ===")
         print(f"Root URL: {self.root_url}")
+        if self.target_pages is not None:
+            print(f"Pages checked: {len(self.target_pages)} listed pages (not crawled)")
         print(f"Timeout: {self.timeout} seconds")
         print("Max requests: "
               f"{'unlimited' if self.max_requests is None else self.max_requests}")
         print(f"Max depth: {'unlimited' if self.max_depth is None else self.max_depth}")
         print(f"Max threads: {self.max_threads}")
+        if self.max_time is None:
+            print("Max time: unlimited")
+        elif self.max_time_split:
+            split = '/'.join(f"{share:g}" for share in self.max_time_split)
+            print(f"Max time: {self.max_time} seconds (split: {split})")
+        else:
+            print(f"Max time: {self.max_time} seconds")
+        if self.adaptive_limiter is not None:
+            print(f"Adaptive concurrency: {self.adaptive_limiter.min_concurrency}-"
+                  f"{self.adaptive_limiter.max_concurrency} requests per host")
+        print(f"Max external threads: {self.max_external_threads} "
+              f"(max {self.max_connections_per_host} per host)")
+        if self.retry_policy.enabled:
+            print(f"Retries: {self.retry_policy.max_retries} per request "
+                  f"(backoff: {self.retry_policy.backoff}-{self.retry_policy.backoff_max} "
+                  f"seconds, budget: {self.retry_policy.host_budget} per host)")
+        else:
+            print("Retries: disabled")
+        if self.result_store is not None:
+            print(f"Result store: {self.result_store.path}")
+        if self.crawl_state is not None:
+            print(f"Incremental state: {self.crawl_state.path}")
+        if self.verdict_cache is not None:
+            print(f"External verdict cache: {self.verdict_cache.path} "
+                  f"(TTL: {self.verdict_cache.ttl / 3600:g} hours)")
+        if self.robots is not None:
+            print("robots.txt: respected")
+        if self.trap_detector.enabled:
+            print(f"Crawl trap limits: {', '.join(self.trap_detector.limits())}")
+        canonical_rules = self.canonical_rules.describe()
+        print(f"URL canonicalization: {', '.join(canonical_rules) or 'disabled'}")
+        if self.circuit_breaker.enabled:
+            print(f"Host failure threshold: {self.host_failure_threshold} "
+                  f"(cool-down: {self.host_cooldown} seconds)")
+        else:
+            print("Host failure threshold: disabled")
 
         # Print ignored asset paths
         if self.ignored_asset_paths:
@@ -1093,7 +2541,7 @@ class LinkChecker:
         # Print broken links
         if self.broken_links:
             print("\n=== BROKEN LINKS/ASSETS ===")
-            for page_url, broken in self.broken_links.items():
+            for page_url, broken in self.broken_links.sorted_items():
                 print(f"\nOn page: {page_url}")
                 for link, status in sorted(broken.items()):
                     status_str = str(status) if status else "Connection error"
@@ -1101,61 +2549,144 @@ class LinkChecker:
         else:
             print("\n=== NO BROKEN LINKS/ASSETS FOUND ===")
 
+        # Print links to missing anchors
+        if self.anchor_index is not None:
+            if self.broken_anchors:
+                print("\n=== BROKEN ANCHORS ===")
+                for page_url, targets in self.broken_anchors.sorted_items():
+                    print(f"\nOn page: {page_url}")
+                    for target in sorted(targets):
+                        print(f"  - {target}")
+            else:
+                print("\n=== NO BROKEN ANCHORS FOUND ===")
+
+        # Print URLs that robots.txt did not allow to be checked
+        if self.robots_skipped:
+            print("\n=== SKIPPED BY ROBOTS.TXT ===")
+            for url in sorted(self.robots_skipped):
+                print(f"  - {url}")
+
+        # Print URLs that were not crawled because they look like crawl traps
+        if self.suspected_traps:
+            print("\n=== SUSPECTED CRAWL TRAPS ===")
+            for url, reason in sorted(self.suspected_traps.items()):
+                print(f"  - {url} ({reason})")
+
+        # Print requests that were retried
+        retried = self.retry_policy.retried_requests()
+        if retried:
+            print("\n=== RETRIED REQUESTS ===")
+            recovered = {url: result for url, result in retried.items()
+                         if 0 < result[1] < 400}
+            print(f"Retried: {len(retried)}, recovered: {len(recovered)}, "
+                  f"still failing: {len(retried) - len(recovered)}")
+            for url, (retries, status) in sorted(retried.items()):
+                outcome = "recovered" if url in recovered else "failed"
+                status_str = str(status) if status else "Connection error"
+                print(f"  - {url} ({retries} retries, {outcome}, Status: {status_str})")
+        exhausted_hosts = self.retry_policy.exhausted_hosts()
+        if exhausted_hosts:
+            print("\nHosts whose retry budget ran out:")
+            for host in sorted(exhausted_hosts):
+                print(f"  - {host}")
+
+        # Print the concurrency chosen for each host in adaptive mode
+        if self.adaptive_limiter is not None:
+            print("\n=== ADAPTIVE CONCURRENCY ===")
+            for host, (limit, lowest, highest, decreases, history) in sorted(
+                    self.adaptive_limiter.summary().items()):
+                print(f"\n{host}: final {limit}, range {lowest}-{highest}, "
+                      f"{decreases} decreases")
+                timeline = ", ".join(f"{elapsed:.1f}s={value}"
+                                     for elapsed, value in history[-50:])
+                print(f"  Concurrency over time: {timeline}")
+
+        # Print external hosts that were short-circuited
+        short_circuited = self.circuit_breaker.short_circuited_hosts()
+        if short_circuited:
+            print("\n=== SHORT-CIRCUITED HOSTS ===")
+            for host, (skipped, error, dns_failure) in sorted(short_circuited.items()):
+                reason = "DNS lookup failed" if dns_failure else "not responding"
+                print(f"\n{host} ({reason}): {skipped} URLs failed without a request")
+                print(f"  Last error: {error}")
+
         # Print external links
         if self.external_links:
             print("\n=== EXTERNAL LINKS ===")
-            unique_external_links = set()
 
-            for page_url, links in sorted(self.external_links.items()):
+            for page_url, links in self.external_links.sorted_items():
                 print(f"\nOn page: {page_url}")
                 for link in sorted(links):
-                    print(f"  - {link}")
-                    unique_external_links.add(link)
+                    if link in self.cached_external_urls:
+                        print(f"  - {link} (cached verdict)")
+                    else:
+                        print(f"  - {link}")
 
-            print(f"\nTotal unique external links: {len(unique_external_links)}")
+            print(f"\nTotal unique external links: {self.external_links.target_count()}")
         else:
             print("\n=== NO EXTERNAL LINKS FOUND ===")
 
         # Print internal assets
         print("\n=== INTERNAL ASSETS ===")
 
-        # Group assets by type
-        assets_by_type: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
-        for page_url, assets in self.internal_assets.items():
-            for asset_url, asset_type in sorted(assets.items()):
-                assets_by_type[asset_type].append((asset_url, page_url))
-
         # Print assets grouped by type
-        for asset_type, asset_list in sorted(assets_by_type.items()):
+        for asset_type, asset_list in self.internal_assets.iter_by_value():
             print(f"\n{asset_type.upper()} ({len(asset_list)})")
-            for asset_url, page_url in sorted(asset_list):
+            for asset_url, page_url in asset_list:
                 print(f"  - {asset_url} (Referenced on: {page_url})")
 
         # Print summary
         print("\n=== SUMMARY ===")
         print(f"Total pages visited: {self.actual_visited_pages_count}")
-        print("Broken links found: "
-              f"{sum(len(links) for links in self.broken_links.values())}")
-
-        asset_count = sum(len(assets) for assets in self.internal_assets.values())
-        unique_asset_count = len({url for assets in self.internal_assets.values()
-                                 for url in assets})
+        if self.html_bytes_decoded:
+            print(f"HTML transferred: {self.html_bytes_on_wire} bytes on the wire, "
+                  f"{self.html_bytes_decoded} bytes decoded "
+                  f"({self.html_bytes_on_wire / self.html_bytes_decoded:.0%})")
+        print(f"Broken links found: {self.broken_links.count()}")
+        if self.anchor_index is not None:
+            print(f"Links to missing anchors found: {self.broken_anchors.count()}")
+        if self.robots is not None:
+            print(f"URLs skipped by robots.txt: {len(self.robots_skipped)}")
+        if self.trap_detector.enabled:
+            print(f"Suspected crawl trap URLs not crawled: {len(self.suspected_traps)}")
+        print(f"Links rewritten by URL canonicalization: "
+              f"{self.canonical_rules.urls_rewritten()}")
+        if self.link_block_cache is not None:
+            print(f"Repeated link blocks reused: {self.link_block_cache.blocks_reused} "
+                  f"({self.link_block_cache.links_reused} links not resolved again)")
+
+        asset_count = self.internal_assets.count()
+        unique_asset_count = self.internal_assets.target_count()
         print(f"Non-ignored internal assets found: {unique_asset_count} unique assets "
               f"referenced {asset_count} times")
         print(f"Ignored assets found: {self.ignored_internal_assets_count}")
 
         # Add external links summary
-        total_external_links = sum(len(links) for links in self.external_links.values())
-        num_unique_external_links = len(set(link for links in self.external_links.values()
-                                            for link in links))
+        total_external_links = self.external_links.count()
+        num_unique_external_links = self.external_links.target_count()
         print(f"External links found: {num_unique_external_links} unique links referenced "
               f"{total_external_links} times")
+        if self.verdict_cache is not None:
+            print(f"External verdicts from cache: {len(self.cached_external_urls)}")
+        if self.crawl_state is not None:
+            state = self.crawl_state
+            print(f"Pages reused from the previous run: "
+                  f"{state.pages_skipped + state.pages_not_modified + state.pages_same_content} "
+                  f"({state.pages_skipped} without a request, {state.pages_not_modified} "
+                  f"not modified, {state.pages_same_content} with unchanged content)")
+            print(f"Targets healthy in the previous run and not re-checked: "
+                  f"{state.targets_skipped}")
 
         # Add requests information
         print(f"\nRequests made: {self.request_count} " +
               f"(max: {'unlimited' if self.max_requests is None else self.max_requests})")
         if (self.max_requests is not None and self.request_count >= self.max_requests):
             print("Request limit reached - crawl was incomplete")
+            if self.request_budget.denied:
+                print(f"Checks skipped because the request limit was reached: "
+                      f"{self.request_budget.denied}")
+        if self.incomplete_reasons:
+            print("Run was cut short - report is incomplete")
 
         if hasattr(self, 'above_root_urls_count') and self.above_root_urls_count > 0:
             print(f"URLs above root on same host: {self.above_root_urls_count}")
@@ -1178,21 +2709,221 @@ class LinkChecker:
         # External URLs are handled separately in link_checker method
         return url_category == 'allowed' or url_category == 'external'
 
-    def run(self) -> Tuple[Dict[str, Dict[str, int]], Dict[str, Dict[str, str]]]:
+    def retarget(self,
+                 root_url: str,
+                 ignored_asset_paths: Optional[List[str]] = None,
+                 ignored_internal_paths: Optional[List[str]] = None,
+                 ignored_external_links: Optional[List[str]] = None,
+                 max_requests: Optional[int] = None,
+                 max_depth: Optional[int] = None,
+                 max_time: Optional[float] = None,
+                 pages: Optional[List[str]] = None) -> None:
+        """Point the checker at another site for its next run.
+
+        The worker pool, the HTTP session with its keep-alive connections, the external
+        verdict cache, the circuit breaker's host states (including failed DNS
+        lookups), the robots.txt rules and the adaptive concurrency limits stay warm;
+        the results are cleared.
+
+        Args:
+            root_url: The URL of the website to check.
+            ignored_asset_paths: List of paths to ignore when logging internal assets.
+            ignored_internal_paths: List of paths to check once but not crawl further.
+            ignored_external_links: List of external URLs or URL roots to ignore in
+                reporting.
+            max_requests: Maximum number of requests to make (None for unlimited).
+            max_depth: Maximum depth to crawl (None for unlimited).
+            max_time: Wall-clock time budget in seconds for the run (None for unlimited).
+            pages: URLs (or paths relative to the root URL) of the only pages to fetch
+                (None to crawl from the root URL).
+
+        Raises:
+            RuntimeError: If events of a run are being streamed.
+        """
+        if self.event_stream is not None:
+            raise RuntimeError("Cannot retarget the checker while it runs")
+
+        self.root_url = self._normalize_url(root_url)
+        self.root_domain = urllib.parse.urlparse(self.root_url).netloc
+        self.ignored_asset_paths = ignored_asset_paths or []
+        self.ignored_internal_paths = ignored_internal_paths or []
+        self.ignored_external_links = ignored_external_links or []
+        self.max_requests = max_requests
+        self.request_budget.limit = max_requests
+        self.max_depth = max_depth
+        self.max_time = max_time
+        self.target_pages = None
+        if pages is not None:
+            self.target_pages = list(dict.fromkeys(self._resolve_target_page(page)
+                                                   for page in pages))
+
+        self._reset_results()
+        self._has_run = False
+
+    def run(self) -> Tuple[MapRelation, MapRelation]:
         """Run the link checker.
 
+        Returns:
+            A tuple of (broken_links, internal_assets). Both map page URLs to dicts
+            of {url: status_code} and {url: asset_type}.
+        """
+        self._prepare_run()
+        return self._run_phases()
+
+    def _prepare_run(self) -> None:
+        """Reset the results of a previous run and start the time budget."""
+        # A checker can be run again; the worker pool and connections stay warm
+        if self._has_run:
+            self._reset_results()
+        self._has_run = True
+
+        if self.max_time is not None:
+            self._deadline = time.monotonic() + self.max_time
+
+    def _run_phases(self) -> Tuple[MapRelation, MapRelation]:
+        """Run the phases of a run prepared by _prepare_run().
+
         Returns:
             A tuple of (broken_links, internal_assets).
         """
         try:
-            self.link_checker()
-            self.check_assets()
-            self.check_external_links()
+            if self._begin_phase(0, 'crawl'):
+                if self.crawl_state is not None and self.sitemap_url:
+                    self._load_sitemap()
+                self.link_checker()
+            if self._begin_phase(1, 'asset'):
+                self.check_assets()
+            if self._begin_phase(2, 'external link'):
+                self.check_external_links()
+            if self.anchor_index is not None and self._begin_phase(3, 'anchor'):
+                self.check_anchors()
         except KeyboardInterrupt:
             logger.info("Link checking interrupted by user")
+            self.incomplete_reasons.append("Interrupted by user")
+        finally:
+            self._end_phase()
+            self._deadline = None
+
+        if self.crawl_state is not None:
+            self.crawl_state.save(complete=not self.incomplete_reasons,
+                                  broken=self.broken_links.targets())
 
         return self.broken_links, self.internal_assets
 
+    def _start_event_stream(self, max_queued: int) -> EventStream:
+        """Start a run in a background thread that publishes its results to a stream.
+
+        Args:
+            max_queued: Maximum number of events waiting for the consumer.
+
+        Returns:
+            The stream the run publishes to.
+
+        Raises:
+            RuntimeError: If events are already being streamed from this checker.
+        """
+        if self.event_stream is not None:
+            raise RuntimeError("Events of this checker are already being streamed")
+        stream = EventStream(max_queued)
+        self.event_stream = stream
+        self._stream_error = None
+
+        # Reset before the thread starts, so that cancelling right away is not undone
+        self._prepare_run()
+
+        def run_and_close():
+            try:
+                self._run_phases()
+            except BaseException as e:
+                self._stream_error = e
+            finally:
+                stream.close()
+
+        self._stream_thread = threading.Thread(target=run_and_close,
+                                               name='link_checker-run', daemon=True)
+        self._stream_thread.start()
+        return stream
+
+    def _finish_event_stream(self, stream: EventStream) -> None:
+        """Wait for the run behind a stream, cancelling it if the consumer left early.
+
+        Args:
+            stream: The stream returned by _start_event_stream().
+        """
+        assert self._stream_thread is not None
+        if not stream.closed:
+            self.cancel("Event consumer stopped")
+            stream.cancel()
+        self._stream_thread.join()
+        self._stream_thread = None
+        self.event_stream = None
+
+    def _raise_stream_error(self) -> None:
+        """Re-raise an exception raised by the run behind the event stream."""
+        error, self._stream_error = self._stream_error, None
+        if error is not None:
+            raise error
+
+    def iter_events(self, max_queued: int = 1000) -> Generator[Event, None, None]:
+        """Run the check and yield the results as they are found.
+
+        The check runs in a background thread while the caller consumes the records:
+        PageVisited, BrokenLink, AssetFound and ExternalVerdict. At most max_queued
+        records wait for the caller; when that many are waiting the check pauses.
+        Leaving the loop early cancels the rest of the run. The usual results are
+        still collected and available afterwards, e.g. for print_report().
+
+        Args:
+            max_queued: Maximum number of records waiting to be consumed.
+
+        Yields:
+            The result records, in the order they were found.
+        """
+        stream = self._start_event_stream(max_queued)
+        try:
+            while True:
+                event = stream.get()
+                if event is None:
+                    break
+                yield event
+        finally:
+            self._finish_event_stream(stream)
+        self._raise_stream_error()
+
+    async def aiter_events(self, max_queued: int = 1000) -> AsyncIterator[Event]:
+        """Run the check and yield the results as they are found, asynchronously.
+
+        This is the asynchronous version of iter_events(). Waiting for a record
+        does not block the event loop.
+
+        Args:
+            max_queued: Maximum number of records waiting to be consumed.
+
+        Yields:
+            The result records, in the order they were found.
+        """
+        loop = asyncio.get_running_loop()
+        stream = self._start_event_stream(max_queued)
+        try:
+            while True:
+                event = await loop.run_in_executor(None, stream.get)
+                if event is None:
+                    break
+                yield event
+        finally:
+            await loop.run_in_executor(None, self._finish_event_stream, stream)
+        self._raise_stream_error()
+
+    def close(self) -> None:
+        """Stop the worker pool and release the result store, cache and incremental state."""
+        self.scheduler.close()
+        if self.result_store is not None:
+            self.result_store.close()
+        if self.verdict_cache is not None:
+            self.verdict_cache.close()
+        if self.crawl_state is not None:
+            self.crawl_state.close()
+
 
 def link_checker(url: str,
                  ignored_asset_paths: Optional[List[str]] = None,
@@ -1201,9 +2932,39 @@ def link_checker(url: str,
                  timeout: float = 10.0,
                  max_requests: Optional[int] = None,
                  max_depth: Optional[int] = None,
-                 max_threads: int = 10
-                 ) -> Tuple[Dict[str, Dict[str, int]],
-                            Dict[str, Dict[str, str]]]:
+                 max_threads: int = 10,
+                 host_failure_threshold: int = 3,
+                 host_cooldown: float = 60.0,
+                 max_external_threads: int = 5,
+                 max_connections_per_host: int = 2,
+                 external_cache: Optional[str] = None,
+                 external_cache_ttl: float = 7 * 24 * 3600.0,
+                 max_retries: int = 0,
+                 retry_backoff: float = 0.5,
+                 retry_backoff_max: float = 30.0,
+                 host_retry_budget: int = 10,
+                 adaptive_concurrency: bool = False,
+                 min_concurrency: int = 1,
+                 max_concurrency: int = 32,
+                 max_time: Optional[float] = None,
+                 max_time_split: Optional[Sequence[float]] = None,
+                 grace_period: float = 5.0,
+                 result_store: Optional[str] = None,
+                 incremental_state: Optional[str] = None,
+                 sitemap_url: Optional[str] = None,
+                 changed_paths: Optional[List[str]] = None,
+                 check_anchors: bool = False,
+                 respect_robots: bool = False,
+                 fail_fast: Optional[int] = None,
+                 suspect_links: Optional[Iterable[Tuple[str, str]]] = None,
+                 pages: Optional[List[str]] = None,
+                 max_url_length: Optional[int] = 2048,
+                 max_repeated_segments: Optional[int] = 3,
+                 max_query_variants: Optional[int] = 100,
+                 canonical_rules: Optional[Dict[str, Any]] = None,
+                 reuse_link_blocks: bool = True,
+                 max_in_flight: Optional[int] = None
+                 ) -> Tuple[MapRelation, MapRelation]:
     """Check links on a website and return the results.
 
     Args:
@@ -1215,6 +2976,56 @@ def link_checker(url: str,
         max_requests: Maximum number of requests to make (None for unlimited).
         max_depth: Maximum depth to crawl (None for unlimited).
         max_threads: Maximum number of concurrent threads for requests (default: 10).
+        host_failure_threshold: Number of consecutive connection failures or timeouts
+            after which an external host is short-circuited (0 to disable).
+        host_cooldown: Seconds to wait before probing a short-circuited host again.
+        max_external_threads: Maximum number of external URLs checked concurrently.
+        max_connections_per_host: Maximum number of concurrent requests to a single
+            external host (in adaptive concurrency mode, max_concurrency applies
+            instead).
+        external_cache: Path to an SQLite file caching external link verdicts between
+            runs (None to disable).
+        external_cache_ttl: Seconds after which a cached healthy verdict is re-verified.
+        max_retries: Maximum number of retries for a transient failure (0 to disable).
+        retry_backoff: Base delay in seconds for exponential backoff between retries.
+        retry_backoff_max: Maximum delay in seconds between retries.
+        host_retry_budget: Maximum number of retries made to a single host.
+        adaptive_concurrency: Adjust per-host concurrency from observed latency and errors.
+        min_concurrency: Minimum concurrent requests per host in adaptive mode.
+        max_concurrency: Maximum concurrent requests per host in adaptive mode.
+        max_time: Wall-clock time budget in seconds for the whole run (None for unlimited).
+        max_time_split: Optional proportions of the time budget for the crawl, asset and
+            external link phases.
+        grace_period: Seconds that in-flight requests are given to finish once a time
+            budget runs out.
+        result_store: Path to an SQLite file in which the results are stored instead
+            of in memory (None to keep them in memory). The returned relations can
+            no longer be read once the function returns; read the file instead.
+        incremental_state: Path to an SQLite file holding the link graph of the
+            previous run, for an incremental check (None to disable).
+        sitemap_url: URL of a sitemap whose lastmod dates tell which pages changed
+            (used with incremental_state).
+        changed_paths: Paths or URLs of the pages that changed (used with
+            incremental_state).
+        check_anchors: Check that links to fragments point to an existing anchor.
+        respect_robots: Skip the URLs that robots.txt disallows and keep to its
+            Crawl-delay.
+        fail_fast: Stop as soon as this many distinct broken URLs have been found
+            (None to check everything).
+        suspect_links: (page_url, url) pairs of links that were broken in a previous
+            run, checked first with fail_fast.
+        pages: URLs or paths of the only pages to fetch (None to crawl from the URL).
+        max_url_length: Longest URL of a page that is crawled (None or 0 for no limit).
+        max_repeated_segments: Number of back-to-back repetitions of path segments
+            that make a page a suspected crawl trap (None or 0 to disable).
+        max_query_variants: Maximum number of query strings crawled for one path
+            (None or 0 for no limit).
+        canonical_rules: Rules that rewrite URLs to one canonical spelling, as a dict
+            (None for the default rules).
+        reuse_link_blocks: Resolve the links of repeated header, nav and footer
+            blocks once instead of on every page.
+        max_in_flight: Maximum number of HTTP requests in flight at once (None for no
+            limit other than the number of threads).
 
     Returns:
         A tuple of (broken_links, internal_assets).
@@ -1222,5 +3033,39 @@ def link_checker(url: str,
     checker = LinkChecker(url, ignored_asset_paths, ignored_internal_paths,
                           ignored_external_links, timeout=timeout,
                           max_requests=max_requests, max_depth=max_depth,
-                          max_threads=max_threads)
-    return checker.run()
+                          max_threads=max_threads,
+                          host_failure_threshold=host_failure_threshold,
+                          host_cooldown=host_cooldown,
+                          max_external_threads=max_external_threads,
+                          max_connections_per_host=max_connections_per_host,
+                          external_cache=external_cache,
+                          external_cache_ttl=external_cache_ttl,
+                          max_retries=max_retries,
+                          retry_backoff=retry_backoff,
+                          retry_backoff_max=retry_backoff_max,
+                          host_retry_budget=host_retry_budget,
+                          adaptive_concurrency=adaptive_concurrency,
+                          min_concurrency=min_concurrency,
+                          max_concurrency=max_concurrency,
+                          max_time=max_time,
+                          max_time_split=max_time_split,
+                          grace_period=grace_period,
+                          result_store=result_store,
+                          incremental_state=incremental_state,
+                          sitemap_url=sitemap_url,
+                          changed_paths=changed_paths,
+                          check_anchors=check_anchors,
+                          respect_robots=respect_robots,
+                          fail_fast=fail_fast,
+                          suspect_links=suspect_links,
+                          pages=pages,
+                          max_url_length=max_url_length,
+                          max_repeated_segments=max_repeated_segments,
+                          max_query_variants=max_query_variants,
+                          canonical_rules=canonical_rules,
+                          reuse_link_blocks=reuse_link_blocks,
+                          max_in_flight=max_in_flight)
+    try:
+        return checker.run()
+    finally:
+        checker.close()
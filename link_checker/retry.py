@@ -0,0 +1,134 @@
+"""Retry policy for transient request failures."""
+
+import email.utils
+import random
+import threading
+import time
+from typing import Dict, Optional, Set, Tuple
+
+# HTTP status codes that indicate a transient condition worth retrying
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse the value of a Retry-After header.
+
+    Args:
+        value: The header value, either a number of seconds or an HTTP date.
+
+    Returns:
+        The number of seconds to wait, or None if the value is missing or invalid.
+    """
+    if not value or not isinstance(value, str):
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class RetryPolicy:
+    """Decide whether and when to retry a failed request.
+
+    Retries use exponential backoff with full jitter. A Retry-After header sent with a
+    429 or 503 response is honored as the minimum delay; if it asks for a longer wait
+    than ``backoff_max`` the request is not retried. Each host has a retry budget for
+    the whole run so that retries cannot swamp a struggling server.
+    """
+
+    def __init__(self,
+                 max_retries: int = 0,
+                 backoff: float = 0.5,
+                 backoff_max: float = 30.0,
+                 host_budget: int = 10):
+        """Initialize the retry policy.
+
+        Args:
+            max_retries: Maximum number of retries per request (0 to disable retries).
+            backoff: Base delay in seconds; the cap on the delay doubles with each
+                retry.
+            backoff_max: Maximum delay in seconds between attempts.
+            host_budget: Maximum number of retries made to a single host during the run.
+        """
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.host_budget = host_budget
+
+        self._lock = threading.Lock()
+        self._host_retries: Dict[str, int] = {}
+        self._exhausted_hosts: Set[str] = set()
+        # {url: (retries_made, final_status)} for every URL that was retried
+        self._retried: Dict[str, Tuple[int, int]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Whether retries are enabled."""
+        return self.max_retries > 0
+
+    def get_delay(self, host: str, attempt: int,
+                  retry_after: Optional[str] = None) -> Optional[float]:
+        """Reserve a retry for a host and compute how long to wait before it.
+
+        Args:
+            host: The host (netloc) the request was made to.
+            attempt: The number of retries already made for this request.
+            retry_after: The value of the response's Retry-After header, if any.
+
+        Returns:
+            The delay in seconds before retrying, or None if the request should not be
+            retried.
+        """
+        if attempt >= self.max_retries:
+            return None
+
+        delay = random.uniform(0, min(self.backoff_max, self.backoff * (2 ** attempt)))
+        requested = parse_retry_after(retry_after)
+        if requested is not None:
+            if requested > self.backoff_max:
+                return None
+            delay = max(delay, requested)
+
+        with self._lock:
+            used = self._host_retries.get(host, 0)
+            if used >= self.host_budget:
+                self._exhausted_hosts.add(host)
+                return None
+            self._host_retries[host] = used + 1
+
+        return delay
+
+    def record(self, url: str, retries: int, status_code: int) -> None:
+        """Record the outcome of a request that was retried.
+
+        Args:
+            url: The URL that was requested.
+            retries: The number of retries that were made.
+            status_code: The final HTTP status code, or 0 for a connection error.
+        """
+        if retries == 0:
+            return
+        with self._lock:
+            self._retried[url] = (retries, status_code)
+
+    def retried_requests(self) -> Dict[str, Tuple[int, int]]:
+        """Return the URLs that were retried.
+
+        Returns:
+            A dict of {url: (retries_made, final_status)}.
+        """
+        with self._lock:
+            return dict(self._retried)
+
+    def exhausted_hosts(self) -> Set[str]:
+        """Return the hosts whose retry budget ran out."""
+        with self._lock:
+            return set(self._exhausted_hosts)
@@ -0,0 +1,161 @@
+"""robots.txt rules and Crawl-delay pacing, cached per host."""
+
+import threading
+import time
+import urllib.parse
+import urllib.robotparser
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Fetches a robots.txt URL and returns (status_code, content), where status 0 means
+# that the request failed, or None if the request could not be made at all (e.g.
+# because the request limit was reached)
+RobotsFetcher = Callable[[str], Optional[Tuple[int, str]]]
+
+# Rules used when a host's robots.txt is missing or cannot be fetched
+ALLOW_ALL: List[str] = []
+DISALLOW_ALL = ['User-agent: *', 'Disallow: /']
+
+
+def _robots_key(url: str) -> Tuple[str, str]:
+    """Return the (scheme, netloc) whose robots.txt applies to a URL."""
+    parsed = urllib.parse.urlparse(url)
+    return parsed.scheme, parsed.netloc
+
+
+class RobotsCache:
+    """Parsed robots.txt rules of every host seen, each fetched only once.
+
+    Following RFC 9309, a robots.txt that does not exist (a 4xx status) allows
+    everything, while one that cannot be fetched because of a server error disallows
+    everything on the host. A host that cannot be reached at all is allowed, so that
+    the links to it are requested and reported as broken instead of being hidden.
+    Rules are fetched again once they are older than max_age, which RFC 9309 limits
+    to 24 hours, so that a resident checker sees changes to them.
+    """
+
+    def __init__(self, fetch: RobotsFetcher, user_agent: str, max_age: float = 24 * 3600.0):
+        """Initialize the cache.
+
+        Args:
+            fetch: Function that fetches a robots.txt URL.
+            user_agent: The User-Agent the rules are matched against.
+            max_age: Seconds after which a host's rules are fetched again.
+        """
+        self.fetch = fetch
+        self.user_agent = user_agent
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._host_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._parsers: Dict[Tuple[str, str], urllib.robotparser.RobotFileParser] = {}
+        self._fetched_at: Dict[Tuple[str, str], float] = {}
+
+    def clear(self) -> None:
+        """Forget all rules, so that they are fetched again."""
+        with self._lock:
+            self._host_locks = {}
+            self._parsers = {}
+            self._fetched_at = {}
+
+    def _fresh_parser(self, key: Tuple[str, str]) -> Optional[urllib.robotparser.RobotFileParser]:
+        """Return the cached rules of a host unless they are missing or too old."""
+        with self._lock:
+            parser = self._parsers.get(key)
+            if parser is None or time.monotonic() - self._fetched_at[key] >= self.max_age:
+                return None
+            return parser
+
+    def _parser(self, url: str) -> urllib.robotparser.RobotFileParser:
+        """Return the rules for a URL's host, fetching them on first use."""
+        key = _robots_key(url)
+        parser = self._fresh_parser(key)
+        if parser is not None:
+            return parser
+        with self._lock:
+            host_lock = self._host_locks.setdefault(key, threading.Lock())
+
+        # Only one thread fetches a host's robots.txt; the others wait for it
+        with host_lock:
+            parser = self._fresh_parser(key)
+            if parser is not None:
+                return parser
+
+            robots_url = urllib.parse.urlunparse((key[0], key[1], '/robots.txt', '', '', ''))
+            fetched = self.fetch(robots_url)
+            parser = urllib.robotparser.RobotFileParser(robots_url)
+            if fetched is None:
+                # Nothing is known about the host yet; try again next time
+                parser.parse(ALLOW_ALL)
+                return parser
+
+            status_code, content = fetched
+            if status_code == 200:
+                parser.parse(content.splitlines())
+            elif status_code == 0 or 400 <= status_code < 500:
+                parser.parse(ALLOW_ALL)
+            else:
+                parser.parse(DISALLOW_ALL)
+
+            with self._lock:
+                self._parsers[key] = parser
+                self._fetched_at[key] = time.monotonic()
+            return parser
+
+    def allowed(self, url: str) -> bool:
+        """Check whether the rules of the URL's host allow it to be requested.
+
+        Args:
+            url: The URL to check.
+
+        Returns:
+            True if the URL may be requested.
+        """
+        return self._parser(url).can_fetch(self.user_agent, url)
+
+    def request_interval(self, url: str) -> Optional[float]:
+        """Return the minimum interval between requests to a URL's host.
+
+        The interval is the host's Crawl-delay, or else the one implied by its
+        Request-rate. This never fetches a robots.txt, so it can be used while sending
+        any request.
+
+        Args:
+            url: The URL about to be requested.
+
+        Returns:
+            The interval in seconds, or None if the host's rules have not been fetched
+            or do not ask for one.
+        """
+        with self._lock:
+            parser = self._parsers.get(_robots_key(url))
+        if parser is None:
+            return None
+        delay = parser.crawl_delay(self.user_agent)
+        if delay is not None:
+            return float(delay)
+        rate = parser.request_rate(self.user_agent)
+        if rate is not None and rate.requests > 0:
+            return rate.seconds / rate.requests
+        return None
+
+
+class HostPacer:
+    """Spaces out the requests to each host by a minimum interval."""
+
+    def __init__(self) -> None:
+        """Initialize the pacer."""
+        self._lock = threading.Lock()
+        self._next_slot: Dict[str, float] = {}
+
+    def wait(self, host: str, interval: float) -> None:
+        """Wait for the host's next free slot and claim it.
+
+        Args:
+            host: The host about to be requested.
+            interval: Minimum number of seconds between two requests to the host.
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + interval
+        if slot > now:
+            time.sleep(slot - now)
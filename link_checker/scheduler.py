@@ -0,0 +1,110 @@
+"""Worker pool and request budget shared by all phases of a run."""
+
+import concurrent.futures
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+
+class RequestBudget:
+    """A global limit on the number of requests made during a run.
+
+    Requests are reserved before they are made, and the check and the reservation
+    happen under one lock, so concurrent workers can never exceed the limit.
+    """
+
+    def __init__(self, limit: Optional[int] = None):
+        """Initialize the budget.
+
+        Args:
+            limit: Maximum number of requests (None for unlimited).
+        """
+        self.limit = limit
+        self.used = 0
+        self.denied = 0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> bool:
+        """Reserve one request.
+
+        Returns:
+            True if the request may be made, False if the budget is used up.
+        """
+        with self._lock:
+            if self.limit is not None and self.used >= self.limit:
+                self.denied += 1
+                return False
+            self.used += 1
+            return True
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether no more requests may be made."""
+        return self.limit is not None and self.used >= self.limit
+
+    def reset(self) -> None:
+        """Make the whole budget available again, e.g. for another run."""
+        with self._lock:
+            self.used = 0
+            self.denied = 0
+
+
+class RequestScheduler:
+    """A long-lived worker pool with an optional global limit on requests in flight.
+
+    The crawl, asset and external link phases all submit their work to the same
+    pool, which is created on first use and kept until close() so that the threads
+    (and the keep-alive connections they use) stay warm across phases and runs.
+    Without a limit, up to ``max_workers`` requests can be in flight, one per worker.
+    With a ``max_in_flight`` below that, at most that many HTTP requests are in
+    flight at any time, however many tasks are running.
+    """
+
+    def __init__(self, max_workers: int, max_in_flight: Optional[int] = None):
+        """Initialize the scheduler.
+
+        Args:
+            max_workers: Number of worker threads in the pool.
+            max_in_flight: Maximum number of concurrent HTTP requests (None for no
+                limit other than the number of workers).
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_in_flight = None if max_in_flight is None else max(1, max_in_flight)
+        self._in_flight: Optional[threading.BoundedSemaphore] = None
+        if self.max_in_flight is not None and self.max_in_flight < self.max_workers:
+            self._in_flight = threading.BoundedSemaphore(self.max_in_flight)
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> concurrent.futures.Future:
+        """Run a function on the worker pool.
+
+        Args:
+            fn: The function to run.
+            *args: Arguments for the function.
+
+        Returns:
+            A future for the result.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix='link-checker')
+            executor = self._executor
+        return executor.submit(fn, *args)
+
+    @contextmanager
+    def in_flight(self) -> Iterator[None]:
+        """Hold one of the global in-flight request slots, if limited, while making a request."""
+        if self._in_flight is None:
+            yield
+            return
+        with self._in_flight:
+            yield
+
+    def close(self) -> None:
+        """Wait for submitted work to finish and stop the worker threads."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
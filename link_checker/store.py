@@ -0,0 +1,381 @@
+"""Storage for the relations between pages and the URLs found on them.
+
+The link checker keeps five relations: broken links, internal assets, ignored internal
+assets, external links and ignored external links. Each relates a page URL to target
+URLs, optionally with a value per target (a status code or an asset type).
+
+By default the relations are held in memory as ``PageMap`` (``{page: {target:
+value}}``) and ``PageSet`` (``{page: set(targets)}``) objects, which are plain
+``defaultdict`` subclasses. For very large crawls a ``ResultStore`` keeps them in an
+indexed SQLite file instead; its ``SQLiteRelation`` objects offer the same methods and
+behave as read-only mappings.
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from typing import (Any, DefaultDict, Dict, Iterable, Iterator, List, Mapping,
+                    Optional, Set, Tuple, Union)
+
+
+class PageMap(DefaultDict[str, Dict[str, Any]]):
+    """In-memory relation of {page_url: {target_url: value}}."""
+
+    def __init__(self) -> None:
+        super().__init__(dict)
+
+    def record(self, page: str, target: str, value: Any = None) -> None:
+        """Record that a page refers to a target."""
+        self[page][target] = value
+
+    def record_many(self, page: str, targets: Mapping[str, Any]) -> None:
+        """Record several targets found on the same page."""
+        self[page].update(targets)
+
+    def referrers(self, target: str) -> List[str]:
+        """Return the pages that refer to a target."""
+        return [page for page, targets in self.items() if target in targets]
+
+    def targets(self) -> Set[str]:
+        """Return the unique targets."""
+        return {target for targets in self.values() for target in targets}
+
+    def target_count(self) -> int:
+        """Return the number of unique targets."""
+        return len(self.targets())
+
+    def count(self) -> int:
+        """Return the number of (page, target) references."""
+        return sum(len(targets) for targets in self.values())
+
+    def sorted_items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Iterate over the (page, targets) entries in page order."""
+        for page in sorted(self):
+            yield page, self[page]
+
+    def iter_by_value(self) -> Iterator[Tuple[Any, List[Tuple[str, str]]]]:
+        """Iterate over (value, [(target, page), ...]) groups in value order."""
+        groups: Dict[Any, List[Tuple[str, str]]] = defaultdict(list)
+        for page, targets in self.items():
+            for target, value in targets.items():
+                groups[value].append((target, page))
+        for value in sorted(groups):
+            yield value, sorted(groups[value])
+
+
+class PageSet(DefaultDict[str, Set[str]]):
+    """In-memory relation of {page_url: set(target_urls)}."""
+
+    def __init__(self) -> None:
+        super().__init__(set)
+
+    def record(self, page: str, target: str, value: Any = None) -> None:
+        """Record that a page refers to a target."""
+        self[page].add(target)
+
+    def record_many(self, page: str, targets: Iterable[str]) -> None:
+        """Record several targets found on the same page."""
+        self[page].update(targets)
+
+    def referrers(self, target: str) -> List[str]:
+        """Return the pages that refer to a target."""
+        return [page for page, targets in self.items() if target in targets]
+
+    def targets(self) -> Set[str]:
+        """Return the unique targets."""
+        return {target for targets in self.values() for target in targets}
+
+    def target_count(self) -> int:
+        """Return the number of unique targets."""
+        return len(self.targets())
+
+    def count(self) -> int:
+        """Return the number of (page, target) references."""
+        return sum(len(targets) for targets in self.values())
+
+    def sorted_items(self) -> Iterator[Tuple[str, Set[str]]]:
+        """Iterate over the (page, targets) entries in page order."""
+        for page in sorted(self):
+            yield page, self[page]
+
+
+class SQLiteRelation(Mapping[str, Any]):
+    """A page relation stored in a table of a ResultStore.
+
+    Writes are queued to the store's writer thread. Reads first wait for queued
+    writes to be committed and then stream rows from the database, so iterating over
+    a relation does not load it into memory.
+    """
+
+    def __init__(self, store: 'ResultStore', table: str, has_value: bool):
+        self.store = store
+        self.table = table
+        self.has_value = has_value
+
+    def record(self, page: str, target: str, value: Any = None) -> None:
+        """Record that a page refers to a target."""
+        self.store.put(self.table, [(page, target, value)])
+
+    def record_many(self, page: str, targets: Union[Mapping[str, Any], Iterable[str]]) -> None:
+        """Record several targets found on the same page."""
+        if isinstance(targets, Mapping):
+            rows = [(page, target, value) for target, value in targets.items()]
+        else:
+            rows = [(page, target, None) for target in targets]
+        if rows:
+            self.store.put(self.table, rows)
+
+    def __setitem__(self, page: str, targets: Union[Mapping[str, Any], Iterable[str]]) -> None:
+        self.record_many(page, targets)
+
+    def _collect(self, rows: Iterable[Tuple[str, Any]]) -> Union[Dict[str, Any], Set[str]]:
+        """Turn (target, value) rows into a dict or a set."""
+        if self.has_value:
+            return {target: value for target, value in rows}
+        return {target for target, _ in rows}
+
+    def __getitem__(self, page: str) -> Union[Dict[str, Any], Set[str]]:
+        rows = list(self.store.query(
+            f'SELECT target, value FROM {self.table} WHERE page = ? ORDER BY target',
+            (page,)))
+        if not rows:
+            raise KeyError(page)
+        return self._collect(rows)
+
+    def __iter__(self) -> Iterator[str]:
+        for (page,) in self.store.query(
+                f'SELECT DISTINCT page FROM {self.table} ORDER BY page'):
+            yield page
+
+    def __len__(self) -> int:
+        for (count,) in self.store.query(f'SELECT COUNT(DISTINCT page) FROM {self.table}'):
+            return int(count)
+        return 0
+
+    def items(self) -> Iterator[Tuple[str, Any]]:  # type: ignore[override]
+        """Stream the (page, targets) entries in page order."""
+        current_page: Optional[str] = None
+        current_rows: List[Tuple[str, Any]] = []
+        for page, target, value in self.store.query(
+                f'SELECT page, target, value FROM {self.table} ORDER BY page, target'):
+            if page != current_page:
+                if current_page is not None:
+                    yield current_page, self._collect(current_rows)
+                current_page = page
+                current_rows = []
+            current_rows.append((target, value))
+        if current_page is not None:
+            yield current_page, self._collect(current_rows)
+
+    def values(self) -> Iterator[Any]:  # type: ignore[override]
+        """Stream the targets of each page in page order."""
+        for _, targets in self.items():
+            yield targets
+
+    sorted_items = items
+
+    def referrers(self, target: str) -> List[str]:
+        """Return the pages that refer to a target, using the target index."""
+        return [page for (page,) in self.store.query(
+            f'SELECT page FROM {self.table} WHERE target = ?', (target,))]
+
+    def targets(self) -> Set[str]:
+        """Return the unique targets."""
+        return {target for (target,) in self.store.query(
+            f'SELECT DISTINCT target FROM {self.table}')}
+
+    def target_count(self) -> int:
+        """Return the number of unique targets."""
+        for (count,) in self.store.query(f'SELECT COUNT(DISTINCT target) FROM {self.table}'):
+            return int(count)
+        return 0
+
+    def count(self) -> int:
+        """Return the number of (page, target) references."""
+        for (count,) in self.store.query(f'SELECT COUNT(*) FROM {self.table}'):
+            return int(count)
+        return 0
+
+    def iter_by_value(self) -> Iterator[Tuple[Any, List[Tuple[str, str]]]]:
+        """Stream (value, [(target, page), ...]) groups in value order."""
+        current_value: Any = None
+        group: List[Tuple[str, str]] = []
+        for value, target, page in self.store.query(
+                f'SELECT value, target, page FROM {self.table} '
+                'ORDER BY value, target, page'):
+            if group and value != current_value:
+                yield current_value, group
+                group = []
+            current_value = value
+            group.append((target, page))
+        if group:
+            yield current_value, group
+
+
+# Relations of {page: {target: value}} and {page: set(targets)}, in memory or stored
+MapRelation = Union[PageMap, SQLiteRelation]
+SetRelation = Union[PageSet, SQLiteRelation]
+
+
+class ResultStore:
+    """SQLite file holding the link checker's result relations.
+
+    All writes go through a queue to a single writer thread, which commits them in
+    batched transactions. The file is left in place when the run finishes so that it
+    can be queried later; its tables are ``broken_links``, ``internal_assets``,
+    ``ignored_internal_assets``, ``external_links``, ``ignored_external_links`` and
+    ``broken_anchors``, each with ``page``, ``target`` and ``value`` columns, plus a
+    ``run_info`` key/value table.
+    """
+
+    # Relation name: whether targets carry a value
+    TABLES = {
+        'broken_links': True,
+        'internal_assets': True,
+        'ignored_internal_assets': True,
+        'external_links': False,
+        'ignored_external_links': False,
+        'broken_anchors': False,
+    }
+
+    def __init__(self, path: str, batch_size: int = 1000, max_pending: int = 10000):
+        """Create the store, clearing the results of any previous run in the file.
+
+        Args:
+            path: Path to the SQLite file.
+            batch_size: Maximum number of queued writes committed in one transaction.
+            max_pending: Maximum number of queued writes; producers block when the
+                writer falls this far behind, which keeps memory use bounded.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._writer_error: Optional[BaseException] = None
+        self._closed = False
+
+        conn = sqlite3.connect(path)
+        conn.execute('PRAGMA journal_mode=WAL')
+        with conn:
+            for table in self.TABLES:
+                conn.execute(f'CREATE TABLE IF NOT EXISTS {table} ('
+                             'page TEXT NOT NULL, target TEXT NOT NULL, value, '
+                             'PRIMARY KEY (page, target)) WITHOUT ROWID')
+                conn.execute(f'CREATE INDEX IF NOT EXISTS {table}_target '
+                             f'ON {table} (target)')
+                conn.execute(f'DELETE FROM {table}')
+            conn.execute('CREATE TABLE IF NOT EXISTS run_info ('
+                         'key TEXT PRIMARY KEY, value TEXT)')
+            conn.execute('DELETE FROM run_info')
+        conn.close()
+
+        self._read_lock = threading.Lock()
+        self._reader = sqlite3.connect(path, check_same_thread=False)
+
+        self._writer = threading.Thread(target=self._write_loop, daemon=True,
+                                        name='link-checker-store')
+        self._writer.start()
+
+    def relation(self, table: str) -> SQLiteRelation:
+        """Return the relation stored in a table."""
+        return SQLiteRelation(self, table, self.TABLES[table])
+
+    def set_info(self, key: str, value: str) -> None:
+        """Record a piece of information about the run, e.g. the root URL."""
+        self._queue.put(('run_info', [(key, value)]))
+
+    def put(self, table: str, rows: List[Tuple[str, str, Any]]) -> None:
+        """Queue rows to be written to a table."""
+        if self._writer_error is not None:
+            raise RuntimeError(f"Result store writer failed: {self._writer_error}")
+        self._queue.put((table, rows))
+
+    def flush(self) -> None:
+        """Wait until all queued writes have been committed."""
+        if self._closed:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+        if self._writer_error is not None:
+            raise RuntimeError(f"Result store writer failed: {self._writer_error}")
+
+    def query(self, sql: str, params: Tuple[Any, ...] = ()) -> Iterator[Tuple[Any, ...]]:
+        """Run a query after flushing queued writes, streaming the rows.
+
+        Args:
+            sql: The SELECT statement.
+            params: Parameters for the statement.
+
+        Yields:
+            The result rows.
+        """
+        self.flush()
+        with self._read_lock:
+            cursor = self._reader.execute(sql, params)
+        while True:
+            with self._read_lock:
+                rows = cursor.fetchmany(500)
+            if not rows:
+                return
+            yield from rows
+
+    def clear(self) -> None:
+        """Delete all stored results, e.g. before the store is reused for another run."""
+        self.flush()
+        conn = sqlite3.connect(self.path, timeout=30.0)
+        with conn:
+            for table in self.TABLES:
+                conn.execute(f'DELETE FROM {table}')
+            conn.execute('DELETE FROM run_info')
+        conn.close()
+
+    def close(self) -> None:
+        """Commit all queued writes and stop the writer thread; the file is kept."""
+        if self._closed:
+            return
+        self.set_info('closed_at', str(time.time()))
+        self.flush()
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+        with self._read_lock:
+            self._reader.close()
+
+    def _write_loop(self) -> None:
+        """Commit queued writes in batches until close() is called."""
+        conn = sqlite3.connect(self.path)
+        statements = {table: f'INSERT OR REPLACE INTO {table} (page, target, value) '
+                             'VALUES (?, ?, ?)'
+                      for table in self.TABLES}
+        statements['run_info'] = 'INSERT OR REPLACE INTO run_info (key, value) VALUES (?, ?)'
+
+        running = True
+        while running:
+            items = [self._queue.get()]
+            while len(items) < self.batch_size:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            flushes = []
+            try:
+                with conn:
+                    for item in items:
+                        if item is None:
+                            running = False
+                        elif isinstance(item, threading.Event):
+                            flushes.append(item)
+                        elif self._writer_error is None:
+                            table, rows = item
+                            conn.executemany(statements[table], rows)
+            except sqlite3.Error as e:
+                self._writer_error = e
+
+            # Writes queued before a flush request have now been committed
+            for done in flushes:
+                done.set()
+
+        conn.close()
@@ -0,0 +1,132 @@
+"""Reuse of the resolved links of boilerplate blocks repeated on every page."""
+
+import hashlib
+import threading
+import urllib.parse
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from bs4 import BeautifulSoup, Tag
+
+# Elements whose links are usually the same on every page of a site
+BLOCK_TAGS = ('header', 'nav', 'footer')
+
+# A resolved link of a block: (kind, absolute URL, asset type or fragment). The kinds
+# are 'link', 'asset', 'ignored_asset', 'external', 'ignored_external' and 'fragment';
+# the URL of a fragment is None when it is on the page itself.
+BlockEntry = Tuple[str, Optional[str], str]
+
+
+def find_blocks(soup: BeautifulSoup) -> List[Tag]:
+    """Find the outermost header, nav and footer elements of a page.
+
+    Args:
+        soup: The parsed page.
+
+    Returns:
+        The elements, in document order.
+    """
+    return [tag for tag in soup.find_all(BLOCK_TAGS)
+            if isinstance(tag, Tag) and tag.find_parent(BLOCK_TAGS) is None]
+
+
+def resolution_context(url: str, hrefs: Sequence[str]) -> str:
+    """Return the part of a page URL that the resolution of some hrefs depends on.
+
+    Blocks with the same hrefs resolve to the same links on all pages that share this
+    context: the host for absolute and root-relative hrefs, and the directory for
+    page-relative ones. Hrefs that resolve to the page itself tie the block to it.
+
+    Args:
+        url: The URL of the page.
+        hrefs: The hrefs of the block.
+
+    Returns:
+        The context.
+    """
+    parsed = urllib.parse.urlparse(url)
+    host = f"{parsed.scheme}://{parsed.netloc}"
+    relative = [href for href in hrefs
+                if '://' not in href and not href.startswith(('/', '#', 'javascript:', 'mailto:'))]
+    if not relative:
+        return host
+    if parsed.query or parsed.params or any(not href or href.startswith('?')
+                                            for href in relative):
+        return url
+    if url.endswith('/'):
+        return host + parsed.path
+    directory, _, last_segment = parsed.path.rpartition('/')
+    if '.' in last_segment:
+        return f"{host}{directory}/"
+    return f"{host}{parsed.path}/"
+
+
+class LinkBlockCache:
+    """Remembers the resolved links of boilerplate blocks, keyed by a fingerprint.
+
+    A block is fingerprinted by hashing the sequence of its hrefs together with the
+    resolution context of the page, so pages that share a header, nav or footer
+    resolve and categorize its links only once.
+    """
+
+    def __init__(self, max_blocks: int = 1000):
+        """Initialize the cache.
+
+        Args:
+            max_blocks: Maximum number of distinct blocks remembered.
+        """
+        self.max_blocks = max_blocks
+        self._lock = threading.Lock()
+        self._blocks: Dict[str, List[BlockEntry]] = {}
+        self.blocks_reused = 0
+        self.links_reused = 0
+
+    @staticmethod
+    def fingerprint(hrefs: Sequence[str], context: str) -> str:
+        """Fingerprint a block.
+
+        Args:
+            hrefs: The hrefs of the block's links, in document order.
+            context: The resolution context of the page (see resolution_context()).
+
+        Returns:
+            The fingerprint.
+        """
+        digest = hashlib.sha1(context.encode('utf-8', 'surrogatepass'))
+        for href in hrefs:
+            digest.update(b'\0' + href.encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    def get(self, fingerprint: str, link_count: int) -> Optional[List[BlockEntry]]:
+        """Return the resolved links of a block seen before.
+
+        Args:
+            fingerprint: The block's fingerprint.
+            link_count: Number of links in the block, for the statistics.
+
+        Returns:
+            The resolved links, or None if the block has not been seen.
+        """
+        with self._lock:
+            entries = self._blocks.get(fingerprint)
+            if entries is not None:
+                self.blocks_reused += 1
+                self.links_reused += link_count
+            return entries
+
+    def put(self, fingerprint: str, entries: List[BlockEntry]) -> None:
+        """Remember the resolved links of a block.
+
+        Args:
+            fingerprint: The block's fingerprint.
+            entries: The resolved links.
+        """
+        with self._lock:
+            if len(self._blocks) < self.max_blocks:
+                self._blocks[fingerprint] = entries
+
+    def clear(self) -> None:
+        """Forget the blocks, e.g. for another run."""
+        with self._lock:
+            self._blocks = {}
+            self.blocks_reused = 0
+            self.links_reused = 0
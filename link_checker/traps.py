@@ -0,0 +1,107 @@
+"""Heuristics that keep crawl traps from flooding the crawl frontier."""
+
+import threading
+import urllib.parse
+from typing import Dict, List, Optional, Set, Tuple
+
+
+def repeated_segments(path: str, repeats: int) -> Optional[str]:
+    """Find a run of path segments repeated back to back, e.g. /a/b/a/b/a/b.
+
+    Args:
+        path: The URL path.
+        repeats: Number of consecutive repetitions that count as a trap.
+
+    Returns:
+        The repeated segments joined with '/', or None if no run repeats that often.
+    """
+    segments = [segment for segment in path.split('/') if segment]
+    for length in range(1, len(segments) // repeats + 1):
+        for start in range(len(segments) - length * repeats + 1):
+            block = segments[start:start + length]
+            if all(segments[start + length * i:start + length * (i + 1)] == block
+                   for i in range(1, repeats)):
+                return '/'.join(block)
+    return None
+
+
+class TrapDetector:
+    """Decides whether a URL found while crawling is likely part of a crawl trap.
+
+    Three cheap checks are made before a URL is added to the crawl queue: its
+    length, whether its path repeats the same segments back to back (as relative
+    links on generated pages do), and how many distinct query strings have been seen
+    for its path. Only the query strings up to the limit are remembered per path.
+    """
+
+    def __init__(self,
+                 max_url_length: Optional[int] = 2048,
+                 max_repeated_segments: Optional[int] = 3,
+                 max_query_variants: Optional[int] = 100):
+        """Initialize the detector.
+
+        Args:
+            max_url_length: Maximum length of a URL (None or 0 for no limit).
+            max_repeated_segments: Number of back-to-back repetitions of the same
+                path segments that marks a trap (None or 0 to disable).
+            max_query_variants: Maximum number of distinct query strings crawled for
+                a path (None or 0 for no limit).
+        """
+        self.max_url_length = max_url_length or None
+        self.max_repeated_segments = max_repeated_segments or None
+        self.max_query_variants = max_query_variants or None
+        self._lock = threading.Lock()
+        self._query_variants: Dict[Tuple[str, str, str], Set[str]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any of the checks is enabled."""
+        return bool(self.max_url_length or self.max_repeated_segments or
+                    self.max_query_variants)
+
+    def limits(self) -> List[str]:
+        """Describe the enabled limits, for the report."""
+        limits = []
+        if self.max_url_length:
+            limits.append(f"URL length {self.max_url_length}")
+        if self.max_repeated_segments:
+            limits.append(f"{self.max_repeated_segments} repeated path segments")
+        if self.max_query_variants:
+            limits.append(f"{self.max_query_variants} query variants per path")
+        return limits
+
+    def clear(self) -> None:
+        """Forget the query strings seen, e.g. for another run."""
+        with self._lock:
+            self._query_variants = {}
+
+    def check(self, url: str) -> Optional[str]:
+        """Check a URL before it is crawled.
+
+        A URL that passes counts towards the query variants of its path.
+
+        Args:
+            url: The URL to check.
+
+        Returns:
+            Why the URL looks like a trap, or None if it may be crawled.
+        """
+        if self.max_url_length and len(url) > self.max_url_length:
+            return f"URL longer than {self.max_url_length} characters"
+
+        parsed = urllib.parse.urlparse(url)
+        if self.max_repeated_segments:
+            block = repeated_segments(parsed.path, self.max_repeated_segments)
+            if block is not None:
+                return f"path repeats '{block}' {self.max_repeated_segments} times"
+
+        if self.max_query_variants and parsed.query:
+            key = (parsed.scheme, parsed.netloc, parsed.path)
+            with self._lock:
+                variants = self._query_variants.setdefault(key, set())
+                if parsed.query not in variants:
+                    if len(variants) >= self.max_query_variants:
+                        return (f"more than {self.max_query_variants} query variants of "
+                                f"{parsed.path or '/'}")
+                    variants.add(parsed.query)
+        return None
@@ -0,0 +1,103 @@
+"""Persistent cache of external link verdicts shared between runs."""
+
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Tuple
+
+
+class ExternalVerdictCache:
+    """Cache of external URL check results stored in an SQLite file.
+
+    Each verdict records the status code, the final URL after redirects, and when
+    the URL was checked. Healthy verdicts (status codes below 400) are reused until
+    they are older than the TTL; failing verdicts are never reused, so broken links
+    are always re-checked.
+
+    The database is opened in write-ahead-log mode, which lets several link checker
+    processes read the cache concurrently while one of them writes to it. Writes are
+    buffered and committed in batches.
+    """
+
+    def __init__(self, path: str, ttl: float, batch_size: int = 500):
+        """Open (and create if necessary) a verdict cache.
+
+        Args:
+            path: Path to the SQLite file.
+            ttl: Number of seconds a healthy verdict stays valid.
+            batch_size: Number of verdicts to buffer before committing them.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.batch_size = batch_size
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[str, int, str, float]] = []
+        self._conn = sqlite3.connect(path, timeout=30.0, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS verdicts ('
+                           'url TEXT PRIMARY KEY, '
+                           'status_code INTEGER NOT NULL, '
+                           'final_url TEXT NOT NULL, '
+                           'checked_at REAL NOT NULL)')
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[Tuple[int, str, float]]:
+        """Look up a reusable verdict for a URL.
+
+        Args:
+            url: The external URL.
+
+        Returns:
+            A tuple of (status_code, final_url, checked_at) if a healthy verdict newer
+            than the TTL exists, otherwise None.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT status_code, final_url, checked_at FROM verdicts WHERE url = ?',
+                (url,)).fetchone()
+
+            if (row is None or row[0] == 0 or row[0] >= 400 or
+                    time.time() - row[2] >= self.ttl):
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return row[0], row[1], row[2]
+
+    def put(self, url: str, status_code: int, final_url: str) -> None:
+        """Record the verdict of a check that was just made.
+
+        Args:
+            url: The external URL.
+            status_code: The HTTP status code, or 0 for a connection error.
+            final_url: The URL after following redirects.
+        """
+        with self._lock:
+            self._pending.append((url, status_code, final_url, time.time()))
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        """Commit any buffered verdicts."""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        """Commit any buffered verdicts and close the database."""
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
+
+    def _flush_locked(self) -> None:
+        """Commit buffered verdicts; the caller must hold the lock."""
+        if not self._pending:
+            return
+        with self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO verdicts (url, status_code, final_url, checked_at) '
+                'VALUES (?, ?, ?, ?)', self._pending)
+        self._pending = []
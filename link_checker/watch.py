@@ -0,0 +1,266 @@
+"""Continuous monitoring that re-checks pages and links on an adaptive schedule."""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set, Tuple, Union
+
+from link_checker.events import (ContentChanged, Event, LinkAdded, LinkRemoved, StatusChanged,
+                                 TargetSkipped)
+from link_checker.incremental import content_hash
+
+if TYPE_CHECKING:
+    from link_checker.main import LinkChecker
+
+logger = logging.getLogger(__name__)
+
+
+class WatchedTarget:
+    """A page or link of the watched site, with what was seen when it was last checked."""
+
+    __slots__ = ('url', 'is_page', 'status', 'content_hash', 'links', 'referrers',
+                 'interval', 'due', 'checks', 'changes', 'skipped')
+
+    def __init__(self, url: str, is_page: bool, interval: float, due: float):
+        """Initialize a target that has not been checked yet.
+
+        Args:
+            url: The URL.
+            is_page: Whether the target is a page whose links are followed.
+            interval: Seconds between checks.
+            due: When the target is checked next, in time.monotonic() seconds.
+        """
+        self.url = url
+        self.is_page = is_page
+        self.status: Optional[int] = None
+        self.content_hash: Optional[str] = None
+        # URLs the page links to (None until its content has been parsed)
+        self.links: Optional[Set[str]] = None
+        # Pages that link to the target
+        self.referrers: Set[str] = set()
+        self.interval = interval
+        self.due = due
+        self.checks = 0
+        self.changes = 0
+        # Whether robots.txt disallowed the target when it was last due
+        self.skipped = False
+
+
+class Watcher:
+    """Keeps the link graph of a site in memory and re-checks it continuously.
+
+    Each page and link is re-checked on its own schedule: its interval is halved
+    (down to min_interval) when its status or content changed since the previous
+    check, and doubled (up to max_interval) when it did not, so stable targets are
+    requested rarely and volatile ones often. Requests are made one at a time and
+    spread out so that they never exceed requests_per_second, which keeps the load on
+    the origin even instead of arriving as one nightly spike.
+
+    Only changes are reported: StatusChanged, ContentChanged, LinkAdded and
+    LinkRemoved events. Targets that are broken the first time they are checked are
+    reported with a StatusChanged event whose previous status is None. Targets that
+    robots.txt disallows are not requested; they are reported once with a
+    TargetSkipped event and looked at again only every max_interval.
+    """
+
+    def __init__(self,
+                 checker: 'LinkChecker',
+                 requests_per_second: float = 1.0,
+                 min_interval: float = 600.0,
+                 max_interval: float = 86400.0,
+                 on_event: Optional[Callable[[Event], None]] = None):
+        """Initialize the watcher with the root URL (or listed pages) of a checker.
+
+        Args:
+            checker: The checker whose session, retry policy and link extraction are
+                used. Its root URL, or its listed pages, are where the graph starts.
+            requests_per_second: Maximum average rate of requests.
+            min_interval: Shortest time in seconds between two checks of a target.
+            max_interval: Longest time in seconds between two checks of a target.
+            on_event: Called with each change.
+
+        Raises:
+            ValueError: If the rate or the intervals are not positive, or if
+                min_interval is larger than max_interval.
+        """
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive")
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("the intervals must be positive, the minimum no larger than "
+                             "the maximum")
+        self.checker = checker
+        self.requests_per_second = requests_per_second
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.on_event = on_event
+
+        self.targets: Dict[str, WatchedTarget] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._sequence = itertools.count()
+        self._stopped = threading.Event()
+        self.checks = 0
+
+        now = time.monotonic()
+        self.roots = (list(checker.target_pages) if checker.target_pages is not None
+                      else [checker.root_url])
+        for url in self.roots:
+            self._add(url, True, now)
+
+    def _emit(self, event: Event) -> None:
+        if self.on_event is not None:
+            self.on_event(event)
+
+    def _add(self, url: str, is_page: bool, now: float) -> WatchedTarget:
+        """Add a target to the graph, due right away, unless it is already in it."""
+        target = self.targets.get(url)
+        if target is None:
+            target = WatchedTarget(url, is_page, self.min_interval, now)
+            self.targets[url] = target
+            self._schedule(target, now)
+        return target
+
+    def _forget(self, url: str) -> None:
+        """Remove a target that nothing links to any more, and what only it linked to."""
+        orphans = [url]
+        while orphans:
+            target = self.targets.pop(orphans.pop(), None)
+            if target is None:
+                continue
+            for link in target.links or ():
+                linked = self.targets.get(link)
+                if linked is not None:
+                    linked.referrers.discard(target.url)
+                    if not linked.referrers and link not in self.roots:
+                        orphans.append(link)
+
+    def _schedule(self, target: WatchedTarget, due: float) -> None:
+        target.due = due
+        heapq.heappush(self._heap, (due, next(self._sequence), target.url))
+
+    def next_due(self) -> Optional[float]:
+        """Return when the next check is due, in time.monotonic() seconds.
+
+        Returns:
+            The time, or None if nothing is watched.
+        """
+        while self._heap:
+            due, _, url = self._heap[0]
+            target = self.targets.get(url)
+            if target is not None and target.due == due:
+                return due
+            # The target was rescheduled or forgotten
+            heapq.heappop(self._heap)
+        return None
+
+    def check_next(self, now: float) -> Optional[int]:
+        """Check the target that is due first, if it is due.
+
+        Args:
+            now: The current time, in time.monotonic() seconds.
+
+        Returns:
+            The number of requests made, or None if no target is due.
+        """
+        due = self.next_due()
+        if due is None or due > now:
+            return None
+        _, _, url = heapq.heappop(self._heap)
+        return self._check(self.targets[url], now)
+
+    def _check(self, target: WatchedTarget, now: float) -> int:
+        """Check a target, report what changed and schedule its next check."""
+        requests_before = self.checker.request_count
+        status_code, html = self.checker.probe(target.url, read_page=target.is_page)
+        requests = self.checker.request_count - requests_before
+        if status_code is None:
+            if target.url not in self.checker.robots_skipped:
+                # The request budget is used up
+                self.stop()
+                return requests
+            if not target.skipped:
+                self._emit(TargetSkipped(target.url))
+                target.skipped = True
+            self._schedule(target, now + self.max_interval)
+            return requests
+        target.skipped = False
+
+        changed = False
+        if status_code != target.status:
+            if target.status is not None or not 0 < status_code < 400:
+                self._emit(StatusChanged(target.url, target.status, status_code))
+            changed = target.status is not None
+            target.status = status_code
+
+        if html is not None:
+            digest = content_hash(html)
+            if digest != target.content_hash:
+                if target.content_hash is not None:
+                    self._emit(ContentChanged(target.url))
+                    changed = True
+                target.content_hash = digest
+                self._update_links(target, html, now)
+
+        target.checks += 1
+        self.checks += 1
+        if changed:
+            target.changes += 1
+            target.interval = max(self.min_interval, target.interval / 2)
+        elif target.checks > 1:
+            target.interval = min(self.max_interval, target.interval * 2)
+        self._schedule(target, now + target.interval)
+        return requests
+
+    def _update_links(self, page: WatchedTarget, html: Union[str, bytes], now: float) -> None:
+        """Update the graph with the links of a page whose content changed."""
+        pages, links = self.checker.page_targets(page.url, html)
+        current = dict.fromkeys(links, False)
+        current.update(dict.fromkeys(pages, True))
+        previous = page.links
+
+        for url, is_page in current.items():
+            if previous is not None and url not in previous:
+                self._emit(LinkAdded(page.url, url))
+            if url != page.url:
+                self._add(url, is_page, now).referrers.add(page.url)
+
+        for url in (previous or set()) - set(current):
+            self._emit(LinkRemoved(page.url, url))
+            target = self.targets.get(url)
+            if target is not None:
+                target.referrers.discard(page.url)
+                if not target.referrers and url not in self.roots:
+                    self._forget(url)
+
+        page.links = set(current)
+
+    def run(self, max_checks: Optional[int] = None) -> None:
+        """Check the targets as they fall due until stopped.
+
+        Args:
+            max_checks: Return after this many checks (None to run until stop() is
+                called or the checker's request budget is used up).
+        """
+        checks = 0
+        next_slot = time.monotonic()
+        while not self._stopped.is_set():
+            now = time.monotonic()
+            due = self.next_due()
+            if due is None:
+                break
+            delay = max(due, next_slot) - now
+            if delay > 0:
+                self._stopped.wait(delay)
+                continue
+
+            requests = self.check_next(now) or 0
+            # Pace the requests to the budget, evening out bursts of due targets
+            next_slot = max(next_slot, now) + requests / self.requests_per_second
+            checks += 1
+            if max_checks is not None and checks >= max_checks:
+                break
+
+    def stop(self) -> None:
+        """Stop run(), e.g. from another thread."""
+        self._stopped.set()
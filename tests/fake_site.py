@@ -0,0 +1,99 @@
+"""A fake website that the tests serve to LinkChecker instead of the network."""
+
+import unittest
+from contextlib import ExitStack
+from typing import Dict, List, Optional, Tuple
+from unittest.mock import patch, MagicMock
+
+
+class FakeSite:
+    """Serves HTML pages and status codes to patched requests.Session methods.
+
+    A GET request for a page is answered with its HTML and a 200 status. Other URLs
+    are answered with their entry in status, or else with a 404 to GET and a 200 to
+    HEAD. Every request is recorded as a (method, url) pair. Subclasses can override
+    page() to generate pages, e.g. for sites without end.
+    """
+
+    def __init__(self, pages: Optional[Dict[str, str]] = None,
+                 status: Optional[Dict[str, int]] = None, etags: bool = False):
+        """Initialize the site.
+
+        Args:
+            pages: HTML of the pages by URL.
+            status: Status codes of other URLs.
+            etags: Serve pages with ETag validators and answer a matching
+                If-None-Match header with a 304.
+        """
+        self.pages = dict(pages or {})
+        self.status = dict(status or {})
+        self.etags = etags
+        self.requests: List[Tuple[str, str]] = []
+
+    @property
+    def urls(self) -> List[str]:
+        """URLs requested with any method, in order."""
+        return [url for _, url in self.requests]
+
+    @property
+    def get_urls(self) -> List[str]:
+        """URLs requested with GET, in order."""
+        return [url for method, url in self.requests if method == 'get']
+
+    @property
+    def head_urls(self) -> List[str]:
+        """URLs requested with HEAD, in order."""
+        return [url for method, url in self.requests if method == 'head']
+
+    def page(self, url: str) -> Optional[str]:
+        """Return the HTML of the page at a URL, or None if it is not a page."""
+        return self.pages.get(url)
+
+    def get(self, url: str, **kwargs) -> MagicMock:
+        self.requests.append(('get', url))
+        response = MagicMock()
+        response.url = url
+        content = self.page(url)
+        if content is None:
+            response.status_code = self.status.get(url, 404)
+            response.headers = {}
+            return response
+        response.status_code = 200
+        response.headers = {'Content-Type': 'text/html'}
+        if self.etags:
+            etag = f'"{hash(content)}"'
+            if kwargs.get('headers', {}).get('If-None-Match') == etag:
+                response.status_code = 304
+                response.headers = {'ETag': etag}
+                return response
+            response.headers['ETag'] = etag
+        response.content = content.encode()
+        response.text = content
+        return response
+
+    def head(self, url: str, **kwargs) -> MagicMock:
+        self.requests.append(('head', url))
+        response = MagicMock()
+        response.url = url
+        response.status_code = self.status.get(url, 200)
+        return response
+
+    def serve(self) -> ExitStack:
+        """Patch requests.Session and time.sleep so that requests go to the site.
+
+        Returns:
+            A context manager that removes the patches when it exits.
+        """
+        stack = ExitStack()
+        stack.enter_context(patch('requests.Session.get', side_effect=self.get))
+        stack.enter_context(patch('requests.Session.head', side_effect=self.head))
+        stack.enter_context(patch('time.sleep'))
+        return stack
+
+    def serve_during(self, test: unittest.TestCase) -> None:
+        """Serve the site until a test case is cleaned up.
+
+        Args:
+            test: The test case, usually from its setUp().
+        """
+        test.addCleanup(self.serve().close)
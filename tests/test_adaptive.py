@@ -0,0 +1,165 @@
+"""Tests for adaptive per-host concurrency control."""
+
+import contextlib
+import threading
+import unittest
+from unittest.mock import patch, MagicMock
+
+import requests
+
+from link_checker.adaptive import (AdaptiveConcurrencyLimiter, OUTCOME_ERROR,
+                                   OUTCOME_OK, OUTCOME_THROTTLED)
+from link_checker.main import LinkChecker
+
+
+class TestAdaptiveConcurrencyLimiter(unittest.TestCase):
+    """Tests for the AdaptiveConcurrencyLimiter class."""
+
+    def complete(self, limiter, host, outcome=OUTCOME_OK):
+        """Run one request through the limiter."""
+        started = limiter.acquire(host)
+        limiter.release(host, started, outcome)
+
+    def test_increase_and_decrease(self):
+        """Test additive increase and multiplicative decrease within the bounds."""
+        limiter = AdaptiveConcurrencyLimiter(min_concurrency=2, max_concurrency=8)
+
+        # Slow start: one more per successful request, up to the maximum
+        for _ in range(10):
+            self.complete(limiter, "a.org")
+        self.assertEqual(limiter.summary()["a.org"][0], 8)
+
+        # A 429 halves the limit
+        self.complete(limiter, "a.org", OUTCOME_THROTTLED)
+        self.assertEqual(limiter.summary()["a.org"][0], 4)
+
+        # After slow start, growth is one per window of successful requests
+        for _ in range(4):
+            self.complete(limiter, "a.org")
+        self.assertEqual(limiter.summary()["a.org"][0], 4)
+        for _ in range(2):
+            self.complete(limiter, "a.org")
+        self.assertEqual(limiter.summary()["a.org"][0], 5)
+
+        # Errors never push the limit below the minimum
+        for _ in range(5):
+            self.complete(limiter, "a.org", OUTCOME_ERROR)
+        limit, lowest, highest, decreases, history = limiter.summary()["a.org"]
+        self.assertEqual((limit, lowest, highest), (2, 2, 8))
+        self.assertEqual(decreases, 6)
+        self.assertEqual(history[0][1], 2)
+
+    def test_in_flight_requests_cut_once(self):
+        """Test that requests in flight at the old limit do not cut it again."""
+        limiter = AdaptiveConcurrencyLimiter(min_concurrency=1, max_concurrency=16)
+        for _ in range(7):
+            self.complete(limiter, "a.org")
+        self.assertEqual(limiter.summary()["a.org"][0], 8)
+
+        started = [limiter.acquire("a.org") for _ in range(4)]
+        for start in started:
+            limiter.release("a.org", start, OUTCOME_ERROR)
+        self.assertEqual(limiter.summary()["a.org"][0], 4)
+
+    def test_limit_enforced(self):
+        """Test that no more than the limit of requests run concurrently."""
+        limiter = AdaptiveConcurrencyLimiter(min_concurrency=2, max_concurrency=2)
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+
+        def worker():
+            started = limiter.acquire("a.org")
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            with lock:
+                state['active'] -= 1
+            limiter.release("a.org", started, OUTCOME_OK)
+
+        threads = [threading.Thread(target=worker) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertLessEqual(state['peak'], 2)
+
+
+class TestAdaptiveRequests(unittest.TestCase):
+    """Tests for requests made in adaptive concurrency mode."""
+
+    def test_requests_feed_limiter(self):
+        """Test that request outcomes adjust the host's concurrency."""
+        checker = LinkChecker("https://example.com", adaptive_concurrency=True,
+                              min_concurrency=1, max_concurrency=4)
+        self.assertEqual(checker._worker_threads(), 10)
+
+        response = MagicMock()
+        response.status_code = 200
+        response.headers = {'Content-Type': 'text/html'}
+        with patch('requests.Session.get', return_value=response):
+            for i in range(3):
+                checker._check_url(f"https://example.com/page{i}.html")
+        self.assertEqual(checker.adaptive_limiter.summary()["example.com"][0], 4)
+
+        with patch('requests.Session.get', side_effect=requests.Timeout("timed out")):
+            checker._check_url("https://example.com/slow.html")
+        self.assertEqual(checker.adaptive_limiter.summary()["example.com"][0], 2)
+
+    def test_latency_excludes_in_flight_wait(self):
+        """Test that waiting for a global in-flight slot does not count as latency."""
+        checker = LinkChecker("https://example.com", adaptive_concurrency=True, max_in_flight=1)
+        self.addCleanup(checker.close)
+        release = MagicMock(wraps=checker.adaptive_limiter.release)
+        checker.adaptive_limiter.release = release
+
+        @contextlib.contextmanager
+        def slow_in_flight():
+            threading.Event().wait(0.3)
+            yield
+
+        response = MagicMock()
+        response.status_code = 200
+        with patch.object(checker.scheduler, 'in_flight', slow_in_flight), \
+                patch('requests.Session.head', return_value=response):
+            checker._send('head', "example.org", "https://example.org/")
+
+        host, _, outcome, latency = release.call_args.args
+        self.assertEqual((host, outcome), ("example.org", OUTCOME_OK))
+        self.assertLess(latency, 0.2)
+
+    def test_external_lanes_follow_the_limit(self):
+        """Test that a host gets more lanes as its limit grows beyond the fixed width."""
+        checker = LinkChecker("https://example.com", adaptive_concurrency=True,
+                              min_concurrency=1, max_concurrency=4,
+                              max_external_threads=1, max_connections_per_host=1)
+        self.addCleanup(checker.close)
+        checker.external_links["https://example.com"] = {
+            f"https://example.org/page{i}.html" for i in range(16)}
+
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+
+        def head_side_effect(url, **kwargs):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            threading.Event().wait(0.02)
+            with lock:
+                state['active'] -= 1
+            response = MagicMock()
+            response.status_code = 200
+            return response
+
+        with patch('requests.Session.head', side_effect=head_side_effect) as mock_head, \
+                patch('link_checker.main.time.sleep'):
+            checker.check_external_links()
+
+        self.assertEqual(mock_head.call_count, 16)
+        self.assertEqual(checker.broken_links, {})
+        self.assertGreater(state['peak'], 1)
+        self.assertLessEqual(state['peak'], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""Tests for checking links to anchors."""
+
+import unittest
+
+from bs4 import BeautifulSoup
+
+from link_checker.anchors import AnchorIndex, find_anchors, is_checkable_fragment
+from link_checker.main import LinkChecker
+from tests.fake_site import FakeSite
+
+PAGES = {
+    "https://example.com/docs": (
+        '<h1 id="intro">Intro</h1>'
+        '<a href="#intro">Intro</a><a href="#nowhere">Nowhere</a><a href="#top">Top</a>'
+        '<a href="guide.html#install">Install</a><a href="guide.html#missing">Missing</a>'
+        '<a href="https://ext.org/page#section">Ext</a>'
+        '<a href="https://ext.org/page#gone">Ext</a>'),
+    "https://example.com/docs/guide.html": (
+        '<h2 id="install">Install</h2><a name="legacy"></a>'
+        '<a href="/docs/index.html#intro">Back</a><a href="/docs#legacy">Bad</a>'),
+    "https://ext.org/page": '<section id="section"></section>',
+}
+
+
+class TestAnchorIndex(unittest.TestCase):
+    """Tests for the anchor index."""
+
+    def test_find_anchors(self):
+        """Test that ids of any element and names of <a> tags are anchors."""
+        soup = BeautifulSoup('<div id="a"><p id="b"></p><a name="c"></a>'
+                             '<input name="d"><span id=""></span></div>', 'html.parser')
+        self.assertEqual(find_anchors(soup), ['a', 'b', 'c'])
+
+    def test_checkable_fragments(self):
+        """Test that top-of-page and text fragments are not checked."""
+        self.assertTrue(is_checkable_fragment('install'))
+        self.assertFalse(is_checkable_fragment(''))
+        self.assertFalse(is_checkable_fragment('Top'))
+        self.assertFalse(is_checkable_fragment(':~:text=hello'))
+
+    def test_missing_anchors(self):
+        """Test that only references to missing anchors on indexed pages are reported."""
+        index = AnchorIndex()
+        index.add_page("https://example.com/docs/index.html", ['intro', 'caf%C3%A9'])
+        index.add_references("https://example.com/a", [
+            ("https://example.com/docs/", "intro"),
+            ("https://example.com/docs", "caf%C3%A9"),
+            ("https://example.com/docs", "gone"),
+            ("https://example.com/other", "anything"),
+        ])
+        self.assertEqual(list(index.missing()),
+                         [("https://example.com/a", "https://example.com/docs", "gone")])
+        self.assertEqual(index.unindexed_targets(), ["https://example.com/other"])
+
+
+class TestCheckAnchors(unittest.TestCase):
+    """Tests for checking anchors during a run."""
+
+    def test_broken_anchors_are_reported(self):
+        """Test that links to missing anchors are found without refetching pages."""
+        site = FakeSite(PAGES)
+        checker = LinkChecker("https://example.com/docs", check_anchors=True)
+        with site.serve():
+            checker.run()
+        checker.close()
+
+        self.assertEqual(
+            {page: set(targets) for page, targets in checker.broken_anchors.items()},
+            {"https://example.com/docs": {"https://example.com/docs#nowhere",
+                                          "https://example.com/docs/guide.html#missing",
+                                          "https://ext.org/page#gone"},
+             "https://example.com/docs/guide.html": {
+                 "https://example.com/docs/index.html#legacy"}})
+
+        # The crawled pages are not fetched again; the external page is fetched once
+        self.assertEqual(site.get_urls.count("https://example.com/docs"), 1)
+        self.assertEqual(site.get_urls.count("https://example.com/docs/guide.html"), 1)
+        self.assertEqual(site.get_urls.count("https://ext.org/page"), 1)
+
+    def test_anchors_not_checked_by_default(self):
+        """Test that fragments are ignored unless anchor checks are enabled."""
+        site = FakeSite(PAGES)
+        checker = LinkChecker("https://example.com/docs")
+        with site.serve():
+            checker.run()
+        checker.close()
+
+        self.assertIsNone(checker.anchor_index)
+        self.assertFalse(checker.broken_anchors)
+        self.assertNotIn("https://ext.org/page", site.get_urls)
+
+
+if __name__ == '__main__':
+    unittest.main()
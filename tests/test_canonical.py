@@ -0,0 +1,101 @@
+"""Tests for URL canonicalization rules."""
+
+import json
+import os
+import tempfile
+import unittest
+
+from link_checker.canonical import CanonicalRules
+from link_checker.cli import read_canonical_rules
+from link_checker.main import LinkChecker
+from tests.fake_site import FakeSite
+
+
+class TestCanonicalRules(unittest.TestCase):
+    """Tests for the CanonicalRules class."""
+
+    def test_default_rules(self):
+        """Test that the default rules only make rewrites that keep the resource."""
+        rules = CanonicalRules()
+        self.assertEqual(rules.canonicalize("HTTPS://Example.COM:443/a%7eb/%c3%a9?q=%2f"),
+                         "https://example.com/a~b/%C3%A9?q=%2F")
+        self.assertEqual(rules.canonicalize("http://user@Example.com:80/"),
+                         "http://user@example.com/")
+        self.assertEqual(rules.canonicalize("http://example.com:8080/?b=1&a=2&utm_source=x"),
+                         "http://example.com:8080/?b=1&a=2&utm_source=x")
+        self.assertEqual(rules.canonicalize("https://[::1]:443/"), "https://[::1]/")
+
+    def test_query_rules(self):
+        """Test that parameters are stripped, allow-listed and sorted."""
+        rules = CanonicalRules.from_dict({'strip_params': ['utm_*', 'v'], 'sort_params': True})
+        self.assertEqual(rules.canonicalize("https://example.com/app.js?v=123"),
+                         "https://example.com/app.js")
+        self.assertEqual(rules.canonicalize("https://example.com/?q=x%20y&utm_source=mail&a=1"),
+                         "https://example.com/?a=1&q=x%20y")
+
+        rules = CanonicalRules(keep_params=['page'])
+        self.assertEqual(rules.canonicalize("https://example.com/list?sid=1&page=2"),
+                         "https://example.com/list?page=2")
+
+    def test_unknown_rule(self):
+        """Test that unknown rules are rejected."""
+        with self.assertRaises(ValueError):
+            CanonicalRules.from_dict({'strip_param': ['v']})
+
+    def test_urls_rewritten(self):
+        """Test that only the URLs that needed a rewrite are counted."""
+        rules = CanonicalRules(strip_params=['v'])
+        rules.canonicalize("https://example.com/app.js")
+        self.assertEqual(rules.urls_rewritten(), 0)
+        rules.canonicalize("https://example.com/app.js?v=1")
+        rules.canonicalize("https://example.com/app.js?v=1")
+        self.assertEqual(rules.urls_rewritten(), 2)
+
+        rules.clear()
+        self.assertEqual(rules.urls_rewritten(), 0)
+
+
+class SameSite(FakeSite):
+    """A site on which every page links to variants of the same URLs."""
+
+    def page(self, url):
+        return ('<a href="/about.html?utm_source=nav">About</a>'
+                '<a href="https://EXAMPLE.com:443/about.html">About</a>'
+                '<script src="/app.js?v=1"></script>'
+                '<script src="/app.js?v=2"></script>')
+
+
+class TestCanonicalizationInCrawl(unittest.TestCase):
+    """Tests for merging URL variants while crawling."""
+
+    def test_variants_are_fetched_once(self):
+        """Test that the spellings of a URL are merged before they are fetched."""
+        site = SameSite()
+        checker = LinkChecker("https://example.com",
+                              canonical_rules={'strip_params': ['utm_*', 'v']})
+        with site.serve():
+            checker.run()
+        checker.close()
+
+        self.assertEqual(sorted(site.urls), ["https://example.com",
+                                             "https://example.com/about.html",
+                                             "https://example.com/app.js"])
+        # The four links on each of the two pages were rewritten
+        self.assertEqual(checker.canonical_rules.urls_rewritten(), 8)
+
+    def test_read_canonical_rules(self):
+        """Test that the rules file must hold an object of known rules."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'rules.json')
+            with open(path, 'w') as f:
+                json.dump({'sort_params': True}, f)
+            self.assertEqual(read_canonical_rules(path), {'sort_params': True})
+
+            with open(path, 'w') as f:
+                json.dump(['v'], f)
+            with self.assertRaises(ValueError):
+                read_canonical_rules(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
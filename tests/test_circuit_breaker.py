@@ -0,0 +1,154 @@
+"""Tests for the per-host circuit breaker."""
+
+import socket
+import unittest
+from unittest.mock import patch
+
+import requests
+
+from link_checker.circuit_breaker import HostCircuitBreaker, is_dns_failure
+from link_checker.main import LinkChecker
+
+
+class TestHostCircuitBreaker(unittest.TestCase):
+    """Tests for the HostCircuitBreaker class."""
+
+    def test_opens_after_threshold(self):
+        """Test that a host is short-circuited after consecutive failures."""
+        breaker = HostCircuitBreaker(failure_threshold=2, cooldown=60.0)
+
+        self.assertIsNone(breaker.allow_request("dead.example.org"))
+        self.assertFalse(breaker.record_failure("dead.example.org", "timed out"))
+        self.assertIsNone(breaker.allow_request("dead.example.org"))
+        self.assertTrue(breaker.record_failure("dead.example.org", "timed out"))
+
+        # Remaining requests fail with the recorded error
+        self.assertEqual(breaker.allow_request("dead.example.org"), "timed out")
+        self.assertEqual(breaker.allow_request("dead.example.org"), "timed out")
+
+        # Other hosts are unaffected
+        self.assertIsNone(breaker.allow_request("alive.example.org"))
+
+        self.assertEqual(breaker.short_circuited_hosts(),
+                         {"dead.example.org": (2, "timed out", False)})
+
+    def test_success_resets_failures(self):
+        """Test that a response from a host resets its failure count."""
+        breaker = HostCircuitBreaker(failure_threshold=2, cooldown=60.0)
+
+        breaker.record_failure("flaky.example.org", "reset")
+        breaker.record_success("flaky.example.org")
+        self.assertFalse(breaker.record_failure("flaky.example.org", "reset"))
+        self.assertIsNone(breaker.allow_request("flaky.example.org"))
+        self.assertEqual(breaker.short_circuited_hosts(), {})
+
+    def test_dns_failure_opens_immediately(self):
+        """Test that a failed DNS lookup is cached as a negative result."""
+        breaker = HostCircuitBreaker(failure_threshold=5, cooldown=60.0)
+
+        self.assertTrue(breaker.record_failure("gone.example.org", "no such host",
+                                               dns_failure=True))
+        self.assertEqual(breaker.allow_request("gone.example.org"), "no such host")
+
+    def test_probe_after_cooldown(self):
+        """Test that a single probe is allowed once the cool-down has passed."""
+        breaker = HostCircuitBreaker(failure_threshold=1, cooldown=30.0)
+
+        with patch('link_checker.circuit_breaker.time.monotonic', return_value=100.0):
+            breaker.record_failure("slow.example.org", "timed out")
+            self.assertIsNotNone(breaker.allow_request("slow.example.org"))
+
+        with patch('link_checker.circuit_breaker.time.monotonic', return_value=131.0):
+            # First caller probes, others are still short-circuited
+            self.assertIsNone(breaker.allow_request("slow.example.org"))
+            self.assertIsNotNone(breaker.allow_request("slow.example.org"))
+
+            # A successful probe closes the circuit
+            breaker.record_success("slow.example.org")
+            self.assertIsNone(breaker.allow_request("slow.example.org"))
+
+    def test_released_probe(self):
+        """Test that a probe given up without a request lets the next caller probe."""
+        breaker = HostCircuitBreaker(failure_threshold=1, cooldown=30.0)
+
+        with patch('link_checker.circuit_breaker.time.monotonic', return_value=100.0):
+            breaker.record_failure("slow.example.org", "timed out")
+
+        with patch('link_checker.circuit_breaker.time.monotonic', return_value=131.0):
+            self.assertIsNone(breaker.allow_request("slow.example.org"))
+            breaker.release_probe("slow.example.org")
+            self.assertIsNone(breaker.allow_request("slow.example.org"))
+            self.assertIsNotNone(breaker.allow_request("slow.example.org"))
+
+    def test_disabled(self):
+        """Test that a zero threshold disables the breaker."""
+        breaker = HostCircuitBreaker(failure_threshold=0)
+
+        self.assertFalse(breaker.record_failure("dead.example.org", "timed out",
+                                                dns_failure=True))
+        self.assertIsNone(breaker.allow_request("dead.example.org"))
+
+    def test_is_dns_failure(self):
+        """Test DNS failure detection through wrapped exceptions."""
+        wrapped = requests.ConnectionError(
+            OSError("Max retries exceeded", socket.gaierror(-2, "Name or service not known")))
+        self.assertTrue(is_dns_failure(wrapped))
+        self.assertFalse(is_dns_failure(requests.ConnectionError("Connection refused")))
+
+
+class TestExternalShortCircuit(unittest.TestCase):
+    """Tests for short-circuiting dead hosts while checking external links."""
+
+    def test_dead_host_is_short_circuited(self):
+        """Test that URLs on a dead host fail without further requests."""
+        checker = LinkChecker("https://example.com", host_failure_threshold=2,
+                              max_external_threads=1, max_connections_per_host=1)
+        dead_urls = {f"https://dead.example.org/page{i}.html" for i in range(6)}
+        checker.external_links["https://example.com"] = set(dead_urls)
+
+        with patch('requests.Session.head',
+                   side_effect=requests.ConnectTimeout("timed out")) as mock_head, \
+                patch('time.sleep'):
+            checker.check_external_links()
+
+        # Only the requests needed to open the circuit were made
+        self.assertEqual(mock_head.call_count, 2)
+        self.assertEqual(checker.broken_links["https://example.com"],
+                         {url: 0 for url in dead_urls})
+        skipped, error, _ = checker.circuit_breaker.short_circuited_hosts()[
+            "dead.example.org"]
+        self.assertEqual(skipped, 4)
+        self.assertEqual(error, "timed out")
+
+    def test_probe_without_budget_is_released(self):
+        """Test that a half-open host is probed again when its probe was never sent."""
+        checker = LinkChecker("https://example.com", max_requests=0)
+        breaker = checker.circuit_breaker
+        with patch('link_checker.circuit_breaker.time.monotonic', return_value=100.0):
+            breaker.record_failure("slow.example.org", "timed out", dns_failure=True)
+
+        with patch('link_checker.circuit_breaker.time.monotonic', return_value=1000.0), \
+                patch('requests.Session.head') as mock_head, patch('time.sleep'):
+            self.assertIsNone(checker._check_external_url("https://slow.example.org/a"))
+            mock_head.assert_not_called()
+            self.assertIsNone(breaker.allow_request("slow.example.org"))
+        checker.close()
+
+    def test_dns_failure_is_kept_across_runs(self):
+        """Test that a retargeted checker still knows which hosts do not resolve."""
+        checker = LinkChecker("https://example.com")
+        error = requests.ConnectionError(socket.gaierror(socket.EAI_NONAME, "Name or service not known"))
+        with patch('requests.Session.head', side_effect=error) as mock_head, patch('time.sleep'):
+            checker._check_external_url("https://gone.example.org/a")
+            self.assertEqual(mock_head.call_count, 1)
+
+            checker.retarget("https://example.net")
+            self.assertIsNotNone(checker._check_external_url("https://gone.example.org/b"))
+            self.assertEqual(mock_head.call_count, 1)
+        self.assertEqual(list(checker.circuit_breaker.short_circuited_hosts()),
+                         ["gone.example.org"])
+        checker.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,7 @@
 """Tests for the CLI module."""
 
+import subprocess
+import sys
 import unittest
 from unittest.mock import patch, MagicMock
 
@@ -44,6 +46,41 @@ class TestCLI(unittest.TestCase):
         args = create_parser().parse_args(["example.html", "--max-threads", "20"])
         self.assertEqual(args.max_threads, 20)
 
+        # Test with circuit breaker options
+        args = create_parser().parse_args(["example.html", "--host-failure-threshold", "5",
+                                           "--host-cooldown", "30"])
+        self.assertEqual(args.host_failure_threshold, 5)
+        self.assertEqual(args.host_cooldown, 30.0)
+
+        # Test with a time budget split across the phases
+        args = create_parser().parse_args(["example.html", "--max-time", "600",
+                                           "--max-time-split", "60,20,20"])
+        self.assertEqual(args.max_time, 600.0)
+        self.assertEqual(args.max_time_split, [60.0, 20.0, 20.0])
+        with patch('sys.stderr'), self.assertRaises(SystemExit):
+            create_parser().parse_args(["example.html", "--max-time-split", "60,40"])
+
+    def test_daemon_rejects_per_site_state(self):
+        """Test that options whose state belongs to one site cannot be used with --daemon."""
+        for option in (["--incremental", "state.db"], ["--compare-to", "old.json"],
+                       ["--pages-file", "pages.txt"]):
+            with self.subTest(option=option[0]), patch('sys.stderr'), \
+                    patch('link_checker.cli.serve_daemon') as mock_serve, \
+                    self.assertRaises(SystemExit) as raised:
+                main(["--daemon"] + option)
+            self.assertEqual(raised.exception.code, 2)
+            mock_serve.assert_not_called()
+
+    def test_daemon_socket_needs_unix_sockets(self):
+        """Test that --daemon-socket is rejected on platforms without Unix sockets."""
+        with patch('link_checker.cli.socket') as mock_socket, patch('sys.stderr'), \
+                patch('link_checker.cli.serve_daemon') as mock_serve, \
+                self.assertRaises(SystemExit) as raised:
+            del mock_socket.AF_UNIX
+            main(["--daemon", "--daemon-socket", "checker.sock"])
+        self.assertEqual(raised.exception.code, 2)
+        mock_serve.assert_not_called()
+
     @patch('link_checker.cli.LinkChecker')
     @patch('link_checker.cli.setup_logging')
     def test_main(self, mock_setup_logging, mock_link_checker_cls):
@@ -65,7 +102,38 @@ class TestCLI(unittest.TestCase):
             timeout=10.0,
             max_requests=None,
             max_depth=None,
-            max_threads=10
+            max_threads=10,
+            host_failure_threshold=3,
+            host_cooldown=60.0,
+            max_external_threads=5,
+            max_connections_per_host=2,
+            external_cache=None,
+            external_cache_ttl=168.0 * 3600,
+            max_retries=0,
+            retry_backoff=0.5,
+            retry_backoff_max=30.0,
+            host_retry_budget=10,
+            adaptive_concurrency=False,
+            min_concurrency=1,
+            max_concurrency=32,
+            max_time=None,
+            max_time_split=None,
+            grace_period=5.0,
+            result_store=None,
+            incremental_state=None,
+            sitemap_url=None,
+            changed_paths=None,
+            check_anchors=False,
+            respect_robots=False,
+            fail_fast=None,
+            suspect_links=None,
+            pages=None,
+            max_url_length=2048,
+            max_repeated_segments=3,
+            max_query_variants=100,
+            canonical_rules=None,
+            reuse_link_blocks=True,
+            max_in_flight=None
         )
 
         # Check that run was called (which internally calls link_checker and check_assets)
@@ -73,6 +141,7 @@ class TestCLI(unittest.TestCase):
 
         # Check that print_report was called
         mock_link_checker.print_report.assert_called_once()
+        mock_link_checker.close.assert_called_once()
 
         # Check exit code
         self.assertEqual(exit_code, 0)
@@ -86,7 +155,7 @@ class TestCLI(unittest.TestCase):
                           "--log-level", "WARNING"])
 
         # Check that setup_logging was called with the right log level
-        mock_setup_logging.assert_called_once_with(0, "test.log", "WARNING")
+        mock_setup_logging.assert_called_once_with(0, "test.log", "WARNING", "text")
 
         # Reset mocks
         mock_setup_logging.reset_mock()
@@ -115,7 +184,38 @@ class TestCLI(unittest.TestCase):
                 timeout=10.0,
                 max_requests=None,
                 max_depth=None,
-                max_threads=10
+                max_threads=10,
+                host_failure_threshold=3,
+                host_cooldown=60.0,
+                max_external_threads=5,
+                max_connections_per_host=2,
+                external_cache=None,
+                external_cache_ttl=168.0 * 3600,
+                max_retries=0,
+                retry_backoff=0.5,
+                retry_backoff_max=30.0,
+                host_retry_budget=10,
+                adaptive_concurrency=False,
+                min_concurrency=1,
+                max_concurrency=32,
+                max_time=None,
+                max_time_split=None,
+                grace_period=5.0,
+                result_store=None,
+                incremental_state=None,
+                sitemap_url=None,
+                changed_paths=None,
+                check_anchors=False,
+                respect_robots=False,
+                fail_fast=None,
+                suspect_links=None,
+                pages=None,
+                max_url_length=2048,
+                max_repeated_segments=3,
+                max_query_variants=100,
+                canonical_rules=None,
+                reuse_link_blocks=True,
+                max_in_flight=None
             )
 
         # Check exit code
@@ -295,6 +395,131 @@ class TestCLI(unittest.TestCase):
                     # On Windows, file might still be locked
                     pass
 
+    def test_json_log_format(self):
+        """Test that log records are written as JSON lines by the logging thread."""
+        import json
+        import logging
+        import logging.handlers
+        import os
+        import tempfile
+        from link_checker.cli import TracebackQueueHandler, setup_logging, stop_logging
+
+        fd, log_path = tempfile.mkstemp(suffix='.log', prefix='linkchecker_json_test_')
+        os.close(fd)
+        root_logger = logging.getLogger()
+        saved_handlers, saved_level = root_logger.handlers[:], root_logger.level
+
+        try:
+            setup_logging(0, log_path, "INFO", "json")
+
+            # Worker threads only put records on a queue
+            self.assertEqual([type(handler) for handler in root_logger.handlers],
+                             [TracebackQueueHandler])
+            # DEBUG is disabled before any message is built
+            self.assertFalse(root_logger.isEnabledFor(logging.DEBUG))
+
+            logging.getLogger("link_checker.test").info("Checked %s links", 42)
+            stop_logging()
+
+            with open(log_path, 'r') as f:
+                entries = [json.loads(line) for line in f]
+            self.assertEqual(entries[-1]['message'], "Checked 42 links")
+            self.assertEqual(entries[-1]['level'], "INFO")
+            self.assertEqual(entries[-1]['logger'], "link_checker.test")
+            self.assertNotIn('exception', entries[-1])
+        finally:
+            stop_logging()
+            root_logger.handlers[:] = saved_handlers
+            root_logger.setLevel(saved_level)
+            os.unlink(log_path)
+
+    def test_json_log_exception(self):
+        """Test that the traceback of a record is written apart from its message."""
+        import json
+        import logging
+        import os
+        import tempfile
+        from link_checker.cli import setup_logging, stop_logging
+
+        fd, log_path = tempfile.mkstemp(suffix='.log', prefix='linkchecker_json_test_')
+        os.close(fd)
+        root_logger = logging.getLogger()
+        saved_handlers, saved_level = root_logger.handlers[:], root_logger.level
+
+        try:
+            setup_logging(0, log_path, "INFO", "json")
+            try:
+                raise ValueError("bad value")
+            except ValueError:
+                logging.getLogger("link_checker.test").exception("Checking %s failed", "a.html")
+            stop_logging()
+
+            with open(log_path, 'r') as f:
+                entries = [json.loads(line) for line in f]
+            self.assertEqual(entries[-1]['message'], "Checking a.html failed")
+            self.assertEqual(entries[-1]['level'], "ERROR")
+            self.assertTrue(entries[-1]['exception'].startswith("Traceback"))
+            self.assertIn("ValueError: bad value", entries[-1]['exception'])
+        finally:
+            stop_logging()
+            root_logger.handlers[:] = saved_handlers
+            root_logger.setLevel(saved_level)
+            os.unlink(log_path)
+
+
+# Modules that must not be imported before there is something to check
+HEAVY_MODULES = ('requests', 'bs4', 'link_checker.main', 'link_checker.diff')
+
+
+class TestStartup(unittest.TestCase):
+    """Tests for the start-up cost of the command line tool."""
+
+    def import_times(self, code):
+        """Run code in a new interpreter and return the cumulative import time of
+        each module imported, in microseconds."""
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                                capture_output=True, text=True, check=True)
+        times = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'imported package' in line:
+                continue
+            _, cumulative, name = line[len('import time:'):].split('|')
+            times[name.strip()] = int(cumulative)
+        return times
+
+    def test_import_is_light(self):
+        """Test that importing the CLI takes less time than importing the checker."""
+        times = self.import_times('import link_checker.cli\nimport link_checker.main')
+        self.assertLess(times['link_checker.cli'], times['link_checker.main'])
+
+    def test_help_and_version_do_not_load_checker(self):
+        """Test that --help and --version exit before anything heavy is imported."""
+        for option in ('--help', '--version'):
+            with self.subTest(option=option):
+                result = subprocess.run([sys.executable, '-c', (
+                    'import sys\n'
+                    'from link_checker.cli import main\n'
+                    'try:\n'
+                    f'    main(["{option}"])\n'
+                    'except SystemExit:\n'
+                    '    pass\n'
+                    f'print(sorted(set({HEAVY_MODULES!r}) & set(sys.modules)))')],
+                    capture_output=True, text=True, check=True)
+                self.assertEqual(result.stdout.strip().splitlines()[-1], '[]')
+
+    def test_modes_load_only_their_modules(self):
+        """Test that a plain check does not import the daemon, watch or diff modules."""
+        result = subprocess.run([sys.executable, '-c', (
+            'import sys\n'
+            'from unittest.mock import patch\n'
+            'import link_checker.cli as cli\n'
+            'with patch.object(cli, "LinkChecker"), patch.object(cli, "setup_logging"):\n'
+            '    assert cli.main(["https://example.com"]) == 0\n'
+            'print(sorted({"link_checker.daemon", "link_checker.watch", "link_checker.diff"}\n'
+            '             & set(sys.modules)))')],
+            capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), '[]')
+
 
 if __name__ == '__main__':
     unittest.main()
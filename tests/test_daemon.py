@@ -0,0 +1,142 @@
+"""Tests for the resident checker daemon."""
+
+import json
+import os
+import socket
+import tempfile
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from unittest.mock import patch
+
+from link_checker.daemon import CheckerDaemon, make_server, parse_job
+from link_checker.main import LinkChecker
+from tests.fake_site import FakeSite
+
+PAGES = {
+    "https://one.org": '<a href="/a.html">A</a><a href="https://ext.org/x">X</a>',
+    "https://one.org/a.html": '<a href="/gone.html">Gone</a>',
+    "https://two.org": '<a href="https://ext.org/x">X</a>',
+}
+
+
+class TestParseJob(unittest.TestCase):
+    """Tests for the parse_job function."""
+
+    def test_valid_job(self):
+        """Test that a job is returned as keyword arguments of retarget()."""
+        self.assertEqual(parse_job(b'{"root_url": "https://one.org", "max_depth": 2}'),
+                         {'root_url': "https://one.org", 'max_depth': 2})
+
+    def test_invalid_jobs(self):
+        """Test that malformed jobs are rejected."""
+        for body in (b'[]', b'{"max_depth": 2}', b'{"root_url": "x", "depth": 2}',
+                     b'{"root_url": "x", "max_depth": "2"}', b'{"root_url": 1}', b'{'):
+            with self.subTest(body=body), self.assertRaises(ValueError):
+                parse_job(body)
+
+
+class TestDaemon(unittest.TestCase):
+    """Tests for running jobs on a resident checker."""
+
+    def setUp(self):
+        FakeSite(PAGES).serve_during(self)
+        self.checker = LinkChecker('', external_cache=':memory:')
+        self.addCleanup(self.checker.close)
+        self.daemon = CheckerDaemon(self.checker)
+
+    def test_jobs_share_the_runtime(self):
+        """Test that jobs on different sites reuse the session and verdict cache."""
+        session = self.checker.session
+        first = []
+        self.daemon.run_job({'root_url': "https://one.org"}, first.append)
+        second = []
+        self.daemon.run_job({'root_url': "https://two.org", 'max_requests': 5}, second.append)
+
+        self.assertIs(self.checker.session, session)
+        self.assertIn({'event': 'BrokenLink', 'page_url': "https://one.org/a.html",
+                       'url': "https://one.org/gone.html", 'status_code': 404}, first)
+        self.assertEqual(first[-1]['event'], 'JobFinished')
+        self.assertEqual(first[-1]['pages_visited'], 2)
+        self.assertEqual(first[-1]['broken_links'], 1)
+
+        # The second job has its own results, and the external verdict stayed warm
+        self.assertIn({'event': 'ExternalVerdict', 'url': "https://ext.org/x",
+                       'status_code': 200, 'cached': True}, second)
+        self.assertEqual(second[-1], {'event': 'JobFinished', 'root_url': "https://two.org",
+                                      'pages_visited': 1, 'broken_links': 0, 'requests': 1,
+                                      'incomplete': []})
+        self.assertEqual(self.checker.request_budget.limit, 5)
+        self.assertEqual(self.daemon.status(), {'busy': False, 'jobs_run': 2})
+
+    def test_job_is_cancelled_when_the_client_goes_away(self):
+        """Test that a failing write stops the job and leaves the daemon usable."""
+        def write(record):
+            raise BrokenPipeError()
+
+        with self.assertRaises(BrokenPipeError):
+            self.daemon.run_job({'root_url': "https://one.org"}, write)
+        self.assertIsNone(self.checker.event_stream)
+
+        records = []
+        self.daemon.run_job({'root_url': "https://two.org"}, records.append)
+        self.assertEqual(records[-1]['pages_visited'], 1)
+
+    def serve(self, **kwargs):
+        server = make_server(self.daemon, port=0, **kwargs)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        def stop():
+            server.shutdown()
+            server.server_close()
+            thread.join()
+        self.addCleanup(stop)
+        return server
+
+    def test_http_api(self):
+        """Test that jobs posted over HTTP stream their records back as JSON lines."""
+        server = self.serve()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+
+        request = urllib.request.Request(f"{base}/jobs", data=b'{"root_url": "https://one.org"}')
+        with urllib.request.urlopen(request) as response:
+            self.assertEqual(response.headers['Content-Type'], 'application/x-ndjson')
+            records = [json.loads(line) for line in response]
+        self.assertEqual(records[0], {'event': 'PageVisited', 'url': "https://one.org",
+                                      'status_code': 200, 'depth': 0})
+        self.assertEqual(records[-1]['event'], 'JobFinished')
+
+        with urllib.request.urlopen(f"{base}/status") as response:
+            self.assertEqual(json.load(response), {'busy': False, 'jobs_run': 1})
+
+        with self.assertRaises(urllib.error.HTTPError) as raised:
+            urllib.request.urlopen(urllib.request.Request(f"{base}/jobs", data=b'{}'))
+        self.assertEqual(raised.exception.code, 400)
+
+    def test_unix_socket_unsupported(self):
+        """Test that a socket path is rejected on platforms without Unix sockets."""
+        with patch('link_checker.daemon.UNIX_SOCKETS', False), self.assertRaises(ValueError):
+            make_server(self.daemon, socket_path='checker.sock')
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), "Unix sockets are not available")
+    def test_unix_socket(self):
+        """Test that the same API is served over a Unix socket."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            socket_path = os.path.join(temp_dir, 'checker.sock')
+            self.serve(socket_path=socket_path)
+
+            client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            client.connect(socket_path)
+            client.sendall(b'GET /status HTTP/1.0\r\n\r\n')
+            with client.makefile('rb') as response:
+                lines = response.read().decode().splitlines()
+            client.close()
+
+        self.assertTrue(lines[0].startswith('HTTP/1.0 200'))
+        self.assertEqual(json.loads(lines[-1]), {'busy': False, 'jobs_run': 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
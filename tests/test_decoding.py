@@ -0,0 +1,82 @@
+"""Tests for content negotiation and encoding detection."""
+
+import codecs
+import unittest
+from unittest.mock import patch, MagicMock
+
+from link_checker.decoding import (ACCEPT_ENCODING_HEADER, HtmlBytes, make_soup,
+                                   sniff_encoding)
+from link_checker.main import LinkChecker
+
+
+class TestSniffEncoding(unittest.TestCase):
+    """Tests for the sniff_encoding function."""
+
+    def test_sources_in_order(self):
+        """Test that a BOM wins over the header, which wins over a <meta> tag."""
+        meta = b'<html><head><meta charset="iso-8859-1"></head></html>'
+        self.assertEqual(sniff_encoding(codecs.BOM_UTF8 + meta, 'text/html; charset=cp1252'),
+                         'utf-8-sig')
+        self.assertEqual(sniff_encoding(meta, 'text/html; charset="cp1252"'), 'cp1252')
+        self.assertEqual(sniff_encoding(meta, 'text/html'), 'iso8859-1')
+        self.assertEqual(sniff_encoding(b'<html></html>', 'text/html'), 'utf-8')
+
+    def test_http_equiv_meta(self):
+        """Test that an http-equiv Content-Type declaration is found."""
+        content = (b'<meta http-equiv="Content-Type" '
+                   b'content="text/html; charset=Shift_JIS">')
+        self.assertEqual(sniff_encoding(content), 'shift_jis')
+
+    def test_unknown_charset_is_ignored(self):
+        """Test that a charset Python does not know falls through to the next source."""
+        self.assertEqual(sniff_encoding(b'<meta charset="bogus">', 'text/html; charset=x-nope'),
+                         'utf-8')
+
+
+class TestHtmlBytes(unittest.TestCase):
+    """Tests for parsing pages from bytes."""
+
+    def test_bytes_are_decoded_with_their_encoding(self):
+        """Test that the parser decodes HtmlBytes with the encoding they carry."""
+        content = HtmlBytes('<p id="café">Café</p>'.encode('latin-1'), 'latin-1')
+        self.assertEqual(content, '<p id="café">Café</p>'.encode('latin-1'))
+        self.assertEqual(make_soup(content).p.get_text(), 'Café')
+        self.assertEqual(make_soup(bytes(content), 'text/html; charset=latin-1').p['id'],
+                         'café')
+
+
+class TestCompressedTransfer(unittest.TestCase):
+    """Tests for how the checker downloads HTML pages."""
+
+    def test_accept_encoding_is_negotiated(self):
+        """Test that the session asks for the codings urllib3 can decode."""
+        checker = LinkChecker("https://example.com")
+        self.assertEqual(checker.session.headers['Accept-Encoding'], ACCEPT_ENCODING_HEADER)
+        self.assertIn('gzip', ACCEPT_ENCODING_HEADER)
+        checker.close()
+
+    def test_html_is_returned_as_bytes(self):
+        """Test that HTML is returned undecoded and the transferred bytes are counted."""
+        checker = LinkChecker("https://example.com")
+        body = '<html><body>Grüße</body></html>'.encode('utf-8')
+        response = MagicMock()
+        response.status_code = 200
+        response.headers = {'Content-Type': 'text/html; charset=utf-8'}
+        response.content = body
+        response.raw.tell.return_value = 20
+
+        with patch('requests.Session.get', return_value=response) as mock_get:
+            content, status = checker._check_url("https://example.com/page.html")
+
+        self.assertEqual(status, 200)
+        self.assertIsInstance(content, HtmlBytes)
+        self.assertEqual(content, body)
+        self.assertEqual(content.encoding, 'utf-8')
+        self.assertTrue(mock_get.call_args.kwargs['stream'])
+        self.assertEqual(checker.html_bytes_on_wire, 20)
+        self.assertEqual(checker.html_bytes_decoded, len(body))
+        checker.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""Tests for comparing results between runs."""
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from link_checker.cli import main
+from link_checker.diff import RunDiff, RunResults
+from link_checker.main import LinkChecker
+
+
+class TestRunDiff(unittest.TestCase):
+    """Tests for RunResults and RunDiff."""
+
+    def setUp(self):
+        """Create a temporary directory for results files."""
+        self.tmp_dir = tempfile.mkdtemp(prefix='linkchecker_diff_test_')
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_save_and_load(self):
+        """Test that results survive a round trip, with and without compression."""
+        results = RunResults("https://example.com",
+                             {("https://example.com/a", "https://example.com/x"): 404,
+                              ("https://example.com/a", "https://dead.org/"): 0},
+                             {"a.org", "dead.org"}, incomplete=True)
+        for name in ('results.json', 'results.json.gz'):
+            path = os.path.join(self.tmp_dir, name)
+            results.save(path)
+            loaded = RunResults.load(path)
+            self.assertEqual(loaded.root_url, results.root_url)
+            self.assertEqual(loaded.broken_links, results.broken_links)
+            self.assertEqual(loaded.external_hosts, results.external_hosts)
+            self.assertTrue(loaded.incomplete)
+
+    def test_load_rejects_unknown_format(self):
+        """Test that a file that is not a results file is rejected."""
+        path = os.path.join(self.tmp_dir, 'other.json')
+        with open(path, 'w') as f:
+            f.write('{"version": 99}')
+        with self.assertRaises(ValueError):
+            RunResults.load(path)
+
+    def test_diff(self):
+        """Test that new, fixed and persisting broken links are told apart."""
+        previous = RunResults("https://example.com",
+                              {("https://example.com/a", "https://example.com/old"): 404,
+                               ("https://example.com/a", "https://example.com/still"): 500},
+                              {"a.org"})
+        current = RunResults("https://example.com",
+                             {("https://example.com/a", "https://example.com/still"): 500,
+                              ("https://example.com/b", "https://example.com/new"): 404},
+                             {"a.org", "b.org"})
+
+        diff = RunDiff(previous, current)
+        self.assertEqual(diff.new, {("https://example.com/b", "https://example.com/new"): 404})
+        self.assertEqual(diff.fixed, {("https://example.com/a", "https://example.com/old"): 404})
+        self.assertEqual(list(diff.persisting),
+                         [("https://example.com/a", "https://example.com/still")])
+        self.assertEqual(diff.new_external_hosts, {"b.org"})
+        self.assertTrue(diff.has_regressions)
+        self.assertFalse(RunDiff(current, current).has_regressions)
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            diff.print_report()
+        report = output.getvalue()
+        self.assertIn("=== NEW BROKEN LINKS (1) ===", report)
+        self.assertIn("  - https://example.com/new (Status: 404)", report)
+        self.assertIn("Persisting broken links: 1", report)
+        self.assertIn("  - b.org", report)
+
+    def test_cli_fail_on_regression(self):
+        """Test that --fail-on-regression only fails when new broken links appear."""
+        previous_path = os.path.join(self.tmp_dir, 'previous.json.gz')
+        current_path = os.path.join(self.tmp_dir, 'current.json.gz')
+        RunResults("https://example.com",
+                   {("https://example.com", "https://example.com/old"): 404},
+                   set()).save(previous_path)
+
+        def fake_run(checker):
+            checker.broken_links.record("https://example.com", "https://example.com/new", 404)
+            checker.external_links.record("https://example.com", "https://a.org/page")
+            return checker.broken_links, checker.internal_assets
+
+        args = ["https://example.com", "--compare-to", previous_path,
+                "--save-results", current_path]
+        with patch.object(LinkChecker, 'run', fake_run), \
+                patch('link_checker.cli.setup_logging'), \
+                redirect_stdout(io.StringIO()):
+            self.assertEqual(main(args), 0)
+            self.assertEqual(main(args + ["--fail-on-regression"]), 1)
+
+            # Compared with itself, the run has no regressions
+            self.assertEqual(main(["https://example.com", "--compare-to", current_path,
+                                   "--fail-on-regression"]), 0)
+
+        self.assertEqual(RunResults.load(current_path).external_hosts, {"a.org"})
+
+
+if __name__ == '__main__':
+    unittest.main()
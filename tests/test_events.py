@@ -0,0 +1,131 @@
+"""Tests for streaming results while a check runs."""
+
+import asyncio
+import threading
+import unittest
+from unittest.mock import patch
+
+from link_checker.events import (AssetFound, BrokenLink, EventStream, ExternalVerdict,
+                                 PageVisited)
+from link_checker.main import LinkChecker
+from tests.fake_site import FakeSite
+
+PAGES = {
+    "https://example.com": ('<a href="/a.html">A</a>'
+                            '<a href="/missing.html">Missing</a>'
+                            '<img src="/logo.png">'
+                            '<a href="https://external.org/page">External</a>'),
+    "https://example.com/a.html": '<a href="https://external.org/gone">Gone</a>',
+}
+
+
+class TestEventStream(unittest.TestCase):
+    """Tests for the EventStream class."""
+
+    def test_events_are_delivered_in_order(self):
+        """Test that published events are returned in order until the stream closes."""
+        stream = EventStream()
+        events = [PageVisited("https://example.com", 200, 0),
+                  BrokenLink("https://example.com", "https://example.com/x", 404)]
+        for event in events:
+            self.assertTrue(stream.publish(event))
+        stream.close()
+        self.assertEqual([stream.get(), stream.get(), stream.get()], events + [None])
+
+    def test_publish_waits_while_full(self):
+        """Test that a full stream holds producers back until the consumer catches up."""
+        stream = EventStream(max_queued=1)
+        stream.publish(PageVisited("https://example.com/1", 200, 0))
+        published = threading.Event()
+
+        def publish_second():
+            stream.publish(PageVisited("https://example.com/2", 200, 0))
+            published.set()
+
+        producer = threading.Thread(target=publish_second)
+        producer.start()
+        self.assertFalse(published.wait(0.3))
+        self.assertEqual(stream.get().url, "https://example.com/1")
+        self.assertTrue(published.wait(2))
+        producer.join()
+
+    def test_cancel_releases_producers(self):
+        """Test that cancelling drops events instead of blocking their producers."""
+        stream = EventStream(max_queued=1)
+        stream.publish(PageVisited("https://example.com/1", 200, 0))
+        stream.cancel()
+        self.assertFalse(stream.publish(PageVisited("https://example.com/2", 200, 0)))
+        self.assertIsNone(stream.get())
+
+    def test_records_use_slots(self):
+        """Test that records have no per-instance dict and compare by value."""
+        record = ExternalVerdict("https://external.org", 200, cached=True)
+        self.assertFalse(hasattr(record, '__dict__'))
+        self.assertEqual(record, ExternalVerdict("https://external.org", 200, True))
+        self.assertEqual(repr(record),
+                         "ExternalVerdict(url='https://external.org', status_code=200, "
+                         "cached=True)")
+
+
+class TestIterEvents(unittest.TestCase):
+    """Tests for LinkChecker.iter_events() and aiter_events()."""
+
+    def setUp(self):
+        FakeSite(PAGES, {"https://external.org/gone": 404}).serve_during(self)
+
+    def test_results_are_streamed(self):
+        """Test that every kind of result is yielded and the results are kept."""
+        checker = LinkChecker("https://example.com")
+        events = list(checker.iter_events(max_queued=2))
+        checker.close()
+
+        self.assertIn(PageVisited("https://example.com", 200, 0), events)
+        self.assertIn(PageVisited("https://example.com/a.html", 200, 1), events)
+        self.assertIn(BrokenLink("https://example.com", "https://example.com/missing.html", 404),
+                      events)
+        self.assertIn(AssetFound("https://example.com", "https://example.com/logo.png", 'image'),
+                      events)
+        self.assertIn(ExternalVerdict("https://external.org/page", 200), events)
+        self.assertIn(BrokenLink("https://example.com/a.html", "https://external.org/gone", 404),
+                      events)
+        self.assertEqual(checker.broken_links["https://example.com/a.html"],
+                         {"https://external.org/gone": 404})
+        self.assertFalse(checker.incomplete_reasons)
+        self.assertIsNone(checker.event_stream)
+
+    def test_leaving_early_cancels_the_run(self):
+        """Test that breaking out of the loop cancels the remaining phases."""
+        checker = LinkChecker("https://example.com")
+        with patch.object(checker, 'check_external_links') as mock_external:
+            for event in checker.iter_events(max_queued=1):
+                break
+        checker.close()
+
+        mock_external.assert_not_called()
+        self.assertIn("Event consumer stopped", checker.incomplete_reasons)
+        self.assertIsNone(checker.event_stream)
+
+    def test_async_iteration(self):
+        """Test that the asynchronous iterator yields the same records."""
+        checker = LinkChecker("https://example.com")
+
+        async def collect():
+            return [event async for event in checker.aiter_events()]
+
+        events = asyncio.run(collect())
+        checker.close()
+
+        self.assertIn(PageVisited("https://example.com", 200, 0), events)
+        self.assertIn(ExternalVerdict("https://external.org/gone", 404), events)
+
+    def test_errors_are_raised_to_the_consumer(self):
+        """Test that an exception raised by the run is raised by the iterator."""
+        checker = LinkChecker("https://example.com")
+        with patch.object(checker, 'link_checker', side_effect=ValueError("boom")):
+            with self.assertRaises(ValueError):
+                list(checker.iter_events())
+        checker.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
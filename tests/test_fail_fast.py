@@ -0,0 +1,98 @@
+"""Tests for the fail-fast mode."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from link_checker.main import LinkChecker
+from tests.fake_site import FakeSite
+
+PAGES = {
+    "https://example.com": '<a href="/a.html">A</a><a href="/b.html">B</a>',
+    "https://example.com/a.html": '<a href="/c.html">C</a><a href="/d.html">D</a>',
+    "https://example.com/b.html": '<a href="https://ext.org/ok">Ok</a>',
+    "https://example.com/c.html": '<a href="https://ext.org/gone">Gone</a>',
+    "https://example.com/d.html": '<img src="/missing.png">',
+}
+
+STATUS = {"https://ext.org/gone": 404, "https://example.com/missing.png": 404}
+
+
+class TestFailFast(unittest.TestCase):
+    """Tests for stopping at the first broken links and checking likely ones first."""
+
+    def setUp(self):
+        self.site = FakeSite(PAGES, STATUS)
+        self.site.serve_during(self)
+
+    def run_checker(self, **kwargs):
+        checker = LinkChecker("https://example.com", max_threads=1, max_external_threads=1,
+                              **kwargs)
+        with patch.object(checker, 'check_external_links',
+                          wraps=checker.check_external_links) as mock_external:
+            checker.run()
+        checker.close()
+        return checker, mock_external
+
+    def test_run_stops_at_the_threshold(self):
+        """Test that the remaining phases are skipped once enough links are broken."""
+        checker, mock_external = self.run_checker(fail_fast=1)
+
+        self.assertEqual(checker.broken_urls_found, {"https://example.com/missing.png"})
+        self.assertEqual(checker.incomplete_reasons,
+                         ["Stopped after finding 1 broken links (fail-fast)"])
+        mock_external.assert_not_called()
+        self.assertNotIn("https://ext.org/ok", self.site.urls)
+
+    def test_threshold_not_reached(self):
+        """Test that a run with fewer broken links than the threshold checks everything."""
+        checker, mock_external = self.run_checker(fail_fast=3)
+
+        self.assertEqual(checker.broken_urls_found,
+                         {"https://example.com/missing.png", "https://ext.org/gone"})
+        self.assertFalse(checker.incomplete_reasons)
+        mock_external.assert_called_once()
+
+    def test_suspect_links_are_checked_first(self):
+        """Test that the pages of suspect links are visited first and their targets
+        checked right away."""
+        checker, _ = self.run_checker(
+            fail_fast=1,
+            suspect_links=[("https://example.com/c.html", "https://ext.org/gone")])
+
+        self.assertEqual(self.site.urls[0], "https://example.com/c.html")
+        self.assertIn("https://ext.org/gone", self.site.urls)
+        self.assertNotIn("https://example.com/a.html", self.site.urls)
+        self.assertEqual(checker.broken_links,
+                         {"https://example.com/c.html": {"https://ext.org/gone": 404}})
+
+    def test_missing_suspect_page_is_not_reported(self):
+        """Test that a suspect page that no longer exists is only reported if linked."""
+        checker, _ = self.run_checker(
+            fail_fast=5,
+            suspect_links=[("https://example.com/removed.html", "https://ext.org/gone")])
+
+        self.assertEqual(self.site.urls[0], "https://example.com/removed.html")
+        self.assertNotIn("https://example.com/removed.html", checker.broken_urls_found)
+
+    def test_new_links_are_checked_during_the_crawl(self):
+        """Test that links added since the incremental state are checked first, and
+        that their verdicts are reused by the later phases."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state = os.path.join(temp_dir, 'state.sqlite')
+            self.run_checker(incremental_state=state)
+
+            self.site.pages["https://example.com/b.html"] += '<a href="https://ext.org/new">N</a>'
+            self.site.requests.clear()
+            checker, _ = self.run_checker(incremental_state=state, fail_fast=5)
+
+        # The new link is checked during the crawl, the old broken one in its phase
+        new_index = self.site.urls.index("https://ext.org/new")
+        self.assertLess(new_index, self.site.urls.index("https://ext.org/gone"))
+        self.assertEqual(self.site.urls.count("https://ext.org/new"), 1)
+        self.assertEqual(checker.early_verdicts, {"https://ext.org/new": 200})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+"""Tests for incremental crawls."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from link_checker.incremental import CrawlState, parse_lastmod, parse_sitemap
+from link_checker.main import LinkChecker
+from tests.fake_site import FakeSite
+
+PAGES = {
+    "https://example.com": '<a href="/a.html">A</a><a href="/b.html">B</a>',
+    "https://example.com/a.html": ('<link rel="stylesheet" href="/style.css">'
+                                   '<a href="https://ext.org/">Ext</a>'),
+    "https://example.com/b.html": '<a href="/a.html">A</a><img src="/missing.png">',
+}
+
+STATUS = {"https://example.com/missing.png": 404}
+
+
+class TestIncrementalCrawl(unittest.TestCase):
+    """Tests for reusing the previous run's link graph."""
+
+    def setUp(self):
+        """Create a temporary directory for the state file."""
+        self.tmp_dir = tempfile.mkdtemp(prefix='linkchecker_incremental_test_')
+        self.state_path = os.path.join(self.tmp_dir, 'state.sqlite')
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def run_checker(self, site, **kwargs):
+        """Run a checker against the fake site and return it."""
+        checker = LinkChecker("https://example.com", incremental_state=self.state_path,
+                              **kwargs)
+        with site.serve():
+            checker.run()
+        checker.close()
+        return checker
+
+    def test_unchanged_pages_are_reused(self):
+        """Test that a second run reuses pages and healthy targets."""
+        site = FakeSite(PAGES, STATUS, etags=True)
+        first = self.run_checker(site)
+        self.assertEqual(len(site.get_urls), 3)
+        self.assertEqual(sorted(site.head_urls), ["https://example.com/missing.png",
+                                                  "https://example.com/style.css",
+                                                  "https://ext.org/"])
+
+        # Conditional requests: every page answers 304 and nothing is parsed again
+        site = FakeSite(PAGES, STATUS, etags=True)
+        second = self.run_checker(site)
+        self.assertEqual(len(site.get_urls), 3)
+        self.assertEqual(second.crawl_state.pages_not_modified, 3)
+        # Only the previously broken asset is verified again
+        self.assertEqual(site.head_urls, ["https://example.com/missing.png"])
+        self.assertEqual(dict(second.internal_assets), dict(first.internal_assets))
+        self.assertEqual(dict(second.external_links), dict(first.external_links))
+        self.assertEqual(dict(second.broken_links), dict(first.broken_links))
+
+        # A deploy manifest: only the listed page is requested
+        site = FakeSite(PAGES, STATUS, etags=True)
+        site.pages["https://example.com/b.html"] = '<a href="/c.html">C</a>'
+        third = self.run_checker(site, changed_paths=["/b.html"])
+        self.assertEqual(site.get_urls, ["https://example.com/b.html",
+                                         "https://example.com/c.html"])
+        self.assertEqual(third.crawl_state.pages_skipped, 2)
+        self.assertEqual(dict(third.broken_links),
+                         {"https://example.com/b.html": {"https://example.com/c.html": 404}})
+        self.assertEqual(site.head_urls, [])
+
+    def test_sitemap_lastmod(self):
+        """Test that pages older than their sitemap lastmod are not requested."""
+        state = CrawlState(self.state_path)
+        state.sitemap = {"https://example.com/a.html": 100.0,
+                         "https://example.com/b.html": 300.0}
+        page = {'checked_at': 200.0}
+        self.assertTrue(state.is_unchanged("https://example.com/a.html", page))
+        self.assertFalse(state.is_unchanged("https://example.com/b.html", page))
+        self.assertFalse(state.is_unchanged("https://example.com/c.html", page))
+        state.close()
+
+    def test_changed_paths(self):
+        """Test matching pages against a deploy manifest."""
+        state = CrawlState(self.state_path,
+                           changed_paths=["docs/intro.html", "https://example.com/blog/"])
+        page = {'checked_at': 0.0}
+        self.assertFalse(state.is_unchanged("https://example.com/docs/intro.html", page))
+        self.assertFalse(state.is_unchanged("https://example.com/site/docs/intro.html", page))
+        self.assertFalse(state.is_unchanged("https://example.com/blog/index.html", page))
+        self.assertTrue(state.is_unchanged("https://example.com/docs/other.html", page))
+        state.close()
+
+    def test_parse_sitemap(self):
+        """Test reading lastmod dates from a sitemap and a sitemap index."""
+        pages, children = parse_sitemap(
+            b'<?xml version="1.0" encoding="UTF-8"?>'
+            b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            b'<url><loc>https://example.com/a/</loc><lastmod>1970-01-02</lastmod></url>'
+            b'<url><loc>https://example.com/b.html</loc></url>'
+            b'</urlset>')
+        self.assertEqual(pages, {"https://example.com/a": 86400.0,
+                                 "https://example.com/b.html": None})
+        self.assertEqual(children, [])
+
+        pages, children = parse_sitemap(
+            b'<sitemapindex><sitemap><loc>https://example.com/s1.xml</loc></sitemap>'
+            b'</sitemapindex>')
+        self.assertEqual(children, ["https://example.com/s1.xml"])
+
+        self.assertEqual(parse_lastmod("1970-01-01T01:00:00Z"), 3600.0)
+        self.assertEqual(parse_lastmod("1970-01-01T01:00:00+01:00"), 0.0)
+        self.assertIsNone(parse_lastmod("yesterday"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,12 @@
 """Tests for the LinkChecker class."""
 
+import inspect
+import threading
 import unittest
 from unittest.mock import patch, MagicMock
 import requests
 
-from link_checker.main import LinkChecker
+from link_checker.main import LinkChecker, link_checker
 
 
 class TestLinkChecker(unittest.TestCase):
@@ -161,7 +163,7 @@ class TestLinkChecker(unittest.TestCase):
         # Test cases for different URL scenarios
         test_cases = [
             # URL, content_type, status_code, expected_content, expected_status
-            ("https://example.com", "text/html", 200, "<html></html>", 200),
+            ("https://example.com", "text/html", 200, b"<html></html>", 200),
             ("https://example.com/api", "application/json", 200, None, 200),
             ("https://example.com/not-found", "text/html", 404, None, 404),
             ("https://example.com/error", None, None, None, None),
@@ -183,7 +185,7 @@ class TestLinkChecker(unittest.TestCase):
                     if content_type:
                         mock_response.headers = {'Content-Type': content_type}
                     if expected_content:
-                        mock_response.text = expected_content
+                        mock_response.content = expected_content
 
                     # Patch the session.get method to return our mock
                     with patch('requests.Session.get', return_value=mock_response):
@@ -327,6 +329,33 @@ class TestLinkChecker(unittest.TestCase):
         self.assertIn("https://example.com/js/script.js",
                       list(checker.internal_assets["https://example.com"].keys()))
 
+    def test_parse_page_buffers_links(self):
+        """Test that a page is parsed into local buffers and merged in one step."""
+        checker = LinkChecker("https://example.com", ignored_external_links=['https://ignored.org'])
+
+        html_content = """
+        <a href="/page1.html">Page 1</a>
+        <a href="https://ext.org/">Ext</a>
+        <a href="https://ext.org/">Ext again</a>
+        <a href="https://ignored.org/x">Ignored</a>
+        <img src="/logo.png"><img src="/logo.png">
+        <link rel="icon" href="/favicon.ico">
+        """
+
+        edges = checker._parse_page("https://example.com/", html_content)
+        self.assertEqual(edges['links'], ["https://example.com/page1.html"])
+        self.assertEqual(edges['assets'], {"https://example.com/logo.png": "image"})
+        self.assertEqual(edges['external'], ["https://ext.org/"])
+        self.assertEqual(edges['ignored_external'], ["https://ignored.org/x"])
+        self.assertEqual(edges['counts'], [2, 0, 2, 1])
+
+        # Nothing is shared until the buffers are merged
+        self.assertEqual(checker.external_links, {})
+        checker._record_page_edges("https://example.com/", edges)
+        self.assertEqual(checker.external_links, {"https://example.com": {"https://ext.org/"}})
+        self.assertEqual(checker.internal_assets_count, 2)
+        self.assertEqual(checker.external_urls_count, 2)
+
     def test_should_not_crawl(self):
         """Test that internal paths that should not be crawled are correctly
         identified."""
@@ -613,7 +642,7 @@ class TestLinkChecker(unittest.TestCase):
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.headers = {'Content-Type': 'text/html'}
-            mock_response.text = "<html><body>Test</body></html>"
+            mock_response.content = b"<html><body>Test</body></html>"
             mock_get.return_value = mock_response
 
             # Clear the visited_urls set
@@ -636,6 +665,177 @@ class TestLinkChecker(unittest.TestCase):
             self.assertIn("https://example.com/voyager/index.html", checker.visited_urls)
             self.assertIn("https://example.com/voyager", checker.visited_urls)
 
+    def test_group_urls_by_host(self):
+        """Test that external URLs are grouped by host, busiest host first."""
+        groups = LinkChecker._group_urls_by_host({
+            "https://a.org/2", "https://b.org/1", "https://a.org/1",
+            "https://c.org/1", "https://B.org/2", "https://b.org/3"
+        })
+
+        self.assertEqual([host for host, _ in groups], ["b.org", "a.org", "c.org"])
+        self.assertEqual(dict(groups)["a.org"], ["https://a.org/1", "https://a.org/2"])
+
+    def check_hosts_concurrently(self, max_external_threads):
+        """Check external links on three hosts whose requests block until they overlap.
+
+        The first request to each host waits until a second one to the same host is in
+        flight, so the per-host limit is actually reached.
+
+        Returns:
+            A tuple of (number of HEAD requests, highest number of concurrent requests
+            per host, hosts in the order in which they were first requested).
+        """
+        checker = LinkChecker("https://example.com", max_external_threads=max_external_threads,
+                              max_connections_per_host=2)
+        self.addCleanup(checker.close)
+        # The hosts with the most URLs are checked first
+        urls = {f"https://host{h}.org/page{i}" for h, count in enumerate((6, 4, 2))
+                for i in range(count)}
+        checker.external_links["https://example.com"] = set(urls)
+
+        lock = threading.Lock()
+        active = {}
+        max_active = {}
+        overlapped = {f"host{h}.org": threading.Event() for h in range(3)}
+        first_requested = []
+
+        def head_side_effect(url, **kwargs):
+            host = url.split('/')[2]
+            with lock:
+                if host not in active:
+                    first_requested.append(host)
+                active[host] = active.get(host, 0) + 1
+                max_active[host] = max(max_active.get(host, 0), active[host])
+                if active[host] >= 2:
+                    overlapped[host].set()
+            overlapped[host].wait(5)
+            # Stay in flight long enough for more requests to the host to pile up
+            threading.Event().wait(0.005)
+            with lock:
+                active[host] -= 1
+            response = MagicMock()
+            response.status_code = 200
+            return response
+
+        with patch('requests.Session.head', side_effect=head_side_effect) as mock_head, \
+                patch('link_checker.main.time.sleep'):
+            checker.check_external_links()
+
+        self.assertEqual(checker.broken_links, {})
+        self.assertTrue(all(event.is_set() for event in overlapped.values()))
+        return mock_head.call_count, max_active, first_requested
+
+    def test_external_links_checked_grouped_by_host(self):
+        """Test that external checks stay on one host and respect the per-host limit."""
+        requests_made, max_active, first_requested = self.check_hosts_concurrently(2)
+        self.assertEqual(requests_made, 12)
+        self.assertEqual(max_active, {"host0.org": 2, "host1.org": 2, "host2.org": 2})
+        self.assertEqual(first_requested, ["host0.org", "host1.org", "host2.org"])
+
+        # More workers than the per-host limit still never put more requests on a host
+        requests_made, max_active, _ = self.check_hosts_concurrently(6)
+        self.assertEqual(requests_made, 12)
+        self.assertEqual(max_active, {"host0.org": 2, "host1.org": 2, "host2.org": 2})
+
+    def test_time_budget_split(self):
+        """Test that the time budget is shared between phases by proportion."""
+        checker = LinkChecker("https://example.com", max_time=100.0,
+                              max_time_split=[50, 25, 25], grace_period=5.0)
+
+        with patch('link_checker.main.time.monotonic', return_value=1000.0):
+            checker._deadline = 1000.0 + checker.max_time
+            self.assertTrue(checker._begin_phase(0, 'crawl'))
+            self.assertEqual(checker._phase_deadline, 1050.0)
+            self.assertEqual(checker._phase_stop_at, 1045.0)
+            self.assertEqual(checker._request_timeout(), 10.0)
+
+        # Time left over by the crawl goes to the following phases
+        with patch('link_checker.main.time.monotonic', return_value=1020.0):
+            self.assertTrue(checker._begin_phase(1, 'asset'))
+            self.assertEqual(checker._phase_deadline, 1060.0)
+
+        with patch('link_checker.main.time.monotonic', return_value=1098.0):
+            self.assertTrue(checker._should_stop())
+            self.assertEqual(checker.incomplete_reasons,
+                             ["Time budget for the asset phase ran out"])
+            self.assertEqual(checker._request_timeout(), 0.1)
+
+        with patch('link_checker.main.time.monotonic', return_value=1101.0):
+            self.assertFalse(checker._begin_phase(2, 'external link'))
+
+    @patch('link_checker.main.LinkChecker._check_url')
+    @patch('link_checker.main.LinkChecker._extract_links')
+    def test_time_budget_stops_crawl(self, mock_extract_links, mock_check_url):
+        """Test that an endless crawl stops when the time budget runs out."""
+        import io
+        import sys
+        import time
+        import itertools
+
+        checker = LinkChecker("https://example.com", max_time=0.5, grace_period=0.1,
+                              max_threads=2)
+        counter = itertools.count()
+
+        def check_url_side_effect(url):
+            checker.visited_urls.add(url)
+            time.sleep(0.01)
+            return ("<html></html>", 200)
+
+        mock_check_url.side_effect = check_url_side_effect
+        mock_extract_links.side_effect = lambda url, html: [
+            f"https://example.com/page{next(counter)}.html" for _ in range(3)]
+
+        started = time.monotonic()
+        checker.run()
+        self.assertLess(time.monotonic() - started, 2.0)
+        self.assertIn("Time budget for the crawl phase ran out", checker.incomplete_reasons)
+
+        captured_output = io.StringIO()
+        original_stdout = sys.stdout
+        sys.stdout = captured_output
+        try:
+            checker.print_report()
+        finally:
+            sys.stdout = original_stdout
+        output = captured_output.getvalue()
+        self.assertTrue(output.startswith("=== INCOMPLETE REPORT ==="))
+        self.assertIn("Run was cut short - report is incomplete", output)
+
+
+class TestLinkCheckerFunction(unittest.TestCase):
+    """Tests for the link_checker() convenience function."""
+
+    def test_every_option_is_accepted(self):
+        """Test that the function takes every option of LinkChecker, with its default."""
+        checker_options = inspect.signature(LinkChecker.__init__).parameters
+        function_options = inspect.signature(link_checker).parameters
+        for name, option in checker_options.items():
+            if name in ('self', 'root_url'):
+                continue
+            with self.subTest(option=name):
+                self.assertIn(name, function_options)
+                self.assertEqual(function_options[name].default, option.default)
+
+    @patch('link_checker.main.LinkChecker')
+    def test_options_are_forwarded(self, mock_link_checker_cls):
+        """Test that the options are passed on to the checker, which is closed."""
+        checker = mock_link_checker_cls.return_value
+        checker.run.return_value = ({}, {})
+
+        result = link_checker("https://example.com", respect_robots=True, fail_fast=2,
+                              pages=["a.html"], canonical_rules={'sort_params': True},
+                              reuse_link_blocks=False, max_in_flight=4)
+
+        self.assertEqual(result, ({}, {}))
+        kwargs = mock_link_checker_cls.call_args.kwargs
+        self.assertTrue(kwargs['respect_robots'])
+        self.assertEqual(kwargs['fail_fast'], 2)
+        self.assertEqual(kwargs['pages'], ["a.html"])
+        self.assertEqual(kwargs['canonical_rules'], {'sort_params': True})
+        self.assertFalse(kwargs['reuse_link_blocks'])
+        self.assertEqual(kwargs['max_in_flight'], 4)
+        checker.close.assert_called_once()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,121 @@
+"""Tests for retrying transient request failures."""
+
+import io
+import sys
+import unittest
+from unittest.mock import patch, MagicMock
+
+import requests
+
+from link_checker.main import LinkChecker
+from link_checker.retry import RetryPolicy, parse_retry_after
+
+
+def make_response(status_code, headers=None):
+    """Create a mock response with a status code and headers."""
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {'Content-Type': 'text/html'}
+    response.content = b"<html></html>"
+    return response
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """Tests for the RetryPolicy class."""
+
+    def test_parse_retry_after(self):
+        """Test parsing of Retry-After header values."""
+        self.assertEqual(parse_retry_after("120"), 120.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+        with patch('link_checker.retry.time.time', return_value=784111777.0):
+            self.assertEqual(parse_retry_after("Sun, 06 Nov 1994 08:49:47 GMT"), 10.0)
+
+    def test_backoff_and_retry_after(self):
+        """Test that delays are bounded and honor Retry-After."""
+        policy = RetryPolicy(max_retries=3, backoff=1.0, backoff_max=5.0, host_budget=100)
+
+        for attempt in range(3):
+            delay = policy.get_delay("a.org", attempt)
+            self.assertIsNotNone(delay)
+            self.assertLessEqual(delay, min(5.0, 2 ** attempt))
+
+        # No more retries after max_retries
+        self.assertIsNone(policy.get_delay("a.org", 3))
+
+        # Retry-After is the minimum delay, and is not honored beyond backoff_max
+        self.assertGreaterEqual(policy.get_delay("a.org", 0, "4"), 4.0)
+        self.assertIsNone(policy.get_delay("a.org", 0, "60"))
+
+    def test_host_budget(self):
+        """Test that a host's retry budget limits the retries made to it."""
+        policy = RetryPolicy(max_retries=5, backoff=0.0, host_budget=2)
+
+        self.assertIsNotNone(policy.get_delay("busy.org", 0))
+        self.assertIsNotNone(policy.get_delay("busy.org", 0))
+        self.assertIsNone(policy.get_delay("busy.org", 0))
+        self.assertIsNotNone(policy.get_delay("other.org", 0))
+        self.assertEqual(policy.exhausted_hosts(), {"busy.org"})
+
+
+class TestRequestRetries(unittest.TestCase):
+    """Tests for retries made by the LinkChecker."""
+
+    def test_check_url_recovers_after_503(self):
+        """Test that a 503 followed by a 200 is not reported as broken."""
+        checker = LinkChecker("https://example.com", max_retries=2)
+
+        with patch('requests.Session.get',
+                   side_effect=[make_response(503, {'Retry-After': '1'}),
+                                make_response(200)]) as mock_get, \
+                patch('link_checker.main.time.sleep') as mock_sleep:
+            content, status = checker._check_url("https://example.com/page.html")
+
+        self.assertEqual(status, 200)
+        self.assertEqual(content, b"<html></html>")
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertGreaterEqual(mock_sleep.call_args[0][0], 1.0)
+        self.assertEqual(checker.retry_policy.retried_requests(),
+                         {"https://example.com/page.html": (1, 200)})
+
+        # The recovered request appears in the report
+        captured_output = io.StringIO()
+        original_stdout = sys.stdout
+        sys.stdout = captured_output
+        try:
+            checker.print_report()
+        finally:
+            sys.stdout = original_stdout
+        output = captured_output.getvalue()
+        self.assertIn("=== RETRIED REQUESTS ===", output)
+        self.assertIn("https://example.com/page.html (1 retries, recovered, Status: 200)",
+                      output)
+
+    def test_connection_errors_exhaust_retries(self):
+        """Test that a persistent connection error is raised after the last retry."""
+        checker = LinkChecker("https://example.com", max_retries=2)
+
+        with patch('requests.Session.get',
+                   side_effect=requests.ConnectionError("Connection reset")) as mock_get, \
+                patch('link_checker.main.time.sleep'):
+            content, status = checker._check_url("https://example.com/page.html")
+
+        self.assertIsNone(status)
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(checker.request_count, 2)
+        self.assertEqual(checker.retry_policy.retried_requests(),
+                         {"https://example.com/page.html": (2, 0)})
+
+    def test_retries_disabled_by_default(self):
+        """Test that no retries are made unless configured."""
+        checker = LinkChecker("https://example.com")
+
+        with patch('requests.Session.get', return_value=make_response(503)) as mock_get:
+            content, status = checker._check_url("https://example.com/page.html")
+
+        self.assertEqual(status, 503)
+        mock_get.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,181 @@
+"""Tests for robots.txt support."""
+
+import threading
+import unittest
+from unittest.mock import patch, MagicMock
+
+import requests
+
+from link_checker.main import LinkChecker
+from link_checker.robots import HostPacer, RobotsCache
+from tests.fake_site import FakeSite
+
+ROBOTS_TXT = """
+User-agent: link_checker
+Disallow: /private/
+Crawl-delay: 2
+
+User-agent: *
+Disallow: /
+"""
+
+PAGES = {
+    "https://example.com": ('<a href="/public.html">Public</a>'
+                            '<a href="/private/secret.html">Secret</a>'
+                            '<img src="/private/logo.png">'),
+    "https://example.com/public.html": 'Public',
+}
+
+
+class TestRobotsCache(unittest.TestCase):
+    """Tests for the RobotsCache class."""
+
+    def make_cache(self, *responses):
+        """Create a cache whose fetcher returns the given responses."""
+        fetch = MagicMock(side_effect=list(responses))
+        return RobotsCache(fetch, 'link_checker/0.1.0'), fetch
+
+    def test_rules_are_fetched_once_per_host(self):
+        """Test that the rules of a host are fetched once and applied."""
+        cache, fetch = self.make_cache((200, ROBOTS_TXT), (404, ''))
+
+        self.assertTrue(cache.allowed("https://example.com/page.html"))
+        self.assertFalse(cache.allowed("https://example.com/private/page.html"))
+        self.assertEqual(cache.request_interval("https://example.com/page.html"), 2.0)
+        self.assertTrue(cache.allowed("https://other.org/private/page.html"))
+        self.assertIsNone(cache.request_interval("https://other.org/page.html"))
+
+        self.assertEqual([call.args[0] for call in fetch.call_args_list],
+                         ["https://example.com/robots.txt", "https://other.org/robots.txt"])
+
+    def test_concurrent_lookups_fetch_once(self):
+        """Test that threads asking for the same host share one fetch."""
+        cache, fetch = self.make_cache((200, ROBOTS_TXT))
+        threads = [threading.Thread(target=cache.allowed,
+                                    args=("https://example.com/page.html",))
+                   for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        fetch.assert_called_once()
+
+    def test_server_error_disallows_everything(self):
+        """Test that a server error disallows the whole host."""
+        cache, _ = self.make_cache((503, ''))
+        self.assertFalse(cache.allowed("https://example.com/page.html"))
+
+    def test_unreachable_host_is_allowed(self):
+        """Test that a host whose robots.txt cannot be reached is allowed."""
+        cache, fetch = self.make_cache((0, ''))
+        self.assertTrue(cache.allowed("https://dead.org/page.html"))
+        self.assertTrue(cache.allowed("https://dead.org/other.html"))
+        fetch.assert_called_once()
+
+    def test_request_rate(self):
+        """Test that a Request-rate is turned into an interval between requests."""
+        cache, _ = self.make_cache((200, "User-agent: *\nRequest-rate: 4/10\n"))
+        self.assertTrue(cache.allowed("https://example.com/"))
+        self.assertEqual(cache.request_interval("https://example.com/"), 2.5)
+
+    def test_unfetched_rules_are_retried(self):
+        """Test that rules that could not be requested are fetched on the next lookup."""
+        cache, fetch = self.make_cache(None, (200, ROBOTS_TXT))
+        self.assertTrue(cache.allowed("https://example.com/private/page.html"))
+        self.assertFalse(cache.allowed("https://example.com/private/page.html"))
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_stale_rules_are_refetched(self):
+        """Test that rules older than max_age are fetched again."""
+        cache, fetch = self.make_cache((200, ROBOTS_TXT), (404, ''))
+        with patch('link_checker.robots.time.monotonic', return_value=100.0):
+            self.assertFalse(cache.allowed("https://example.com/private/page.html"))
+        with patch('link_checker.robots.time.monotonic', return_value=100.0 + 3600.0):
+            self.assertFalse(cache.allowed("https://example.com/private/page.html"))
+        self.assertEqual(fetch.call_count, 1)
+
+        with patch('link_checker.robots.time.monotonic', return_value=100.0 + 24 * 3600.0):
+            self.assertTrue(cache.allowed("https://example.com/private/page.html"))
+        self.assertEqual(fetch.call_count, 2)
+
+
+class TestHostPacer(unittest.TestCase):
+    """Tests for the HostPacer class."""
+
+    def test_requests_are_spaced_per_host(self):
+        """Test that each request to a host waits for the previous one's interval."""
+        pacer = HostPacer()
+        with patch('link_checker.robots.time.monotonic', return_value=100.0), \
+                patch('link_checker.robots.time.sleep') as mock_sleep:
+            pacer.wait("example.com", 2.0)
+            pacer.wait("example.com", 2.0)
+            pacer.wait("example.com", 2.0)
+            pacer.wait("other.org", 2.0)
+
+        self.assertEqual([call.args[0] for call in mock_sleep.call_args_list], [2.0, 4.0])
+
+
+class TestRespectRobots(unittest.TestCase):
+    """Tests for checking a site with robots.txt respected."""
+
+    def test_disallowed_urls_are_skipped(self):
+        """Test that disallowed pages and assets are reported as skipped, not broken."""
+        site = FakeSite(dict(PAGES, **{
+            "https://example.com/robots.txt": "User-agent: *\nDisallow: /private/\n"}))
+        checker = LinkChecker("https://example.com", respect_robots=True)
+        with site.serve():
+            checker.run()
+        checker.close()
+
+        self.assertEqual(checker.robots_skipped,
+                         {"https://example.com/private/secret.html",
+                          "https://example.com/private/logo.png"})
+        self.assertEqual(site.get_urls.count("https://example.com/robots.txt"), 1)
+        self.assertNotIn("https://example.com/private/secret.html", site.get_urls)
+        self.assertEqual(site.head_urls, [])
+        self.assertFalse(checker.broken_links)
+
+    def test_no_blanket_delay_with_pacing(self):
+        """Test that external links are paced by robots.txt instead of a fixed delay."""
+        site = FakeSite({
+            "https://example.com": '<a href="https://ext.org/a">A</a><a href="https://ext.org/b">B</a>',
+            "https://example.com/robots.txt": "User-agent: *\nCrawl-delay: 1\n",
+            "https://ext.org/robots.txt": "User-agent: *\nCrawl-delay: 1\n",
+        })
+        checker = LinkChecker("https://example.com", respect_robots=True)
+        with site.serve(), patch('time.sleep') as mock_sleep:
+            checker.run()
+        checker.close()
+
+        self.assertNotIn(0.2, [call.args[0] for call in mock_sleep.call_args_list])
+        self.assertEqual(dict(checker.broken_links), {})
+
+    def test_unreachable_host_is_reported_broken(self):
+        """Test that links to a host that cannot be reached are broken, not skipped."""
+        def fake_get(url, **kwargs):
+            if url.startswith("https://dead.org"):
+                raise requests.ConnectionError("Name or service not known")
+            response = MagicMock()
+            response.url = url
+            response.status_code = 200
+            response.headers = {'Content-Type': 'text/html'}
+            response.content = b'<a href="https://dead.org/page">Dead</a>'
+            return response
+
+        def fake_head(url, **kwargs):
+            raise requests.ConnectionError("Name or service not known")
+
+        checker = LinkChecker("https://example.com", respect_robots=True)
+        with patch('requests.Session.get', side_effect=fake_get), \
+                patch('requests.Session.head', side_effect=fake_head), \
+                patch('time.sleep'):
+            checker.run()
+        checker.close()
+
+        self.assertEqual(checker.robots_skipped, set())
+        self.assertEqual(dict(checker.broken_links),
+                         {"https://example.com": {"https://dead.org/page": 0}})
+
+
+if __name__ == '__main__':
+    unittest.main()
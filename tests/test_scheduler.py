@@ -0,0 +1,150 @@
+"""Tests for the shared request scheduler and the global request budget."""
+
+import threading
+import time
+import unittest
+
+from link_checker.main import LinkChecker
+from link_checker.scheduler import RequestBudget, RequestScheduler
+from tests.fake_site import FakeSite
+
+PAGES = {
+    "https://example.com": ('<a href="/a.html">A</a><a href="/b.html">B</a>'
+                            '<img src="/logo.png"><a href="https://ext.org/">Ext</a>'),
+    "https://example.com/a.html": '<img src="/a.png"><a href="https://ext.org/a">Ext</a>',
+    "https://example.com/b.html": '<img src="/b.png"><a href="https://ext.org/b">Ext</a>',
+}
+
+
+class TestRequestBudget(unittest.TestCase):
+    """Tests for the RequestBudget class."""
+
+    def test_reservations_never_exceed_limit(self):
+        """Test that concurrent reservations stop exactly at the limit."""
+        budget = RequestBudget(100)
+        granted = []
+
+        def reserve_many():
+            granted.append(sum(1 for _ in range(50) if budget.reserve()))
+
+        threads = [threading.Thread(target=reserve_many) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sum(granted), 100)
+        self.assertEqual(budget.used, 100)
+        self.assertEqual(budget.denied, 300)
+        self.assertTrue(budget.exhausted)
+
+        budget.reset()
+        self.assertFalse(budget.exhausted)
+        self.assertTrue(budget.reserve())
+
+    def test_unlimited_budget(self):
+        """Test that a budget without a limit is never exhausted."""
+        budget = RequestBudget()
+        for _ in range(1000):
+            self.assertTrue(budget.reserve())
+        self.assertFalse(budget.exhausted)
+
+
+class TestRequestScheduler(unittest.TestCase):
+    """Tests for the RequestScheduler class."""
+
+    def test_in_flight_limit(self):
+        """Test that no more than max_in_flight requests run at once."""
+        scheduler = RequestScheduler(max_workers=8, max_in_flight=3)
+        lock = threading.Lock()
+        current = [0]
+        peak = [0]
+
+        def request():
+            with scheduler.in_flight():
+                with lock:
+                    current[0] += 1
+                    peak[0] = max(peak[0], current[0])
+                time.sleep(0.01)
+                with lock:
+                    current[0] -= 1
+
+        futures = [scheduler.submit(request) for _ in range(20)]
+        for future in futures:
+            future.result()
+        scheduler.close()
+
+        self.assertEqual(peak[0], 3)
+
+    def test_no_in_flight_limit_by_default(self):
+        """Test that only a limit below the pool size holds requests back."""
+        self.assertIsNone(RequestScheduler(max_workers=4)._in_flight)
+        self.assertIsNone(RequestScheduler(max_workers=4, max_in_flight=4)._in_flight)
+        self.assertIsNotNone(RequestScheduler(max_workers=4, max_in_flight=2)._in_flight)
+        with RequestScheduler(max_workers=1).in_flight():
+            pass
+
+    def test_pool_is_recreated_after_close(self):
+        """Test that the scheduler can be used again after it was closed."""
+        scheduler = RequestScheduler(max_workers=2, max_in_flight=2)
+        self.assertEqual(scheduler.submit(lambda x: x + 1, 1).result(), 2)
+        scheduler.close()
+        self.assertEqual(scheduler.submit(lambda x: x * 2, 2).result(), 4)
+        scheduler.close()
+
+
+class TestSharedScheduler(unittest.TestCase):
+    """Tests for the LinkChecker's use of the shared scheduler."""
+
+    def run_checker(self, checker):
+        """Run a checker against the fake site."""
+        site = FakeSite(PAGES)
+        with site.serve():
+            checker.run()
+        return len(site.requests)
+
+    def test_max_requests_is_a_global_cap(self):
+        """Test that max_requests limits the requests of all phases together."""
+        checker = LinkChecker("https://example.com", max_requests=5)
+        try:
+            requests_made = self.run_checker(checker)
+        finally:
+            checker.close()
+
+        self.assertEqual(requests_made, 5)
+        self.assertEqual(checker.request_count, 5)
+        self.assertTrue(checker.incomplete_reasons)
+
+    def test_checker_can_be_run_again(self):
+        """Test that a second run starts from fresh results and reuses the pool."""
+        checker = LinkChecker("https://example.com", max_requests=100)
+        try:
+            first = self.run_checker(checker)
+            first_pages = checker.actual_visited_pages_count
+            executor = checker.scheduler._executor
+            second = self.run_checker(checker)
+            self.assertIs(checker.scheduler._executor, executor)
+        finally:
+            checker.close()
+
+        self.assertIsNotNone(executor)
+        self.assertEqual(first, second)
+        self.assertEqual(checker.request_count, second)
+        self.assertEqual(checker.actual_visited_pages_count, first_pages)
+        self.assertFalse(checker.incomplete_reasons)
+
+    def test_request_count_can_be_reset(self):
+        """Test that setting request_count changes how much of the budget is used."""
+        checker = LinkChecker("https://example.com", max_requests=5)
+        try:
+            self.run_checker(checker)
+            self.assertTrue(checker.request_budget.exhausted)
+            checker.request_count = 0
+            self.assertEqual(checker.request_budget.used, 0)
+            self.assertFalse(checker.request_budget.exhausted)
+        finally:
+            checker.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
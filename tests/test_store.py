@@ -0,0 +1,117 @@
+"""Tests for the result relations and the SQLite result store."""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+
+from link_checker.main import LinkChecker
+from link_checker.store import PageMap, PageSet, ResultStore
+
+
+class TestPageRelations(unittest.TestCase):
+    """Tests for the in-memory PageMap and PageSet relations."""
+
+    def test_page_map(self):
+        """Test recording and querying a PageMap."""
+        relation = PageMap()
+        relation.record("https://example.com/a", "https://example.com/x.css", "css")
+        relation.record_many("https://example.com/b", {
+            "https://example.com/x.css": "css",
+            "https://example.com/y.js": "javascript"})
+
+        self.assertEqual(relation.referrers("https://example.com/x.css"),
+                         ["https://example.com/a", "https://example.com/b"])
+        self.assertEqual(relation.targets(),
+                         {"https://example.com/x.css", "https://example.com/y.js"})
+        self.assertEqual(relation.count(), 3)
+        self.assertEqual(relation.target_count(), 2)
+        self.assertEqual(list(relation.iter_by_value()), [
+            ("css", [("https://example.com/x.css", "https://example.com/a"),
+                     ("https://example.com/x.css", "https://example.com/b")]),
+            ("javascript", [("https://example.com/y.js", "https://example.com/b")])])
+
+    def test_page_set(self):
+        """Test recording and querying a PageSet."""
+        relation = PageSet()
+        relation.record("https://example.com/b", "https://a.org/")
+        relation.record("https://example.com/a", "https://a.org/")
+        relation.record("https://example.com/a", "https://a.org/")
+
+        self.assertEqual(relation.count(), 2)
+        self.assertEqual(relation.target_count(), 1)
+        self.assertEqual([page for page, _ in relation.sorted_items()],
+                         ["https://example.com/a", "https://example.com/b"])
+
+
+class TestResultStore(unittest.TestCase):
+    """Tests for the SQLite-backed ResultStore."""
+
+    def setUp(self):
+        """Create a temporary directory for the store file."""
+        self.tmp_dir = tempfile.mkdtemp(prefix='linkchecker_store_test_')
+        self.store_path = os.path.join(self.tmp_dir, 'results.sqlite')
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_relations_behave_like_memory(self):
+        """Test that stored relations answer the same queries as in-memory ones."""
+        store = ResultStore(self.store_path, batch_size=2)
+        assets = store.relation('internal_assets')
+        links = store.relation('external_links')
+
+        assets.record("https://example.com/a", "https://example.com/x.css", "css")
+        assets.record_many("https://example.com/b", {
+            "https://example.com/x.css": "css",
+            "https://example.com/y.js": "javascript"})
+        links["https://example.com/a"] = {"https://a.org/", "https://b.org/"}
+
+        self.assertEqual(dict(assets.items()), {
+            "https://example.com/a": {"https://example.com/x.css": "css"},
+            "https://example.com/b": {"https://example.com/x.css": "css",
+                                      "https://example.com/y.js": "javascript"}})
+        self.assertEqual(links["https://example.com/a"], {"https://a.org/", "https://b.org/"})
+        self.assertEqual(len(assets), 2)
+        self.assertEqual(assets.count(), 3)
+        self.assertEqual(assets.target_count(), 2)
+        self.assertEqual(sorted(assets.referrers("https://example.com/x.css")),
+                         ["https://example.com/a", "https://example.com/b"])
+        self.assertEqual(links.targets(), {"https://a.org/", "https://b.org/"})
+        self.assertEqual([value for value, _ in assets.iter_by_value()],
+                         ["css", "javascript"])
+        self.assertNotIn("https://example.com/c", assets)
+        store.close()
+
+        # The results stay queryable after the run
+        conn = sqlite3.connect(self.store_path)
+        self.assertEqual(conn.execute('SELECT COUNT(*) FROM external_links').fetchone(), (2,))
+        conn.close()
+
+    def test_check_external_links_with_store(self):
+        """Test that a checker records broken external links in the store."""
+        checker = LinkChecker("https://example.com", result_store=self.store_path)
+        checker.external_links.record("https://example.com", "https://a.org/")
+        checker.external_links.record("https://example.com/page", "https://a.org/")
+        checker.external_links.record("https://example.com", "https://b.org/")
+
+        def head_side_effect(url, **kwargs):
+            response = MagicMock()
+            response.status_code = 404 if url == "https://a.org/" else 200
+            response.url = url
+            return response
+
+        with patch('requests.Session.head', side_effect=head_side_effect):
+            checker.check_external_links()
+
+        self.assertEqual(dict(checker.broken_links.items()), {
+            "https://example.com": {"https://a.org/": 404},
+            "https://example.com/page": {"https://a.org/": 404}})
+        checker.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+"""Tests for checking the links of a list of pages without crawling."""
+
+import unittest
+
+from link_checker.main import LinkChecker
+from tests.fake_site import FakeSite
+
+PAGES = {
+    "https://example.com/docs": '<a href="/docs/a.html">A</a>',
+    "https://example.com/docs/a.html": ('<a href="b.html">B</a>'
+                                        '<a href="c.html">C</a>'
+                                        '<a href="missing.html">Missing</a>'
+                                        '<img src="logo.png">'
+                                        '<a href="https://ext.org/x">External</a>'),
+    "https://example.com/docs/b.html": '<a href="deep.html">Deep</a>',
+    "https://example.com/docs/c.html": '<a href="b.html">B</a>',
+    "https://example.com/docs/deep.html": 'Deep',
+}
+
+
+class TestTargetedMode(unittest.TestCase):
+    """Tests for the pages option of LinkChecker."""
+
+    def setUp(self):
+        self.site = FakeSite(PAGES)
+        self.site.serve_during(self)
+
+    def test_only_listed_pages_are_fetched(self):
+        """Test that the listed pages are parsed and their links checked, not crawled."""
+        checker = LinkChecker("https://example.com/docs",
+                              pages=["a.html", "/docs/c.html", "https://example.com/docs/a.html"])
+        self.assertEqual(checker.target_pages, ["https://example.com/docs/a.html",
+                                                "https://example.com/docs/c.html"])
+        checker.run()
+        checker.close()
+
+        urls = self.site.urls
+        self.assertNotIn("https://example.com/docs", urls)
+        self.assertNotIn("https://example.com/docs/deep.html", urls)
+        self.assertEqual(urls.count("https://example.com/docs/a.html"), 1)
+        self.assertEqual(urls.count("https://example.com/docs/b.html"), 1)
+        self.assertEqual(urls.count("https://example.com/docs/c.html"), 1)
+        self.assertIn("https://example.com/docs/logo.png", self.site.head_urls)
+        self.assertIn("https://ext.org/x", self.site.head_urls)
+
+        self.assertEqual(checker.actual_visited_pages_count, 2)
+        self.assertEqual(dict(checker.broken_links),
+                         {"https://example.com/docs/a.html":
+                          {"https://example.com/docs/missing.html": 404}})
+
+    def test_broken_listed_page_is_reported(self):
+        """Test that a listed page that cannot be fetched is reported as broken."""
+        checker = LinkChecker("https://example.com/docs", pages=["gone.html"])
+        checker.run()
+        checker.close()
+
+        self.assertEqual(dict(checker.broken_links),
+                         {'root': {"https://example.com/docs/gone.html": 404}})
+
+
+if __name__ == '__main__':
+    unittest.main()
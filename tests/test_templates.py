@@ -0,0 +1,103 @@
+"""Tests for reusing the resolved links of repeated boilerplate blocks."""
+
+import unittest
+
+from bs4 import BeautifulSoup
+
+from link_checker.main import LinkChecker
+from link_checker.templates import LinkBlockCache, find_blocks, resolution_context
+
+TEMPLATE = """
+<header><a href="/">Home</a><nav><a href="/docs/">Docs</a></nav></header>
+<nav><a href="/about.html">About</a><a href="news.html">News</a>
+  <a href="#team">Team</a><a href="/missing.html#intro">Intro</a></nav>
+<main>{main}</main>
+<footer><a href="https://ext.org/">Ext</a><a href="/logo.png">Logo</a>
+  <a href="mailto:me@example.com">Mail</a></footer>
+"""
+
+
+class TestBlocks(unittest.TestCase):
+    """Tests for finding and fingerprinting blocks."""
+
+    def test_find_outermost_blocks(self):
+        """Test that blocks nested in other blocks are part of the outer block."""
+        soup = BeautifulSoup(TEMPLATE.format(main=''), 'html.parser')
+        self.assertEqual([block.name for block in find_blocks(soup)],
+                         ['header', 'nav', 'footer'])
+
+    def test_resolution_context(self):
+        """Test that the context only keeps what the resolution of the hrefs depends on."""
+        self.assertEqual(resolution_context("https://e.com/a/b.html", ["/x", "https://o.org/"]),
+                         "https://e.com")
+        self.assertEqual(resolution_context("https://e.com/a/b.html", ["/x", "y.html"]),
+                         "https://e.com/a/")
+        self.assertEqual(resolution_context("https://e.com/a/b", ["y.html"]), "https://e.com/a/b/")
+        self.assertEqual(resolution_context("https://e.com/a/b.html", ["?page=2"]),
+                         "https://e.com/a/b.html")
+        self.assertEqual(resolution_context("https://e.com/a?q=1", ["y.html"]),
+                         "https://e.com/a?q=1")
+
+    def test_cache(self):
+        """Test that blocks are only reused with the same hrefs in the same context."""
+        cache = LinkBlockCache(max_blocks=1)
+        first = LinkBlockCache.fingerprint(["/a", "/b"], "https://e.com")
+        self.assertNotEqual(first, LinkBlockCache.fingerprint(["/a/", "b"], "https://e.com"))
+        self.assertNotEqual(first, LinkBlockCache.fingerprint(["/a", "/b"], "https://o.org"))
+
+        self.assertIsNone(cache.get(first, 2))
+        cache.put(first, [('link', "https://e.com/a", '')])
+        cache.put("other", [])
+        self.assertEqual(cache.get(first, 2), [('link', "https://e.com/a", '')])
+        self.assertIsNone(cache.get("other", 0))
+        self.assertEqual((cache.blocks_reused, cache.links_reused), (1, 2))
+
+        cache.clear()
+        self.assertIsNone(cache.get(first, 2))
+
+
+class TestBlockReuseInParsing(unittest.TestCase):
+    """Tests for the reuse of blocks by LinkChecker._parse_page()."""
+
+    def parse(self, checker, url, main):
+        return checker._parse_page(url, TEMPLATE.format(main=main))
+
+    def test_same_links_as_without_reuse(self):
+        """Test that reusing blocks gives the same links as resolving every link."""
+        pages = [("https://example.com/docs/a.html", '<a href="b.html">B</a>'),
+                 ("https://example.com/docs/b.html", '<a href="/docs/a.html">A</a>'),
+                 ("https://example.com/blog/post.html", '<a href="#c">C</a><img src="i.png">')]
+        reusing = LinkChecker("https://example.com", check_anchors=True)
+        resolving = LinkChecker("https://example.com", check_anchors=True,
+                                reuse_link_blocks=False)
+        for url, main in pages:
+            self.assertEqual(self.parse(reusing, url, main), self.parse(resolving, url, main))
+        reusing.close()
+        resolving.close()
+
+        # The header and footer are reused on every page after the first; the nav has
+        # a page-relative link, so it is only reused within the same directory
+        self.assertEqual(reusing.link_block_cache.blocks_reused, 5)
+        self.assertEqual(reusing.link_block_cache.links_reused, 2 * 2 + 3 * 2 + 4)
+        self.assertIsNone(resolving.link_block_cache)
+
+    def test_page_specific_links_are_resolved(self):
+        """Test that the links outside the blocks, and fragments on the page, are kept."""
+        checker = LinkChecker("https://example.com", check_anchors=True)
+        self.parse(checker, "https://example.com/docs/a.html", '')
+        edges = self.parse(checker, "https://example.com/docs/b.html", '<a href="c.html">C</a>')
+        checker.close()
+
+        self.assertEqual(edges['links'], ["https://example.com/", "https://example.com/docs",
+                                          "https://example.com/about.html",
+                                          "https://example.com/docs/news.html",
+                                          "https://example.com/missing.html",
+                                          "https://example.com/docs/c.html"])
+        self.assertEqual(edges['assets'], {"https://example.com/logo.png": 'image'})
+        self.assertEqual(edges['external'], ["https://ext.org/"])
+        self.assertIn(["https://example.com/docs/b.html", "team"], edges['fragments'])
+        self.assertIn(["https://example.com/missing.html", "intro"], edges['fragments'])
+
+
+if __name__ == '__main__':
+    unittest.main()
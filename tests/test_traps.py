@@ -0,0 +1,81 @@
+"""Tests for crawl trap detection."""
+
+import unittest
+
+from link_checker.main import LinkChecker
+from link_checker.traps import TrapDetector, repeated_segments
+from tests.fake_site import FakeSite
+
+
+class TestRepeatedSegments(unittest.TestCase):
+    """Tests for the repeated_segments function."""
+
+    def test_repeated_runs(self):
+        """Test that runs of one or more segments repeated back to back are found."""
+        self.assertEqual(repeated_segments('/x/a/b/a/b/a/b/page.html', 3), 'a/b')
+        self.assertEqual(repeated_segments('/docs/docs/docs/', 3), 'docs')
+        self.assertIsNone(repeated_segments('/a/b/a/b/page.html', 3))
+        self.assertIsNone(repeated_segments('/2020/01/01/post.html', 3))
+        self.assertIsNone(repeated_segments('/a/x/a/y/a/z', 3))
+
+
+class TestTrapDetector(unittest.TestCase):
+    """Tests for the TrapDetector class."""
+
+    def test_url_length(self):
+        """Test that URLs over the length limit are traps."""
+        detector = TrapDetector(max_url_length=30)
+        self.assertIsNone(detector.check("https://example.com/short"))
+        self.assertEqual(detector.check("https://example.com/" + "x" * 20),
+                         "URL longer than 30 characters")
+
+    def test_query_variants_per_path(self):
+        """Test that only the first query variants of a path are allowed."""
+        detector = TrapDetector(max_query_variants=2)
+        self.assertIsNone(detector.check("https://example.com/cal?d=1"))
+        self.assertIsNone(detector.check("https://example.com/cal?d=2"))
+        self.assertIsNone(detector.check("https://example.com/cal?d=1"))
+        self.assertEqual(detector.check("https://example.com/cal?d=3"),
+                         "more than 2 query variants of /cal")
+        self.assertIsNone(detector.check("https://example.com/other?d=3"))
+
+        detector.clear()
+        self.assertIsNone(detector.check("https://example.com/cal?d=3"))
+
+    def test_disabled(self):
+        """Test that limits of 0 disable the checks."""
+        detector = TrapDetector(0, 0, 0)
+        self.assertFalse(detector.enabled)
+        self.assertIsNone(detector.check("https://example.com/a/a/a/a?" + "q" * 5000))
+
+
+class EndlessSite(FakeSite):
+    """A site whose pages link to deeper copies of themselves and to the next day."""
+
+    def page(self, url):
+        if '/cal' in url:
+            day = int(url.rsplit('=', 1)[1])
+            return f'<a href="/cal?d={day + 1}">Next</a>'
+        return '<a href="a/b/index.html">Deeper</a><a href="/cal?d=1">Cal</a>'
+
+
+class TestTrapsInCrawl(unittest.TestCase):
+    """Tests for keeping crawl traps out of the crawl."""
+
+    def test_traps_are_diverted(self):
+        """Test that trap URLs are listed in the report instead of being crawled."""
+        site = EndlessSite()
+        checker = LinkChecker("https://example.com", max_query_variants=5)
+        with site.serve():
+            checker.run()
+        checker.close()
+
+        self.assertEqual(len(site.requests), 1 + 2 + 5)
+        self.assertEqual(checker.suspected_traps, {
+            "https://example.com/a/b/a/b/a/b/index.html": "path repeats 'a/b' 3 times",
+            "https://example.com/cal?d=6": "more than 5 query variants of /cal",
+        })
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+"""Tests for checking a list of URLs without crawling."""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from link_checker.cli import iter_urls, main
+from link_checker.main import LinkChecker
+from tests.fake_site import FakeSite
+
+STATUS = {
+    "https://data.org/a": 200,
+    "https://data.org/b": 404,
+    "https://other.org/c": 405,
+    "https://other.org/d": 200,
+}
+
+# The URL that does not allow HEAD answers GET
+PAGES = {"https://other.org/c": ''}
+
+
+class TestCheckUrlList(unittest.TestCase):
+    """Tests for LinkChecker.check_url_list()."""
+
+    def setUp(self):
+        self.site = FakeSite(PAGES, STATUS)
+        self.site.serve_during(self)
+
+    def test_urls_are_checked_and_written(self):
+        """Test that every URL gets a verdict, with GET used when HEAD is not allowed."""
+        checker = LinkChecker('')
+        verdicts = {}
+        checked = checker.check_url_list(list(STATUS) + ["https://data.org/a"],
+                                         verdicts.__setitem__)
+        checker.close()
+
+        self.assertEqual(checked, 4)
+        self.assertEqual(verdicts, {"https://data.org/a": 200, "https://data.org/b": 404,
+                                    "https://other.org/c": 200, "https://other.org/d": 200})
+
+    def test_urls_are_read_lazily(self):
+        """Test that no more than a chunk of URLs is read ahead of the verdicts."""
+        read = []
+
+        def urls():
+            for index in range(10):
+                read.append(index)
+                yield f"https://data.org/{index}"
+
+        written = []
+        checker = LinkChecker('')
+        checker.check_url_list(urls(), lambda url, status: written.append(len(read)),
+                               chunk_size=3)
+        checker.close()
+
+        self.assertEqual(len(written), 10)
+        self.assertLessEqual(written[0], 3)
+        self.assertEqual(checker.visited_urls, set())
+
+    def test_duplicates_across_chunks_are_skipped(self):
+        """Test that a URL repeated in a later chunk is not checked again."""
+        checker = LinkChecker('')
+        written = []
+        checked = checker.check_url_list(
+            ["https://data.org/a", "https://data.org/b", "https://data.org/a",
+             "https://other.org/d", "https://data.org/b"],
+            lambda url, status: written.append(url), chunk_size=2)
+        checker.close()
+
+        self.assertEqual(checked, 3)
+        self.assertEqual(sorted(written), ["https://data.org/a", "https://data.org/b",
+                                           "https://other.org/d"])
+        self.assertEqual(len(self.site.head_urls), 3)
+
+    def test_no_fixed_delay_per_url(self):
+        """Test that bulk checks do not sleep after every URL."""
+        checker = LinkChecker('')
+        with patch('time.sleep') as mock_sleep:
+            checker.check_url_list(list(STATUS), lambda url, status: None)
+        checker.close()
+        mock_sleep.assert_not_called()
+
+    def test_per_chunk_bookkeeping_is_cleared(self):
+        """Test that the URLs of checked chunks are not kept in memory."""
+        checker = LinkChecker('', external_cache=':memory:')
+        checker.check_url_list(list(STATUS), lambda url, status: None)
+        checker.check_url_list(list(STATUS), lambda url, status: None, chunk_size=1)
+        checker.close()
+
+        self.assertEqual(checker.visited_urls, set())
+        self.assertEqual(checker.cached_external_urls, set())
+
+
+class TestCheckUrlsOption(unittest.TestCase):
+    """Tests for the --check-urls command line option."""
+
+    def test_verdicts_are_written_as_json_lines(self):
+        """Test that the CLI writes one JSON line per URL of the list."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            list_path = os.path.join(temp_dir, 'urls.txt')
+            output_path = os.path.join(temp_dir, 'verdicts.jsonl')
+            with open(list_path, 'w') as f:
+                f.write("# Data links\nhttps://data.org/a\n\nhttps://data.org/b\n")
+
+            with FakeSite(PAGES, STATUS).serve(), patch('link_checker.cli.setup_logging'):
+                exit_code = main(['--check-urls', list_path, '-o', output_path])
+
+            with open(output_path) as f:
+                lines = [json.loads(line) for line in f]
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(sorted(lines, key=lambda line: line['url']),
+                         [{'url': "https://data.org/a", 'status': 200, 'ok': True},
+                          {'url': "https://data.org/b", 'status': 404, 'ok': False}])
+
+    def test_root_url_is_required_without_url_list(self):
+        """Test that the root URL can only be left out with --check-urls."""
+        with patch('sys.stderr'), self.assertRaises(SystemExit):
+            main([])
+
+    def test_iter_urls(self):
+        """Test that blank lines and comments are skipped."""
+        self.assertEqual(list(iter_urls([" https://a.org \n", "\n", "# comment\n"])),
+                         ["https://a.org"])
+
+
+if __name__ == '__main__':
+    unittest.main()
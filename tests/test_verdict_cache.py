@@ -0,0 +1,83 @@
+"""Tests for the cross-run external verdict cache."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+
+from link_checker.main import LinkChecker
+from link_checker.verdict_cache import ExternalVerdictCache
+
+
+class TestExternalVerdictCache(unittest.TestCase):
+    """Tests for the ExternalVerdictCache class."""
+
+    def setUp(self):
+        """Create a temporary directory for the cache file."""
+        self.tmp_dir = tempfile.mkdtemp(prefix='linkchecker_cache_test_')
+        self.cache_path = os.path.join(self.tmp_dir, 'verdicts.sqlite')
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_healthy_verdicts_reused_within_ttl(self):
+        """Test that healthy verdicts are reused until they expire."""
+        cache = ExternalVerdictCache(self.cache_path, ttl=100.0)
+        with patch('link_checker.verdict_cache.time.time', return_value=1000.0):
+            cache.put("https://a.org/", 200, "https://a.org/home")
+            cache.put("https://b.org/", 404, "https://b.org/")
+            cache.put("https://c.org/", 0, "https://c.org/")
+        cache.close()
+
+        # A second process (here, a second connection) sees the committed verdicts
+        cache = ExternalVerdictCache(self.cache_path, ttl=100.0)
+        with patch('link_checker.verdict_cache.time.time', return_value=1050.0):
+            self.assertEqual(cache.get("https://a.org/"),
+                             (200, "https://a.org/home", 1000.0))
+            # Failing verdicts are never reused
+            self.assertIsNone(cache.get("https://b.org/"))
+            self.assertIsNone(cache.get("https://c.org/"))
+            self.assertIsNone(cache.get("https://unknown.org/"))
+
+        with patch('link_checker.verdict_cache.time.time', return_value=1100.0):
+            self.assertIsNone(cache.get("https://a.org/"))
+
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 4)
+        cache.close()
+
+    def test_cached_verdicts_skip_requests(self):
+        """Test that a second run reuses verdicts and reports them as cached."""
+        def run_checker():
+            checker = LinkChecker("https://example.com", external_cache=self.cache_path)
+            checker.external_links["https://example.com"] = {
+                "https://a.org/", "https://b.org/"}
+            response = MagicMock()
+            response.url = "https://a.org/"
+
+            def head_side_effect(url, **kwargs):
+                response.status_code = 200 if url == "https://a.org/" else 500
+                return response
+
+            with patch('requests.Session.head', side_effect=head_side_effect) as mock_head, \
+                    patch('time.sleep'):
+                checker.check_external_links()
+            checker.verdict_cache.close()
+            return checker, mock_head
+
+        checker, mock_head = run_checker()
+        self.assertEqual(mock_head.call_count, 2)
+        self.assertEqual(checker.cached_external_urls, set())
+
+        checker, mock_head = run_checker()
+        # Only the failing link is re-checked
+        mock_head.assert_called_once()
+        self.assertEqual(checker.cached_external_urls, {"https://a.org/"})
+        self.assertEqual(checker.broken_links["https://example.com"],
+                         {"https://b.org/": 500})
+
+
+if __name__ == '__main__':
+    unittest.main()
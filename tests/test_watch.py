@@ -0,0 +1,135 @@
+"""Tests for watch mode."""
+
+import time
+import unittest
+from unittest.mock import patch
+
+from link_checker.events import (ContentChanged, LinkAdded, LinkRemoved, StatusChanged,
+                                 TargetSkipped)
+from link_checker.main import LinkChecker
+from link_checker.watch import Watcher
+from tests.fake_site import FakeSite
+
+
+class TestWatcher(unittest.TestCase):
+    """Tests for the Watcher class."""
+
+    def setUp(self):
+        self.site = FakeSite({
+            "https://example.com": '<a href="/a.html">A</a><a href="https://ext.org/x">X</a>',
+            "https://example.com/a.html": '<a href="/gone.html">Gone</a><img src="/i.png">',
+        })
+        self.site.serve_during(self)
+
+        self.checker = LinkChecker("https://example.com")
+        self.addCleanup(self.checker.close)
+        self.events = []
+        self.watcher = Watcher(self.checker, min_interval=100, max_interval=1000,
+                               on_event=self.events.append)
+        self.now = time.monotonic()
+
+    def check_due(self, advance=0.0):
+        """Advance the clock and check every target that is due."""
+        self.now += advance
+        self.site.requests.clear()
+        self.events.clear()
+        while self.watcher.check_next(self.now) is not None:
+            pass
+
+    def test_graph_is_crawled_and_only_changes_are_reported(self):
+        """Test that the first pass reports broken targets only, and later passes changes."""
+        self.check_due()
+        self.assertEqual(set(self.watcher.targets), {
+            "https://example.com", "https://example.com/a.html", "https://ext.org/x",
+            "https://example.com/gone.html", "https://example.com/i.png"})
+        self.assertEqual(self.events,
+                         [StatusChanged("https://example.com/gone.html", None, 404)])
+
+        # Nothing changed: everything is checked again, nothing is reported
+        self.check_due(100)
+        self.assertEqual(len(self.site.urls), 5)
+        self.assertEqual(self.events, [])
+        self.assertEqual({target.interval for target in self.watcher.targets.values()}, {200})
+
+        # A link is replaced on a page, and an external link breaks
+        self.site.pages["https://example.com/a.html"] = '<a href="/new.html">New</a><img src="/i.png">'
+        self.site.status["https://ext.org/x"] = 500
+        self.check_due(200)
+        self.assertCountEqual(self.events, [
+            StatusChanged("https://ext.org/x", 200, 500),
+            ContentChanged("https://example.com/a.html"),
+            LinkAdded("https://example.com/a.html", "https://example.com/new.html"),
+            LinkRemoved("https://example.com/a.html", "https://example.com/gone.html"),
+            StatusChanged("https://example.com/new.html", None, 404),
+        ])
+        self.assertNotIn("https://example.com/gone.html", self.watcher.targets)
+
+        # Changed targets are checked more often, unchanged ones less often
+        self.assertEqual(self.watcher.targets["https://ext.org/x"].interval, 100)
+        self.assertEqual(self.watcher.targets["https://example.com/i.png"].interval, 400)
+
+        self.check_due(100)
+        self.assertCountEqual(self.site.urls, ["https://ext.org/x", "https://example.com/a.html",
+                                               "https://example.com/new.html"])
+
+    def test_removed_page_takes_its_links(self):
+        """Test that targets only linked from a page that is no longer linked are dropped."""
+        self.check_due()
+        self.site.pages["https://example.com"] = '<a href="https://ext.org/x">X</a>'
+        self.check_due(100)
+        self.assertEqual(set(self.watcher.targets), {"https://example.com", "https://ext.org/x"})
+
+    def test_run_paces_the_requests(self):
+        """Test that run() spreads the requests out to the rate."""
+        self.watcher.requests_per_second = 50
+        start = time.monotonic()
+        self.watcher.run(max_checks=5)
+        self.assertEqual(self.watcher.checks, 5)
+        self.assertGreaterEqual(time.monotonic() - start, 4 / 50)
+
+    def test_budget_stops_the_watch(self):
+        """Test that the watch stops when the checker's request budget is used up."""
+        checker = LinkChecker("https://example.com", max_requests=2)
+        watcher = Watcher(checker, requests_per_second=1000)
+        watcher.run()
+        checker.close()
+        self.assertEqual(watcher.checks, 2)
+
+    def test_robots_disallowed_targets_are_skipped(self):
+        """Test that disallowed targets are reported once as skipped and never requested."""
+        checker = LinkChecker("https://example.com", respect_robots=True)
+        self.addCleanup(checker.close)
+        self.watcher = Watcher(checker, min_interval=100, max_interval=1000,
+                               on_event=self.events.append)
+        self.now = time.monotonic()
+
+        with patch.object(checker.robots, 'allowed', side_effect=lambda url: "ext.org" not in url):
+            self.check_due()
+            self.assertEqual(self.events, [TargetSkipped("https://ext.org/x"),
+                                           StatusChanged("https://example.com/gone.html", None, 404)])
+            self.assertNotIn("https://ext.org/x", self.site.urls)
+            self.assertEqual(self.watcher.targets["https://ext.org/x"].due, self.now + 1000)
+
+            # The watch goes on, and the skipped target is not reported again
+            self.check_due(1000)
+            self.assertNotIn("https://ext.org/x", self.site.urls)
+            self.assertEqual(self.events, [])
+            self.assertIsNone(self.watcher.targets["https://ext.org/x"].status)
+
+    def test_probe_respects_the_circuit_breaker(self):
+        """Test that probe() fails a short-circuited external host without a request."""
+        for _ in range(self.checker.host_failure_threshold):
+            self.checker.circuit_breaker.record_failure("ext.org", "timed out")
+        self.assertEqual(self.checker.probe("https://ext.org/x"), (0, None))
+        self.assertEqual(self.site.urls, [])
+
+    def test_invalid_settings(self):
+        """Test that the rate and intervals must be positive and ordered."""
+        for kwargs in ({'requests_per_second': 0}, {'min_interval': 0},
+                       {'min_interval': 10, 'max_interval': 5}):
+            with self.subTest(**kwargs), self.assertRaises(ValueError):
+                Watcher(self.checker, **kwargs)
+
+
+if __name__ == '__main__':
+    unittest.main()